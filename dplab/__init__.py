@@ -0,0 +1,11 @@
+# DP Lab. Arayüz dplab.gui içindedir (dp_lab.py ile açılır); diğer modüller
+# arayüzden bağımsızdır, Tk olmadan da içe aktarılabilir:
+#
+#     from dplab.storage import load_all
+#     from dplab.core import make_job_query, filter_jobs, hesapla_borclar
+#
+#     load_all()
+#     isler = filter_jobs(make_job_query(clinic="Merkez"))
+#
+# Excel/PDF ve QR kütüphaneleri yalnızca ilgili özellik kullanıldığında
+# yüklenir.
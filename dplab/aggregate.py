@@ -0,0 +1,206 @@
+from datetime import date
+from functools import partial
+
+from dplab.storage import DATA, register_index
+from dplab.core import (
+    date_key, job_price, hesapla_klinik_ciro, hesapla_aylik_ciro, rollup_window,
+    filtered_finance, finance_totals
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# === TOPLAMA ===
+# NumPy kuruluysa iş ve muhasebe kayıtlarının toplamlarda kullanılan alanları
+# ayrıca sütun dizilerinde tutulur. Diziler kayıt id'siyle adreslenir: gün
+# sırası, ay, klinik/durum/protez kodu ve tutar. Süzgeçli toplamlar, klinik,
+# ay ve durum kırılımları, gelir/gider netleri maske ve bincount ile
+# hesaplanır. NumPy yoksa aynı fonksiyonlar ciro küpünü ya da kayıtları düz
+# Python ile tarar; sonuçlar aynıdır.
+NUMPY = np is not None
+
+TABLES = {
+    "jobs": ("day", "month", "clinic", "status", "prosthesis", "amount"),
+    "finance": ("day", "month", "clinic", "income", "amount")
+}
+
+_tables = {}  # koleksiyon -> {"size": en büyük id + 1, "present": ..., sütun: dizi}
+_codes = {}   # alan -> {metin: kod}; iş ve muhasebe aynı klinik kodlarını kullanır
+_names = {}   # alan -> [metin, ...] (kod sırasıyla)
+_months = {}  # gün sırası -> ay numarası (yıl * 12 + ay - 1)
+
+def code_of(field, value):
+    codes = _codes.setdefault(field, {})
+    code = codes.get(value)
+    if code is None:
+        code = codes[value] = len(codes)
+        _names.setdefault(field, []).append(value)
+    return code
+
+def month_number(day):
+    month = _months.get(day)
+    if month is None:
+        d = date.fromordinal(day)
+        month = _months[day] = d.year * 12 + d.month - 1
+    return month
+
+def month_label(month):
+    return f"{month // 12:04d}-{month % 12 + 1:02d}"
+
+def finance_amount(r):
+    try:
+        return float(r["amount"])
+    except (TypeError, ValueError):
+        return 0.0
+
+def row_values(name, r):
+    # TABLES[name] sırasıyla; tarihi olmayan kayıtta gün ve ay -1
+    day = date_key(r.get("date"))
+    if day is None:
+        day = month = -1
+    else:
+        month = month_number(day)
+    clinic = code_of("clinic", r["clinic"])
+    if name == "jobs":
+        return (day, month, clinic, code_of("status", r.get("status", "Hazırlanıyor")),
+                code_of("prosthesis", r["prosthesis"]), job_price(r))
+    return (day, month, clinic, r["type"] == "Gelir", finance_amount(r))
+
+def new_table(name, capacity):
+    table = {"size": 0, "present": np.zeros(capacity, dtype=bool)}
+    for col in TABLES[name]:
+        table[col] = np.zeros(capacity, dtype=np.float64 if col == "amount" else np.int32)
+    return table
+
+def table_add(name, r):
+    table = _tables[name]
+    rid = r["id"]
+    capacity = len(table["present"])
+    if rid >= capacity:
+        # Kapasite ikiye katlanarak büyür, eklemeler ortalamada sabit sürer
+        capacity = max(rid + 1, 2 * capacity)
+        for col, array in table.items():
+            if col != "size":
+                grown = np.zeros(capacity, dtype=array.dtype)
+                grown[:len(array)] = array
+                table[col] = grown
+    for col, value in zip(TABLES[name], row_values(name, r)):
+        table[col][rid] = value
+    table["present"][rid] = True
+    table["size"] = max(table["size"], rid + 1)
+
+def table_remove(name, r):
+    _tables[name]["present"][r["id"]] = False
+
+def table_build(name, recs):
+    rows = [(r["id"],) + row_values(name, r) for r in recs]
+    size = max((row[0] for row in rows), default=-1) + 1
+    table = _tables[name] = new_table(name, max(size, 16))
+    table["size"] = size
+    if rows:
+        columns = list(zip(*rows))
+        ids = np.array(columns[0], dtype=np.int64)
+        for col, values in zip(TABLES[name], columns[1:]):
+            table[col][ids] = values
+        table["present"][ids] = True
+
+if NUMPY:
+    for name in TABLES:
+        register_index(name, partial(table_add, name), partial(table_remove, name), partial(table_build, name))
+
+
+def column(name, col):
+    table = _tables[name]
+    return table[col][:table["size"]]
+
+def table_mask(name, start=None, end=None, clinic="", income=None):
+    mask = column(name, "present").copy()
+    if start is not None or end is not None:
+        day = column(name, "day")
+        mask &= day >= (0 if start is None else start)
+        if end is not None:
+            mask &= day <= end
+    if clinic:
+        code = _codes.get("clinic", {}).get(clinic)
+        if code is None:
+            mask[:] = False
+        else:
+            mask &= column(name, "clinic") == code
+    if income is not None:
+        mask &= column(name, "income") == income
+    return mask
+
+def jobs_sum(ids=None):
+    # Verilen iş id'lerinin (None ise tüm işlerin) toplam fiyatı
+    if not NUMPY:
+        jobs = DATA["jobs"]
+        return sum(job_price(jobs[k]) for k in (jobs if ids is None else ids))
+    if ids is None:
+        return float(column("jobs", "amount")[column("jobs", "present")].sum())
+    ids = np.fromiter(ids, dtype=np.int64, count=len(ids))
+    return float(_tables["jobs"]["amount"][ids].sum())
+
+def group_total(name, by, start=None, end=None, clinic="", income=None):
+    # {değer: toplam}; by: "clinic", "month", "status" ya da "prosthesis" (iş).
+    # start/end gün sırası (dahil), clinic tam klinik adı, income yalnızca
+    # muhasebede gelir (True) ya da gider (False) süzgecidir. Ay kırılımında
+    # tarihi olmayan kayıtlar sayılmaz.
+    if not NUMPY:
+        return python_group_total(name, by, start, end, clinic, income)
+    mask = table_mask(name, start, end, clinic, income)
+    keys = column(name, by)[mask]
+    amounts = column(name, "amount")[mask]
+    if by == "month":
+        dated = keys >= 0
+        keys, amounts = keys[dated], amounts[dated]
+        if not len(keys):
+            return {}
+        first = int(keys.min())
+        keys = keys - first
+    sums = np.bincount(keys, weights=amounts)
+    counts = np.bincount(keys)
+    if by == "month":
+        return {month_label(first + int(k)): float(sums[k]) for k in np.flatnonzero(counts)}
+    names = _names[by]
+    return {names[k]: float(sums[k]) for k in np.flatnonzero(counts)}
+
+def python_group_total(name, by, start, end, clinic, income):
+    if name == "jobs" and not clinic and by in ("clinic", "month", "prosthesis"):
+        # İş ciroları için güncel tutulan küp yeterli
+        if start is None and end is None and by != "prosthesis":
+            return hesapla_klinik_ciro() if by == "clinic" else hesapla_aylik_ciro()
+        if start is not None or end is not None:
+            return rollup_window(start, end, by)
+    totals = {}
+    for r in DATA[name].values():
+        if clinic and r["clinic"] != clinic:
+            continue
+        if income is not None and (r["type"] == "Gelir") != income:
+            continue
+        day = date_key(r.get("date"))
+        if start is not None or end is not None:
+            if day is None or (start is not None and day < start) or (end is not None and day > end):
+                continue
+        if by == "month":
+            if day is None:
+                continue
+            key = month_label(month_number(day))
+        elif by == "status":
+            key = r.get("status", "Hazırlanıyor")
+        else:
+            key = r[by]
+        amount = job_price(r) if name == "jobs" else finance_amount(r)
+        totals[key] = totals.get(key, 0) + amount
+    return totals
+
+def finance_net(start=None, end=None, clinic=""):
+    # Süzgeçteki (gelir, gider) toplamları
+    if not NUMPY:
+        return finance_totals(filtered_finance((start, end, clinic)))
+    mask = table_mask("finance", start, end, clinic)
+    income = column("finance", "income")[mask].astype(bool)
+    amounts = column("finance", "amount")[mask]
+    return float(amounts[income].sum()), float(amounts[~income].sum())
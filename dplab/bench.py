@@ -0,0 +1,260 @@
+import os
+import sys
+import json
+import time
+import shutil
+import random
+import platform
+import importlib.util
+import tempfile
+import tracemalloc
+from datetime import date, datetime
+
+from dplab.storage import DATA, FILES, load_all, write_json, records, flush_writes
+from dplab.core import (
+    make_job_query, make_finance_query, filter_job_ids, job_records, filter_jobs,
+    filtered_finance, hesapla_borclar, hesapla_klinik_ciro, hesapla_aylik_ciro, parse_filter_date, sorted_ids
+)
+from dplab.aggregate import NUMPY, jobs_sum, finance_net, group_total
+from dplab.exporters import job_rows, write_xlsx, write_jobs_pdf, JOB_COLUMNS, PDF_FONT
+
+
+# === PERFORMANS ÖLÇÜMÜ ===
+# Sık kullanılan yolları (süzgeçler, liste toplamları, sıralama, borç ve
+# ciro hesapları, kaydetme, dışa aktarma) arayüz açmadan ölçer. Her boyut
+# için aynı tohumla üretilen yapay veri geçici bir klasöre yazılır ve oradan
+# yüklenir. Süre birkaç turun en iyisidir; en yüksek bellek ayrı bir turda
+# tracemalloc ile ölçülür. Sonuçlar JSON olarak kaydedilir, --karsilastir
+# önceki bir sonuç dosyasıyla farkları gösterir.
+#
+#     python -m dplab.bench                          (10000 ve 100000 iş)
+#     python -m dplab.bench 10000,100000,1000000 --json sonuc.json
+#     python -m dplab.bench 100000 --karsilastir eski.json --bellek-yok
+BENCH_SIZES = (10000, 100000)
+BENCH_ROUNDS = 3
+BENCH_SEED = 1
+PDF_BENCH_ROWS = 5000  # PDF dışa aktarma en fazla bu kadar satırla ölçülür
+
+PROSTHESES = ("Zirkonyum", "Metal Destekli Porselen", "E-max", "İmplant Üstü Kron",
+              "Geçici Kron", "Gece Plağı", "Total Protez", "Parsiyel Protez")
+STATUSES = ("Hazırlanıyor", "Beklemede", "Yapımda", "Tamamlandı", "Teslim Edildi")
+FIRST_NAMES = ("Ayşe", "Mehmet", "Zeynep", "Mustafa", "Elif", "Ahmet", "Fatma", "İbrahim",
+               "Emine", "Hüseyin", "Şule", "Çağrı", "Gül", "Özgür", "Ümit", "Irmak")
+LAST_NAMES = ("Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Öztürk", "Aydın",
+              "Özdemir", "Arslan", "Doğan", "Kılıç", "Aslan", "Çetin", "Kara", "Koç")
+NOTES = ("", "", "Renk A2", "Prova sonrası teslim", "Acil", "Renk A3, ölçü yenilendi")
+
+def synthetic_data(jobs_count, seed=BENCH_SEED):
+    # {koleksiyon: kayıt listesi}; aynı boyut ve tohum hep aynı veriyi verir
+    rng = random.Random(seed)
+    clinic_count = min(max(jobs_count // 2500, 5), 200)
+    clinics = [{"name": f"Klinik {i:03d}"} for i in range(clinic_count)]
+    doctors = [
+        {"name": f"Dr. {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}", "clinic": c["name"]}
+        for i, c in enumerate(clinics * 3)
+    ]
+    prices = [{"type": p, "price": float(rng.randrange(500, 5000, 50)), "clinic": "Genel"} for p in PROSTHESES]
+    prices += [
+        {"type": rng.choice(PROSTHESES), "price": float(rng.randrange(500, 5000, 50)), "clinic": c["name"]}
+        for c in clinics[::3]
+    ]
+
+    unit_prices = {(p["type"], p["clinic"]): p["price"] for p in prices}
+
+    first_day = date(2022, 1, 1).toordinal()
+    days = date.today().toordinal() - first_day
+    clinic_doctors = {}
+    for d in doctors:
+        clinic_doctors.setdefault(d["clinic"], []).append(d["name"])
+
+    def random_date(span=days):
+        return date.fromordinal(first_day + rng.randrange(span)).strftime("%d/%m/%Y")
+
+    jobs = []
+    for i in range(jobs_count):
+        clinic = rng.choice(clinics)["name"]
+        prosthesis = rng.choice(PROSTHESES)
+        count = rng.randint(1, 6)
+        unit = unit_prices.get((prosthesis, clinic), unit_prices[(prosthesis, "Genel")])
+        jobs.append({
+            "patient_name": rng.choice(FIRST_NAMES),
+            "patient_surname": rng.choice(LAST_NAMES),
+            "clinic": clinic,
+            "doctor": rng.choice(clinic_doctors[clinic]),
+            "prosthesis": prosthesis,
+            "count": str(count),
+            "note": rng.choice(NOTES),
+            "date": random_date(),
+            "total_price": f"{unit * count:.2f}",
+            "status": rng.choice(STATUSES),
+            "id": i + 1
+        })
+    finance = [
+        {
+            "clinic": rng.choice(clinics)["name"],
+            "type": "Gelir" if rng.random() < 0.8 else "Gider",
+            "desc": "",
+            "amount": float(rng.randrange(100, 20000, 10)),
+            "date": random_date(),
+            "id": i + 1
+        }
+        for i in range(jobs_count // 4)
+    ]
+    envanter = [
+        {
+            "ad": f"Malzeme {i}",
+            "miktar": float(rng.randint(1, 50)),
+            "birim": rng.choice(("adet", "kutu", "gr")),
+            "giris": random_date(),
+            "skt": random_date(days + 730),
+            "siparis": "",
+            "not": "",
+            "id": i + 1
+        }
+        for i in range(200)
+    ]
+    return {
+        "jobs": jobs, "clinics": clinics, "doctors": doctors, "prices": prices,
+        "finance": finance, "envanter": envanter
+    }
+
+def has_module(name):
+    return importlib.util.find_spec(name) is not None
+
+def measure(func, rounds, memory):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    result = {"seconds": round(best, 6)}
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            result["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        finally:
+            tracemalloc.stop()
+    return result
+
+def bench_cases(tmp):
+    # [(ad, fonksiyon), ...]; veri yüklenmiş olmalı
+    clinic = DATA["clinics"][len(DATA["clinics"]) // 2]["name"]
+    start, end = parse_filter_date("01/01/2023"), parse_filter_date("31/12/2023")
+    job_query = make_job_query("01/01/2023", "31/12/2023", clinic)
+    name_query = make_job_query(name="yıl")
+    finance_query = make_finance_query("01/01/2023", "31/12/2023", clinic)
+
+    def refresh_jobs():
+        # Tüm İşler listesinin arayüz dışındaki kısmı: süzgeç, kayıtlar, toplam
+        keys = filter_job_ids(job_query)
+        job_records(keys)
+        jobs_sum(keys)
+
+    def refresh_finance():
+        filtered_finance(finance_query)
+        finance_net(*finance_query)
+
+    def ciro_reports():
+        hesapla_klinik_ciro()
+        hesapla_aylik_ciro()
+        group_total("jobs", "clinic", start, end)
+        group_total("jobs", "month", start, end)
+
+    cases = [
+        ("filter_jobs", lambda: filter_jobs(job_query)),
+        ("filter_jobs_name", lambda: filter_jobs(name_query)),
+        ("refresh_jobs", refresh_jobs),
+        ("refresh_finance", refresh_finance),
+        ("sort_jobs", lambda: sorted_ids("jobs", "price", True, filter_job_ids(job_query))),
+        ("hesapla_borclar", hesapla_borclar),
+        ("ciro_reports", ciro_reports),
+        ("save_data", lambda: write_json(FILES["jobs"], list(records("jobs"))))
+    ]
+    if has_module("openpyxl"):
+        xlsx_path = os.path.join(tmp, "bench.xlsx")
+        cases.append(("export_xlsx", lambda: write_xlsx(xlsx_path, [("İşler", JOB_COLUMNS, job_rows(records("jobs")))])))
+    if has_module("fpdf") and os.path.exists(PDF_FONT):
+        pdf_path = os.path.join(tmp, "bench.pdf")
+        cases.append(("export_pdf", lambda: write_jobs_pdf(pdf_path, list(records("jobs"))[:PDF_BENCH_ROWS])))
+    return cases
+
+def run_size(size, rounds=BENCH_ROUNDS, memory=True, report=print):
+    data = synthetic_data(size)
+    font = os.path.abspath(PDF_FONT) if os.path.exists(PDF_FONT) else None
+    cwd = os.getcwd()
+    results = []
+
+    def record(case, func):
+        result = dict({"size": size, "case": case}, **measure(func, rounds, memory))
+        results.append(result)
+        report(result)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            os.makedirs("data")
+            for name, recs in data.items():
+                with open(FILES[name], "w", encoding="utf-8") as f:
+                    json.dump(recs, f, ensure_ascii=False)
+            if font:
+                shutil.copy(font, PDF_FONT)
+            del data
+            record("load_all", load_all)
+            for case, func in bench_cases(tmp):
+                record(case, func)
+        finally:
+            # Arka plandaki yazmalar geçici klasör silinmeden bitmeli
+            flush_writes()
+            os.chdir(cwd)
+    return results
+
+def format_result(r, old=None):
+    line = f"{r['case']:<18}{r['size']:>9}  {r['seconds']:9.4f} sn"
+    if "peak_mb" in r:
+        line += f"  {r['peak_mb']:9.2f} MB"
+    if old and old["seconds"]:
+        line += f"  (önce {old['seconds']:.4f} sn, {(r['seconds'] / old['seconds'] - 1) * 100:+.0f}%)"
+    return line
+
+def main(argv):
+    out = compare = None
+    for flag in ("--json", "--karsilastir"):
+        if flag in argv:
+            i = argv.index(flag)
+            if flag == "--json":
+                out = argv[i + 1]
+            else:
+                compare = argv[i + 1]
+            argv = argv[:i] + argv[i + 2:]
+    memory = "--bellek-yok" not in argv
+    argv = [a for a in argv if a != "--bellek-yok"]
+    sizes = [int(s) for s in argv[0].split(",")] if argv else list(BENCH_SIZES)
+    rounds = int(argv[1]) if len(argv) > 1 else BENCH_ROUNDS
+
+    previous = {}
+    if compare:
+        with open(compare, "r", encoding="utf-8") as f:
+            previous = {(r["size"], r["case"]): r for r in json.load(f)["results"]}
+
+    print(f"Python {platform.python_version()}, NumPy {'var' if NUMPY else 'yok'}, {rounds} tur")
+    results = []
+    for size in sizes:
+        results += run_size(size, rounds, memory,
+                            lambda r: print(format_result(r, previous.get((r["size"], r["case"])))))
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump({
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "numpy": NUMPY,
+                "seed": BENCH_SEED,
+                "rounds": rounds,
+                "results": results
+            }, f, indent=2, ensure_ascii=False)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,572 @@
+from bisect import bisect_left, insort
+from functools import partial
+from datetime import datetime, date
+
+from dplab.storage import DATA, Job, register_index
+from dplab.profiler import profiled
+
+JOB_STATUSES = ("Hazırlanıyor", "Beklemede", "Yapımda", "Tamamlandı", "Teslim Edildi")
+
+
+# === TARİH İNDEKSİ ===
+# Tarihler yüklemede ve her yazmada bir kez gün sırasına (ordinal) çevrilir.
+# Sıralı (gün, id) listesi sayesinde tarih aralığı süzgeçleri tüm kayıtları
+# taramak yerine bisect ile dilim alır.
+_date_index = {}  # koleksiyon -> sıralı [(gün sırası, id), ...]
+_date_keys = {}   # koleksiyon -> {id: gün sırası}
+
+def date_key(value):
+    try:
+        gun, ay, yil = value.split("/")
+        return date(int(yil), int(ay), int(gun)).toordinal()
+    except (AttributeError, ValueError):
+        return None
+
+def date_index_add(name, record):
+    key = date_key(record.get("date"))
+    _date_keys[name][record["id"]] = key
+    if key is not None:
+        insort(_date_index[name], (key, record["id"]))
+
+def date_index_remove(name, record):
+    key = _date_keys[name].pop(record["id"], None)
+    if key is not None:
+        index = _date_index[name]
+        del index[bisect_left(index, (key, record["id"]))]
+
+def date_index_build(name, recs):
+    keys = {r["id"]: date_key(r.get("date")) for r in recs}
+    _date_keys[name] = keys
+    _date_index[name] = sorted((key, rid) for rid, key in keys.items() if key is not None)
+
+def date_range_ids(name, start=None, end=None):
+    # Başlangıç/bitiş gün sırası dahil; id sırası kayıt (ekleme) sırasıdır
+    index = _date_index[name]
+    lo = 0 if start is None else bisect_left(index, (start,))
+    hi = len(index) if end is None else bisect_left(index, (end + 1,))
+    return sorted(rid for _, rid in index[lo:hi])
+
+for name in ("jobs", "finance"):
+    register_index(name, partial(date_index_add, name), partial(date_index_remove, name), partial(date_index_build, name))
+
+
+# === FİYAT TABLOSU ===
+# (protez tipi, klinik) -> fiyat kayıtları. Aynı anahtarda birden fazla kayıt
+# varsa listede ilk gelen geçerlidir; anahtarın kayıtları fiyat listesindeki
+# sırayla tutulur, güncellenen bir fiyat sırasını kaybetmez. Klinik için
+# fiyat yoksa 'Genel' fiyatı kullanılır. Protez tipleri de kayıt sayısıyla
+# tutulur, combobox her fiyat değişikliğinde tüm listeyi taramadan güncellenir.
+_price_map = {}
+_price_types = {}  # protez tipi -> fiyat kaydı sayısı
+
+def price_index_add(p):
+    entries = _price_map.setdefault((p["type"], p["clinic"]), [])
+    entries.append(p)
+    if len(entries) > 1:
+        # Kayıt listeye zaten konmuştur; yeri listedeki sırasına göre bulunur
+        order = {id(r): i for i, r in enumerate(DATA["prices"])}
+        entries.sort(key=lambda e: order.get(id(e), len(order)))
+    _price_types[p["type"]] = _price_types.get(p["type"], 0) + 1
+
+def price_index_remove(p):
+    key = (p["type"], p["clinic"])
+    entries = _price_map[key]
+    entries[:] = [e for e in entries if e is not p]
+    if not entries:
+        del _price_map[key]
+    _price_types[p["type"]] -= 1
+    if not _price_types[p["type"]]:
+        del _price_types[p["type"]]
+
+def price_index_build(recs):
+    _price_map.clear()
+    _price_types.clear()
+    for p in recs:
+        _price_map.setdefault((p["type"], p["clinic"]), []).append(p)
+        _price_types[p["type"]] = _price_types.get(p["type"], 0) + 1
+
+def resolve_price(tip, klinik):
+    entries = _price_map.get((tip, klinik)) or _price_map.get((tip, "Genel"))
+    return entries[0]["price"] if entries else None
+
+def price_types():
+    return list(_price_types)
+
+def job_total(tip, klinik, count):
+    unit = resolve_price(tip, klinik)
+    try:
+        if unit:
+            return f"{float(unit) * int(count):.2f}"
+    except (TypeError, ValueError):
+        pass
+    return None
+
+def price_jobs(batch):
+    # İçe aktarma ve toplu yeniden fiyatlama için: her iş için toplam fiyat
+    # (fiyatı bulunamayanlar için None)
+    return [job_total(j["prosthesis"], j["clinic"], j["count"]) for j in batch]
+
+register_index("prices", price_index_add, price_index_remove, price_index_build)
+
+
+# === ARAMA İNDEKSİ ===
+# Ad/Soyad, klinik ve doktor süzgeçleri için. Metinler Türkçe kurallarıyla
+# küçük harfe çevrilir (İ -> i, I -> ı). Her alan için farklı değerler
+# üçlü harf gruplarıyla (trigram) indekslenir, her değer de onu taşıyan iş
+# id'lerine bağlanır. Sorgunun trigramlarını içeren değerler kesişimle
+# bulunur, gerçekten alt dize olanlar doğrulanır. Üç harften kısa sorgular
+# yalnızca farklı değerler üzerinde taranır.
+SEARCH_FIELDS = {
+    "name": lambda j: j["patient_name"] + " " + j["patient_surname"],
+    "clinic": lambda j: j["clinic"],
+    "doctor": lambda j: j["doctor"]
+}
+
+_search_values = {f: {} for f in SEARCH_FIELDS}  # alan -> {değer: {id, ...}}
+_search_grams = {f: {} for f in SEARCH_FIELDS}   # alan -> {trigram: {değer, ...}}
+_search_text = {f: {} for f in SEARCH_FIELDS}    # alan -> {id: değer}
+
+def tr_fold(text):
+    return text.replace("İ", "i").replace("I", "ı").lower()
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def search_index_add(job):
+    for field, get in SEARCH_FIELDS.items():
+        value = tr_fold(get(job))
+        _search_text[field][job["id"]] = value
+        ids = _search_values[field].get(value)
+        if ids is None:
+            ids = _search_values[field][value] = set()
+            for g in trigrams(value):
+                _search_grams[field].setdefault(g, set()).add(value)
+        ids.add(job["id"])
+
+def search_index_remove(job):
+    for field in SEARCH_FIELDS:
+        value = _search_text[field].pop(job["id"])
+        ids = _search_values[field][value]
+        ids.discard(job["id"])
+        if not ids:
+            del _search_values[field][value]
+            for g in trigrams(value):
+                values = _search_grams[field][g]
+                values.discard(value)
+                if not values:
+                    del _search_grams[field][g]
+
+def search_index_build(recs):
+    for field in SEARCH_FIELDS:
+        _search_values[field].clear()
+        _search_grams[field].clear()
+        _search_text[field].clear()
+    for job in recs:
+        search_index_add(job)
+
+def search_ids(field, query):
+    # Sorgu (tr_fold uygulanmış) alt dize olarak geçen işlerin id kümesi
+    grams = trigrams(query)
+    if grams:
+        sets = sorted((_search_grams[field].get(g, ()) for g in grams), key=len)
+        values = set(sets[0]).intersection(*sets[1:])
+    else:
+        values = _search_values[field]
+    ids = set()
+    for value in values:
+        if query in value:
+            ids |= _search_values[field][value]
+    return ids
+
+register_index("jobs", search_index_add, search_index_remove, search_index_build)
+
+
+# === BORÇ DEFTERİ ===
+# Klinik başına ciro ve ödenen toplamları her iş ve muhasebe değişikliğinde
+# farkla güncellenir; Borç Takibi sekmesi tüm kayıtları taramadan çizilir.
+# ledger_check tam yeniden hesaplamayla defteri doğrular.
+_ledger = {}  # klinik -> [ciro, ödenen]
+
+def job_price(job):
+    # Job kayıtlarında fiyat zaten sayıdır; düz sözlükler (içe aktarma
+    # öncesi satırlar gibi) metinden çevrilir
+    if job.__class__ is Job:
+        return job.price
+    try:
+        return float(job["total_price"])
+    except:
+        return 0
+
+def payment_amount(r):
+    return float(r["amount"]) if r["type"] == "Gelir" else 0
+
+def ledger_entry(clinic):
+    entry = _ledger.get(clinic)
+    if entry is None:
+        entry = _ledger[clinic] = [0.0, 0.0]
+    return entry
+
+def ledger_job_add(job):
+    ledger_entry(job["clinic"])[0] += job_price(job)
+
+def ledger_job_remove(job):
+    ledger_entry(job["clinic"])[0] -= job_price(job)
+
+def ledger_job_build(recs):
+    for entry in _ledger.values():
+        entry[0] = 0.0
+    for job in recs:
+        ledger_job_add(job)
+
+def ledger_finance_add(r):
+    ledger_entry(r["clinic"])[1] += payment_amount(r)
+
+def ledger_finance_remove(r):
+    ledger_entry(r["clinic"])[1] -= payment_amount(r)
+
+def ledger_finance_build(recs):
+    for entry in _ledger.values():
+        entry[1] = 0.0
+    for r in recs:
+        ledger_finance_add(r)
+
+def ledger_recompute():
+    fresh = {}
+    for job in DATA["jobs"].values():
+        fresh.setdefault(job["clinic"], [0.0, 0.0])[0] += job_price(job)
+    for r in DATA["finance"].values():
+        fresh.setdefault(r["clinic"], [0.0, 0.0])[1] += payment_amount(r)
+    return fresh
+
+def ledger_check():
+    # Defteri baştan hesaplananla karşılaştırır, farklı çıkan klinikleri döndürür ve düzeltir
+    fresh = ledger_recompute()
+    diffs = []
+    for clinic in set(fresh) | set(_ledger):
+        old = _ledger.get(clinic, [0.0, 0.0])
+        new = fresh.get(clinic, [0.0, 0.0])
+        if abs(old[0] - new[0]) > 0.005 or abs(old[1] - new[1]) > 0.005:
+            diffs.append(clinic)
+    _ledger.clear()
+    _ledger.update(fresh)
+    return sorted(diffs)
+
+def clinic_debt(clinic):
+    ciro, odenen = _ledger.get(clinic, (0.0, 0.0))
+    # Farkla güncellenen toplamlarda -0.00 görünmesin
+    ciro = round(ciro, 2) + 0.0
+    odenen = round(odenen, 2) + 0.0
+    return {
+        "clinic": clinic,
+        "ciro": ciro,
+        "odeme": odenen,
+        "borc": ciro - odenen
+    }
+
+def hesapla_borclar():
+    return [clinic_debt(clinic["name"]) for clinic in DATA["clinics"]]
+
+register_index("jobs", ledger_job_add, ledger_job_remove, ledger_job_build)
+register_index("finance", ledger_finance_add, ledger_finance_remove, ledger_finance_build)
+
+
+# === CİRO KÜPÜ ===
+# Raporlar ham işleri taramaz. (klinik, ay, protez tipi) başına toplam ve iş
+# sayısı, ayrıca gün başına (klinik, protez tipi) toplamları iş ekleme,
+# düzenleme ve silmede güncellenir. Klinik/aylık toplamlar, geçen yılla
+# karşılaştırma ve istenen tarih aralıkları bu küpten hesaplanır.
+_rollup = {}        # (klinik, "YYYY-AA" ya da None, protez) -> [toplam, iş sayısı]
+_daily_rollup = {}  # gün sırası -> {(klinik, protez): [toplam, iş sayısı]}
+_rollup_days = []   # _daily_rollup anahtarları, sıralı
+
+def month_of(day):
+    d = date.fromordinal(day)
+    return f"{d.year:04d}-{d.month:02d}"
+
+def rollup_change(job, sign):
+    day = date_key(job["date"])
+    price = sign * job_price(job)
+    key = (job["clinic"], None if day is None else month_of(day), job["prosthesis"])
+    entry = _rollup.get(key)
+    if entry is None:
+        entry = _rollup[key] = [0.0, 0]
+    entry[0] += price
+    entry[1] += sign
+    if not entry[1]:
+        del _rollup[key]
+    if day is None:
+        return
+    groups = _daily_rollup.get(day)
+    if groups is None:
+        groups = _daily_rollup[day] = {}
+        insort(_rollup_days, day)
+    entry = groups.get(key[::2])
+    if entry is None:
+        entry = groups[key[::2]] = [0.0, 0]
+    entry[0] += price
+    entry[1] += sign
+    if not entry[1]:
+        del groups[key[::2]]
+        if not groups:
+            del _daily_rollup[day]
+            del _rollup_days[bisect_left(_rollup_days, day)]
+
+def rollup_build(recs):
+    _rollup.clear()
+    _daily_rollup.clear()
+    del _rollup_days[:]
+    for job in recs:
+        rollup_change(job, 1)
+
+def hesapla_klinik_ciro():
+    ciro_dict = {}
+    for (klinik, _, _), (toplam, _) in _rollup.items():
+        ciro_dict[klinik] = ciro_dict.get(klinik, 0) + toplam
+    return ciro_dict
+
+def hesapla_aylik_ciro():
+    aylik_dict = {}
+    for (_, ay, _), (toplam, _) in _rollup.items():
+        if ay is not None:
+            aylik_dict[ay] = aylik_dict.get(ay, 0) + toplam
+    return aylik_dict
+
+def rollup_window(start=None, end=None, by="clinic"):
+    # Gün sırası aralığındaki (dahil) ciro; by: "clinic", "prosthesis" ya da "month"
+    lo = 0 if start is None else bisect_left(_rollup_days, start)
+    hi = len(_rollup_days) if end is None else bisect_left(_rollup_days, end + 1)
+    totals = {}
+    for day in _rollup_days[lo:hi]:
+        groups = _daily_rollup[day]
+        if by == "month":
+            ay = month_of(day)
+            totals[ay] = totals.get(ay, 0) + sum(toplam for toplam, _ in groups.values())
+            continue
+        i = 0 if by == "clinic" else 1
+        for key, (toplam, _) in groups.items():
+            totals[key[i]] = totals.get(key[i], 0) + toplam
+    return totals
+
+def rollup_yoy(year):
+    # [(ay, geçen yıl, bu yıl), ...]
+    aylik = hesapla_aylik_ciro()
+    return [
+        (f"{ay:02d}", aylik.get(f"{year - 1}-{ay:02d}", 0), aylik.get(f"{year}-{ay:02d}", 0))
+        for ay in range(1, 13)
+    ]
+
+register_index("jobs", partial(rollup_change, sign=1), partial(rollup_change, sign=-1), rollup_build)
+
+
+# === SIRALAMA İNDEKSLERİ ===
+# Listelerde sütun başlığına tıklanınca kullanılan sıralar. Bir alanın sıralı
+# (anahtar, id) listesi o alana göre ilk sıralamada kurulur, sonra her
+# değişiklikte bisect ile güncel tutulur. Yeniden sıralamak ya da sırayı ters
+# çevirmek kayıtları yeniden sıralamaz; var olan sıra süzgeç sonucuyla
+# süzülerek okunur. Metinler Türk alfabesi sırasıyla ve büyük/küçük harf
+# ayırmadan, tarihsiz kayıtlar en başa sıralanır.
+TR_ALPHABET = "abcçdefgğhıijklmnoöpqrsştuüvwxyz"
+TR_ORDER = {ord(c): chr(0x100 + i) for i, c in enumerate(TR_ALPHABET)}
+SORT_SUBSET_FACTOR = 8  # süzgeç sonucu koleksiyonun 1/8'inden küçükse doğrudan sıralanır
+
+def tr_sort_key(value):
+    return tr_fold(str(value or "")).translate(TR_ORDER)
+
+def number_sort_key(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+def text_sort(field):
+    return lambda r: tr_sort_key(r.get(field))
+
+def number_sort(field):
+    return lambda r: number_sort_key(r.get(field))
+
+def date_sort(field):
+    def key(r):
+        day = date_key(r.get(field))
+        return -1 if day is None else day
+    return key
+
+SORT_FIELDS = {
+    "jobs": {
+        "date": date_sort("date"), "clinic": text_sort("clinic"), "doctor": text_sort("doctor"),
+        "patient_name": text_sort("patient_name"), "patient_surname": text_sort("patient_surname"),
+        "prosthesis": text_sort("prosthesis"), "count": number_sort("count"), "price": job_price,
+        "note": text_sort("note"), "status": text_sort("status")
+    },
+    "finance": {
+        "date": date_sort("date"), "clinic": text_sort("clinic"), "type": text_sort("type"),
+        "desc": text_sort("desc"), "amount": number_sort("amount")
+    },
+    "envanter": {
+        "ad": text_sort("ad"), "miktar": number_sort("miktar"), "birim": text_sort("birim"),
+        "giris": date_sort("giris"), "skt": date_sort("skt"), "siparis": text_sort("siparis"),
+        "not": text_sort("not")
+    }
+}
+
+_sort_index = {}  # (koleksiyon, alan) -> sıralı [(anahtar, id), ...]
+_sort_keys = {}   # (koleksiyon, alan) -> {id: anahtar}
+_sorted_fields = {name: [] for name in SORT_FIELDS}  # koleksiyon -> sıralaması kurulmuş alanlar
+
+def sort_index_add(name, record):
+    for field in _sorted_fields[name]:
+        key = SORT_FIELDS[name][field](record)
+        _sort_keys[(name, field)][record["id"]] = key
+        insort(_sort_index[(name, field)], (key, record["id"]))
+
+def sort_index_remove(name, record):
+    for field in _sorted_fields[name]:
+        key = _sort_keys[(name, field)].pop(record["id"])
+        index = _sort_index[(name, field)]
+        del index[bisect_left(index, (key, record["id"]))]
+
+def sort_field_build(name, field, recs):
+    get = SORT_FIELDS[name][field]
+    keys = _sort_keys[(name, field)] = {r["id"]: get(r) for r in recs}
+    _sort_index[(name, field)] = sorted((key, rid) for rid, key in keys.items())
+
+def sort_index_build(name, recs):
+    recs = list(recs)
+    for field in _sorted_fields[name]:
+        sort_field_build(name, field, recs)
+
+def sorted_ids(name, field, reverse=False, ids=None):
+    # ids (süzgeç sonucu) verilirse yalnızca onlar, None ise tüm kayıtlar;
+    # eşit anahtarlar kayıt sırasıyla
+    if field not in _sorted_fields[name]:
+        sort_field_build(name, field, DATA[name].values())
+        _sorted_fields[name].append(field)
+    index = _sort_index[(name, field)]
+    if ids is None:
+        order = [rid for _, rid in index]
+    elif len(ids) * SORT_SUBSET_FACTOR < len(index):
+        keys = _sort_keys[(name, field)]
+        order = sorted(ids, key=lambda rid: (keys[rid], rid))
+    else:
+        wanted = set(ids)
+        order = [rid for _, rid in index if rid in wanted]
+    if reverse:
+        order.reverse()
+    return order
+
+for name in SORT_FIELDS:
+    register_index(name, partial(sort_index_add, name), partial(sort_index_remove, name), partial(sort_index_build, name))
+
+
+# === SÜZGEÇLER ===
+# İş sorgusu (başlangıç, bitiş, klinik, doktor, ad) ve muhasebe sorgusu
+# (başlangıç, bitiş, klinik) demetleridir. Tarihler gün sırası, metinler
+# tr_fold uygulanmış haldedir; make_job_query / make_finance_query arayüzdeki
+# gibi ham "GG/AA/YYYY" ve metin alanlarından kurar.
+FILTER_CHUNK = 5000  # filter_job_steps'in tarih süzgecinde bir adımda bakılan id sayısı
+
+def parse_filter_date(value):
+    if not value:
+        return None
+    return datetime.strptime(value, "%d/%m/%Y").toordinal()
+
+def make_job_query(start="", end="", clinic="", doctor="", name=""):
+    return (
+        parse_filter_date(start),
+        parse_filter_date(end),
+        tr_fold(clinic),
+        tr_fold(doctor),
+        tr_fold(name)
+    )
+
+def make_finance_query(start="", end="", clinic=""):
+    return (parse_filter_date(start), parse_filter_date(end), clinic)
+
+def key_in_range(key, start, end):
+    return key is not None and (start is None or key >= start) and (end is None or key <= end)
+
+def in_date_range(record, start, end):
+    if start is None and end is None:
+        return True
+    return key_in_range(date_key(record["date"]), start, end)
+
+def job_matches(job, query):
+    start, end, clinic, doctor, name = query
+    for field, text in (("clinic", clinic), ("doctor", doctor), ("name", name)):
+        if text and text not in tr_fold(SEARCH_FIELDS[field](job)):
+            return False
+    return in_date_range(job, start, end)
+
+def filter_job_steps(query):
+    # filter_job_ids'in adım adım çalışan hali (canlı süzgeç için): her metin
+    # alanının indeks araması ve tarih süzgecinin her FILTER_CHUNK'lık parçası
+    # ayrı bir adımdır. Sonuç üretecin dönüş değeridir:
+    #     keys = yield from filter_job_steps(query)
+    start, end, clinic, doctor, name = query
+    ids = None
+    for field, text in (("clinic", clinic), ("doctor", doctor), ("name", name)):
+        if text:
+            found = search_ids(field, text)
+            ids = found if ids is None else ids & found
+            yield
+    dated = start is not None or end is not None
+    if ids is None:
+        if not dated:
+            return None
+        return date_range_ids("jobs", start, end)
+    keys = sorted(ids)
+    if not dated:
+        return keys
+    # Metin süzgeci zaten daraltmış, kalanların tarihine önceden hesaplanmış gün sırasından bakılır
+    yield
+    date_keys = _date_keys["jobs"]
+    result = []
+    for i in range(0, len(keys), FILTER_CHUNK):
+        result += [k for k in keys[i:i + FILTER_CHUNK] if key_in_range(date_keys[k], start, end)]
+        yield
+    return result
+
+@profiled(rows=lambda keys, query: len(DATA["jobs"]) if keys is None else len(keys))
+def filter_job_ids(query):
+    # Süzgeçten geçen iş id'leri (kayıt sırasıyla); süzgeç boşsa None
+    steps = filter_job_steps(query)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+def job_records(keys):
+    jobs = DATA["jobs"]
+    return list(jobs.values()) if keys is None else [jobs[k] for k in keys]
+
+@profiled()
+def filter_jobs(query):
+    return job_records(filter_job_ids(query))
+
+def jobs_total(result):
+    return sum(job_price(job) for job in result)
+
+def finance_matches(r, query, check_date=True):
+    start, end, clinic = query
+    if clinic and clinic != r["clinic"]:
+        return False
+    return not check_date or in_date_range(r, start, end)
+
+def filtered_finance(query):
+    finance_records = DATA["finance"]
+    start, end = query[:2]
+    if start is None and end is None:
+        candidates = finance_records.values()
+    else:
+        candidates = [finance_records[k] for k in date_range_ids("finance", start, end)]
+    return [r for r in candidates if finance_matches(r, query, check_date=False)]
+
+def finance_totals(result):
+    total_income = 0
+    total_expense = 0
+    for r in result:
+        if r["type"] == "Gelir":
+            total_income += r["amount"]
+        else:
+            total_expense += r["amount"]
+    return total_income, total_expense
@@ -0,0 +1,224 @@
+import os
+import threading
+
+from dplab.profiler import profiled, profile_rows
+
+
+# === EXCEL ===
+# Dışa aktarmalar openpyxl'in yalnızca-yazma (write_only) kipiyle yapılır:
+# satırlar üreteçlerden gelir ve diske akıtılır, çalışma kitabının tamamı
+# bellekte kurulmaz. Arayüz iş parçacığına dokunulmaz; ilerleme ve iptal
+# çağıranın verdiği fonksiyonlarla bildirilir. Dosya önce geçici adla
+# yazılır, iptal ya da hata durumunda yarım dosya bırakılmaz.
+EXPORT_PROGRESS_EVERY = 500
+
+JOB_COLUMNS = ["Tarih", "Klinik", "Doktor", "Ad", "Soyad", "Protez", "Üye", "Fiyat", "Not", "Durum"]
+
+def job_rows(jobs):
+    for job in jobs:
+        yield [
+            job["date"], job["clinic"], job["doctor"], job["patient_name"], job["patient_surname"],
+            job["prosthesis"], job["count"], job["total_price"], job["note"],
+            job.get("status", "Hazırlanıyor")
+        ]
+
+def report_sheets(klinik_ciro, aylik_ciro):
+    return [
+        ("Klinik Ciro", ["Klinik", "Toplam Ciro (₺)"], ([k, v] for k, v in klinik_ciro.items())),
+        ("Aylık Ciro", ["Ay", "Toplam Gelir (₺)"], ([a, v] for a, v in sorted(aylik_ciro.items())))
+    ]
+
+@profiled()
+def write_xlsx(path, sheets, progress=None, cancelled=None):
+    # sheets: [(sayfa adı, başlık satırı, satır üreteci), ...]
+    # progress(yazılan satır sayısı) her EXPORT_PROGRESS_EVERY satırda ve
+    # sonda çağrılır. cancelled() True dönerse yazma bırakılır. Dosya
+    # tamamlandıysa True, iptal edildiyse False döner.
+    import openpyxl
+    wb = openpyxl.Workbook(write_only=True)
+    done = 0
+    for title, header, rows in sheets:
+        ws = wb.create_sheet(title)
+        ws.append(header)
+        for row in rows:
+            ws.append(row)
+            done += 1
+            if done % EXPORT_PROGRESS_EVERY == 0:
+                if cancelled is not None and cancelled():
+                    # Sayfaların geçici dosyaları düzgün kapansın
+                    for sheet in wb.worksheets:
+                        sheet.close()
+                    return False
+                if progress is not None:
+                    progress(done)
+
+    tmp = path + ".tmp"
+    try:
+        wb.save(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    profile_rows(done)
+    if progress is not None:
+        progress(done)
+    return True
+
+
+# === PDF ===
+# Tüm PDF çıktıları buradan geçer ve Excel gibi arka planda çalışabilir.
+# İşler sayfalara bölünmüş bir tabloya dizilir, başlık satırı her sayfada
+# tekrarlanır, sütuna sığmayan metin kısaltılır.
+PDF_FONT = os.path.join("data", "DejaVuSans.ttf")
+PDF_ROW_HEIGHT = 6
+
+JOB_PDF_WIDTHS = (22, 35, 30, 25, 25, 30, 12, 22, 46, 30)  # A4 yatay, 277 mm
+REPORT_PDF_WIDTHS = (110, 60)
+
+_font_templates = {}  # font dosyası -> şablon belgede ayrıştırılmış font
+_font_lock = threading.Lock()
+
+def pdf_font(pdf, path=PDF_FONT):
+    # fpdf2 add_font'ta fontun karakter tablosunu, genişliklerini ve glif
+    # numaralarını ayrıştırır, çıktı sırasında da fontu yerinde alt kümeye
+    # küçültür. Bu yüzden font süreç başına bir kez, hiç çıktı alınmayan bir
+    # şablon belgeye eklenir. Her belge şablonun ölçülerini paylaşan bir kopya
+    # alır; kopyanın kendi alt küme tablosu ve küçültülecek, tembel açılmış
+    # (yalnızca tablo dizini okunan) bir font dosyası vardır. Kopyalama
+    # fpdf2'nin iç alanlarına dayanır ve requirements.txt'deki sürümle
+    # denenmiştir; başka bir sürümde alanlar tutmazsa font her belgeye
+    # olağan yoldan, yeniden ayrıştırılarak eklenir.
+    from copy import copy
+    from collections import defaultdict
+    from fontTools import ttLib
+    from fpdf import FPDF
+    try:
+        from fpdf.fonts import SubsetMap
+        with _font_lock:
+            template = _font_templates.get(path)
+            if template is None:
+                owner = FPDF()
+                owner.add_font("DejaVu", "", path)
+                template = _font_templates[path] = owner.fonts["dejavu"]
+        font = copy(template)
+        font.i = len(pdf.fonts) + 1
+        font.ttfont = ttLib.TTFont(path, recalcTimestamp=False, lazy=True)
+        font.cw = defaultdict(template.cw.default_factory, template.cw)
+        font.missing_glyphs = []
+        font.biggest_size_pt = 0
+        font._hbfont = None
+        font.subset = SubsetMap(font)
+    except (ImportError, AttributeError, TypeError):
+        pdf.add_font("DejaVu", "", path)
+        return
+    pdf.fonts["dejavu"] = font
+
+def new_pdf(orientation="P"):
+    from fpdf import FPDF
+    pdf = FPDF(orientation=orientation, format="A4")
+    pdf.set_margins(10, 10)
+    pdf.set_auto_page_break(True, 10)
+    pdf_font(pdf)
+    pdf.add_page()
+    return pdf
+
+def fit_text(pdf, text, width):
+    text = str(text)
+    room = width - 2 * pdf.c_margin
+    full = pdf.get_string_width(text)
+    if full <= room:
+        return text
+    text = text[:max(int(len(text) * room / full), 1)]
+    while len(text) > 1 and pdf.get_string_width(text + "…") > room:
+        text = text[:-1]
+    return text + "…"
+
+def pdf_title(pdf, text):
+    pdf.set_font("DejaVu", size=12)
+    pdf.cell(0, 10, text, align="C")
+    pdf.ln()
+
+def pdf_table(pdf, header, widths, rows, progress=None, cancelled=None, done=0):
+    # Yazılan toplam satır sayısını, iptal edildiyse None döndürür.
+    # Klinik, doktor, durum gibi değerler çok tekrarlar; kısaltma sonucu
+    # (metin, genişlik) başına bir kez hesaplanır.
+    fitted = {}
+
+    def fit(value, w):
+        text = fitted.get((value, w))
+        if text is None:
+            text = fitted[(value, w)] = fit_text(pdf, value, w)
+        return text
+
+    def draw_header():
+        pdf.set_fill_color(230, 230, 230)
+        for title, w in zip(header, widths):
+            pdf.cell(w, PDF_ROW_HEIGHT, fit_text(pdf, title, w), border=1, fill=True)
+        pdf.ln()
+
+    pdf.set_font("DejaVu", size=8)
+    draw_header()
+    bottom = pdf.h - pdf.b_margin
+    for row in rows:
+        if pdf.get_y() + PDF_ROW_HEIGHT > bottom:
+            pdf.add_page()
+            draw_header()
+        for value, w in zip(row, widths):
+            pdf.cell(w, PDF_ROW_HEIGHT, fit(value, w), border=1)
+        pdf.ln()
+        done += 1
+        if done % EXPORT_PROGRESS_EVERY == 0:
+            if cancelled is not None and cancelled():
+                return None
+            if progress is not None:
+                progress(done)
+    return done
+
+def save_pdf(pdf, path):
+    tmp = path + ".tmp"
+    try:
+        pdf.output(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+def render_jobs_pdf(jobs, progress=None, cancelled=None):
+    pdf = new_pdf("L")
+    pdf_title(pdf, "DP Lab - İş Listesi")
+    rows = (row[:7] + [f"₺{row[7]}"] + row[8:] for row in job_rows(jobs))
+    if pdf_table(pdf, JOB_COLUMNS, JOB_PDF_WIDTHS, rows, progress, cancelled) is None:
+        return None
+    return pdf
+
+@profiled(rows=lambda result, path, jobs, *args, **kwargs: len(jobs) if result else 0)
+def write_jobs_pdf(path, jobs, progress=None, cancelled=None):
+    # write_xlsx gibi: tamamlandıysa True, iptal edildiyse False
+    pdf = render_jobs_pdf(jobs, progress, cancelled)
+    if pdf is None:
+        return False
+    save_pdf(pdf, path)
+    if progress is not None:
+        progress(len(jobs))
+    return True
+
+@profiled()
+def write_report_pdf(path, klinik_ciro, aylik_ciro, progress=None, cancelled=None):
+    pdf = new_pdf()
+    done = 0
+    titles = ("Klinik Bazlı Ciro", "Aylık Ciro")
+    for i, (_, header, rows) in enumerate(report_sheets(klinik_ciro, aylik_ciro)):
+        if i:
+            pdf.ln(5)
+        pdf_title(pdf, titles[i])
+        rows = ([k, f"₺{v:.2f}"] for k, v in rows)
+        done = pdf_table(pdf, header, REPORT_PDF_WIDTHS, rows, progress, cancelled, done)
+        if done is None:
+            return False
+    save_pdf(pdf, path)
+    profile_rows(done)
+    if progress is not None:
+        progress(done)
+    return True
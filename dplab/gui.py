@@ -0,0 +1,1658 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+import os
+import time
+import threading
+from bisect import bisect_left
+from functools import partial
+from datetime import datetime, date
+
+from dplab.storage import (
+    load_all, DATA, insert_record, insert_records, update_record, delete_record, save_collection,
+    flush_writes, save_state, writer_error, ServerError, remote_mode, apply_remote, server_online,
+    server_reconnect
+)
+from dplab.qr import qr_payload, ensure_label, write_label_sheet
+from dplab.exporters import (
+    job_rows, report_sheets, write_xlsx, write_jobs_pdf, write_report_pdf, JOB_COLUMNS, PDF_FONT
+)
+from dplab.core import (
+    JOB_STATUSES, price_types, job_total, job_price, hesapla_borclar, clinic_debt, ledger_check,
+    hesapla_klinik_ciro, hesapla_aylik_ciro, rollup_yoy,
+    parse_filter_date, make_job_query, make_finance_query, job_matches, filter_jobs,
+    filter_job_steps, finance_matches, filtered_finance, finance_totals, date_range_ids,
+    SORT_FIELDS, sorted_ids, tr_sort_key, number_sort_key
+)
+from dplab.aggregate import jobs_sum, group_total, finance_net
+from dplab.querycache import (
+    job_view, finance_view, cache_key, cache_get, cache_put, cache_stats, cache_reset_stats
+)
+from dplab.importer import read_import, count_rows, reject_report_path, write_reject_report
+from dplab.profiler import (
+    profiled, profile_rows, set_profiling, profiling_enabled, profile_stats, profile_reset,
+    profile_flush, profile_call
+)
+
+# Excel (openpyxl), PDF (fpdf) ve QR (qrcode, PIL) kütüphaneleri açılışta
+# değil, ilgili düğmeye ilk basıldığında yüklenir.
+
+
+# === VERİ ===
+try:
+    load_all()
+except ServerError as e:
+    messagebox.showerror("Sunucu", str(e))
+    exit()
+jobs = DATA["jobs"]
+clinics = DATA["clinics"]
+doctors = DATA["doctors"]
+prices = DATA["prices"]
+finance_records = DATA["finance"]
+envanter_kayitlari = DATA["envanter"]
+
+
+if not verify_or_request_license():
+    exit()
+
+
+root = tk.Tk()
+root.title("DP Lab - Diş Protez Takip")
+root.geometry("1200x750")
+
+status_bar = tk.Frame(root)
+status_bar.pack(side="bottom", fill="x", padx=10)
+tk.Button(status_bar, text="Tanılama", relief="flat", command=lambda: tanilama_penceresi()).pack(side="left")
+save_status_label = tk.Label(status_bar, text="", anchor="e")
+save_status_label.pack(side="right", fill="x", expand=True)
+
+notebook = ttk.Notebook(root)
+notebook.pack(fill="both", expand=True)
+
+new_job_tab = ttk.Frame(notebook)
+all_jobs_tab = ttk.Frame(notebook)
+clinic_tab = ttk.Frame(notebook)
+price_tab = ttk.Frame(notebook)
+finance_tab = ttk.Frame(notebook)
+notebook.add(finance_tab, text="Muhasebe")
+
+
+notebook.add(new_job_tab, text="Yeni İş Girişi")
+notebook.add(all_jobs_tab, text="Tüm İşler")
+notebook.add(clinic_tab, text="Klinik & Doktor")
+notebook.add(price_tab, text="Fiyat Listesi")
+report_tab = ttk.Frame(notebook)
+notebook.add(report_tab, text="Raporlama")
+
+
+editing_job_id = None
+
+# === SANAL LİSTE ===
+# Büyük tablolarda Treeview'e yalnızca ilk sayfa eklenir; kullanıcı listenin
+# sonuna yaklaştıkça sıradaki sayfa eklenir. Sorgu sonucu bellekte tutulur,
+# toplamlar da satırlardan değil sorgu sonucundan hesaplanır. Listedeki
+# kayıtlar id'leriyle ayrıca tutulur; tek kaydın değişikliğinde satırın yeri
+# listeyi taramadan, sıralı listede sıralama anahtarıyla, değilse id
+# sırasıyla ikili aramayla bulunur.
+VIRTUAL_PAGE = 200
+
+_virtual = {}  # treeview -> {"rows": kayıtlar, "keys": id'ler, "index": {id: kayıt}, "values": satır biçimi, "shown": eklenen satır sayısı}
+
+def virtual_attach(tree, scrollbar, values):
+    _virtual[tree] = {"rows": [], "keys": [], "index": {}, "values": values, "shown": 0, "pending": False}
+    scrollbar.config(command=tree.yview)
+    tree.config(yscrollcommand=lambda first, last: virtual_scroll(tree, scrollbar, first, last))
+
+def virtual_fill(tree, rows):
+    state = _virtual[tree]
+    tree.delete(*tree.get_children())
+    state["rows"] = rows
+    state["keys"] = [r["id"] for r in rows]
+    state["index"] = {r["id"]: r for r in rows}
+    profile_rows(len(rows))
+    state["shown"] = 0
+    virtual_more(tree)
+
+def virtual_extend(tree, rows):
+    # Sonucu parça parça gelen sorgular için: satırlar listenin sonuna eklenir,
+    # ilk sayfa dolana kadar hemen gösterilir
+    state = _virtual[tree]
+    state["rows"].extend(rows)
+    state["keys"].extend(r["id"] for r in rows)
+    state["index"].update((r["id"], r) for r in rows)
+    if state["shown"] < VIRTUAL_PAGE:
+        virtual_more(tree)
+
+def virtual_position(tree, key, record=None):
+    # Listedeki (record verilirse eklenecek) satırın yeri
+    state = _virtual[tree]
+    keys = state["keys"]
+    if sort_order(tree) is None:
+        pos = bisect_left(keys, key)
+    else:
+        pos = sorted_position(tree, state["rows"], state["index"][key] if record is None else record)
+    if record is None and (pos == len(keys) or keys[pos] != key):
+        # Sırası bozuk liste (ör. id'leri sonradan verilmiş eski kayıtlar)
+        pos = keys.index(key)
+    return pos
+
+def virtual_apply(tree, key, record):
+    # Tek kaydın değişikliğini listeye yansıtır: record görünümde olmalıysa
+    # eklenir/güncellenir, None ise satır kaldırılır. Yeni kayıt id ya da
+    # sıralama sırasındaki yerine eklenir; değişen kayıt da yerini bulur.
+    state = _virtual[tree]
+    keys = state["keys"]
+    pos = virtual_position(tree, key) if key in state["index"] else None
+    sort = sort_order(tree)
+    if pos is not None and (record is None or sort is not None):
+        del keys[pos]
+        del state["rows"][pos]
+        del state["index"][key]
+        if pos < state["shown"]:
+            tree.delete(key)
+            state["shown"] -= 1
+        pos = None
+        if record is None:
+            return
+    if pos is not None:
+        state["rows"][pos] = state["index"][key] = record
+        if pos < state["shown"]:
+            tree.item(key, values=state["values"](record))
+    elif record is not None:
+        pos = virtual_position(tree, key, record)
+        keys.insert(pos, key)
+        state["rows"].insert(pos, record)
+        state["index"][key] = record
+        if pos < state["shown"] or state["shown"] == len(keys) - 1:
+            tree.insert("", pos, iid=key, values=state["values"](record))
+            state["shown"] += 1
+
+def virtual_more(tree):
+    state = _virtual[tree]
+    state["pending"] = False
+    start = state["shown"]
+    end = min(start + VIRTUAL_PAGE, len(state["rows"]))
+    values = state["values"]
+    for r in state["rows"][start:end]:
+        tree.insert("", "end", iid=r["id"], values=values(r))
+    state["shown"] = end
+
+def virtual_scroll(tree, scrollbar, first, last):
+    scrollbar.set(first, last)
+    state = _virtual[tree]
+    if float(last) > 0.9 and state["shown"] < len(state["rows"]) and not state["pending"]:
+        state["pending"] = True
+        tree.after_idle(virtual_more, tree)
+
+# === SIRALAMA ===
+# Sütun başlığına tıklamak listeyi o sütuna göre sıralar, ikinci tıklama
+# sırayı ters çevirir. Sanal listelerde (işler, muhasebe, envanter) sıra
+# çekirdekteki sıralama indekslerinden okunur ve etkin süzgecin sonucuyla
+# birleştirilir; Treeview satırları okunmaz. Kimliksiz küçük listeler
+# (fiyatlar, borçlar) kaynak kayıtlardan düz sıralanıp yeniden doldurulur.
+_sorting = {}  # treeview -> {"columns": {sütun: alan ya da anahtar fonksiyonu}, "name", "titles", "by", "refresh"}
+
+def sortable(tree, columns, name=None, refresh=None):
+    # name verilirse columns koleksiyonun SORT_FIELDS alanlarıdır (sanal
+    # liste); verilmezse anahtar fonksiyonlarıdır ve refresh listeyi
+    # sort_rows ile yeniden doldurur
+    _sorting[tree] = {
+        "columns": columns, "name": name, "refresh": refresh, "by": None,
+        "titles": {col: tree.heading(col, "text") for col in columns}
+    }
+    for col in columns:
+        tree.heading(col, command=partial(sort_by, tree, col))
+
+def sort_order(tree):
+    # Sanal listenin (alan, ters) sırası; sıralı değilse None
+    sort = _sorting.get(tree)
+    if sort is None or sort["by"] is None:
+        return None
+    col, reverse = sort["by"]
+    return sort["columns"][col], reverse
+
+def sort_by(tree, col):
+    sort = _sorting[tree]
+    reverse = sort["by"] == (col, False)
+    sort["by"] = (col, reverse)
+    for c, title in sort["titles"].items():
+        tree.heading(c, text=title + (" ▼" if reverse else " ▲") if c == col else title)
+    if sort["name"] is None:
+        sort["refresh"]()
+    elif live_running(tree):
+        live_start(tree)
+    else:
+        virtual_fill(tree, view_records(tree, _virtual[tree]["keys"]))
+
+def view_ids(tree, ids):
+    # Süzgeç sonucunun (None ise tüm koleksiyonun) id'leri, listenin sırasıyla
+    name = _sorting[tree]["name"]
+    order = sort_order(tree)
+    if order is None:
+        return list(DATA[name]) if ids is None else ids
+    return sorted_ids(name, order[0], order[1], ids)
+
+def view_records(tree, ids):
+    coll = DATA[_sorting[tree]["name"]]
+    return [coll[k] for k in view_ids(tree, ids)]
+
+def sorted_position(tree, rows, record):
+    # Sıralı listede record'un gireceği yer (eşit anahtarlarda id sırası)
+    field, reverse = sort_order(tree)
+    get = SORT_FIELDS[_sorting[tree]["name"]][field]
+    key = (get(record), record["id"])
+    lo, hi = 0, len(rows)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        other = (get(rows[mid]), rows[mid]["id"])
+        if (other > key) if reverse else (other < key):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def sort_rows(tree, rows):
+    sort = _sorting[tree]
+    if sort["by"] is None:
+        return rows
+    col, reverse = sort["by"]
+    return sorted(rows, key=sort["columns"][col], reverse=reverse)
+
+
+# === CANLI SÜZGEÇ ===
+# Süzgeç alanları yazarken uygulanır. Tuş vuruşları LIVE_FILTER_DELAY ms
+# beklenerek birleştirilir; yeni sorgu başlayınca bekleyen ya da çalışmakta
+# olan sorgu bırakılır. Sorgu bir üreteçtir: her adımda sonucun bir
+# parçasını (LIVE_CHUNK satır) listeye ekler. Adımlar arayüz döngüsünde
+# dilim başına en fazla LIVE_BUDGET saniye çalıştırılır, liste yazarken
+# dolar ve arayüz donmaz.
+LIVE_FILTER_DELAY = 250
+LIVE_CHUNK = 5000
+LIVE_BUDGET = 0.02
+
+_live = {}  # treeview -> {"after": bekleyen after id'si, "steps": çalışan üreteç, "start": üreteci kuran fonksiyon}
+
+def live_cancel(tree):
+    state = _live.setdefault(tree, {"after": None, "steps": None, "start": None})
+    if state["after"] is not None:
+        root.after_cancel(state["after"])
+        state["after"] = None
+    if state["steps"] is not None:
+        state["steps"].close()
+        state["steps"] = None
+    return state
+
+def live_running(tree):
+    return tree in _live and _live[tree]["steps"] is not None
+
+def live_schedule(tree, start):
+    state = live_cancel(tree)
+    state["start"] = start
+    state["after"] = root.after(LIVE_FILTER_DELAY, live_start, tree)
+
+def live_start(tree):
+    state = live_cancel(tree)
+    state["steps"] = state["start"]()
+    live_step(tree)
+
+def live_step(tree):
+    state = _live[tree]
+    state["after"] = None
+    deadline = time.perf_counter() + LIVE_BUDGET
+    try:
+        # Her dilimde en az bir adım atılır
+        next(state["steps"])
+        while time.perf_counter() < deadline:
+            next(state["steps"])
+    except StopIteration:
+        state["steps"] = None
+        return
+    state["after"] = root.after(1, live_step, tree)
+
+
+# === SEKME YÜKLEME ===
+# Sekmelerin listeleri açılışta doldurulmaz. Her sekme ilk seçildiğinde
+# doldurulur; pencere açıldıktan sonra kalan sekmeler de boşta kalınan
+# anlarda, her dilimde en fazla WARMUP_BUDGET saniye çalışarak doldurulur.
+# Henüz doldurulmamış bir sekmeye kayıt değişiklikleri yansıtılmaz, ilk
+# açılışta zaten güncel haliyle doldurulur.
+WARMUP_BUDGET = 0.05
+
+_tab_loaders = {}  # sekme adı -> [doldurma fonksiyonları]
+_tabs_loaded = set()
+
+def lazy_tab(tab, *loaders):
+    _tab_loaders[str(tab)] = loaders
+
+def tab_loaded(tab):
+    return str(tab) in _tabs_loaded
+
+def load_tab(tab):
+    tab = str(tab)
+    if tab in _tabs_loaded:
+        return
+    _tabs_loaded.add(tab)
+    for load in _tab_loaders.get(tab, ()):
+        load()
+
+def when_loaded(tab, func, *args):
+    if tab_loaded(tab):
+        func(*args)
+
+def on_tab_changed(event):
+    load_tab(notebook.select())
+
+def warm_up(pending=None):
+    if pending is None:
+        # Önce görünen sekme, sonra diğerleri sekme sırasıyla
+        pending = [notebook.select()] + [t for t in notebook.tabs() if t != notebook.select()]
+    deadline = time.perf_counter() + WARMUP_BUDGET
+    while pending and time.perf_counter() < deadline:
+        load_tab(pending.pop(0))
+    if pending:
+        root.after_idle(warm_up, pending)
+
+# === ARKA PLAN DIŞA AKTARMA ===
+# Uzun dışa aktarmalar ayrı bir iş parçacığında çalışır. work(progress,
+# cancelled) Tk'ye dokunmaz, yalnızca paylaşılan durumu günceller; ilerleme
+# penceresi bu durumu root.after ile okur.
+def export_in_background(title, total, work, done_message, action="Dışa aktarma"):
+    # done_message bir fonksiyonsa iş bitince arayüz iş parçacığında sonuçla
+    # çağrılır ve göstereceği mesajı döndürür
+    state = {"done": 0, "cancel": False, "finished": False, "result": None, "error": None}
+
+    win = tk.Toplevel(root)
+    win.title(title)
+    win.transient(root)
+    win.resizable(False, False)
+    progress_label = tk.Label(win, text="Hazırlanıyor...")
+    progress_label.pack(padx=20, pady=(15, 5))
+    bar = ttk.Progressbar(win, length=320, maximum=max(total, 1))
+    bar.pack(padx=20, pady=5)
+    cancel_button = tk.Button(win, text="İptal", command=lambda: state.update(cancel=True))
+    cancel_button.pack(pady=(5, 15))
+    win.protocol("WM_DELETE_WINDOW", lambda: state.update(cancel=True))
+
+    def run():
+        try:
+            state["result"] = work(lambda n: state.update(done=n), lambda: state["cancel"])
+        except Exception as e:
+            state["error"] = e
+        state["finished"] = True
+
+    def poll():
+        if not state["finished"]:
+            bar["value"] = state["done"]
+            if state["cancel"]:
+                progress_label.config(text="İptal ediliyor...")
+                cancel_button.config(state="disabled")
+            else:
+                progress_label.config(text=f"{state['done']} / {total} satır")
+            root.after(100, poll)
+            return
+        win.destroy()
+        if state["error"] is not None:
+            messagebox.showerror("Hata", f"{action} başarısız:\n{state['error']}")
+        elif state["result"]:
+            message = done_message(state["result"]) if callable(done_message) else done_message
+            messagebox.showinfo("Başarılı", message)
+        else:
+            messagebox.showinfo("İptal", f"{action} iptal edildi.")
+
+    threading.Thread(target=run, daemon=True).start()
+    poll()
+
+# === YENİ İŞ GİRİŞİ ===
+name_var = tk.StringVar()
+surname_var = tk.StringVar()
+clinic_var = tk.StringVar()
+job_status_var = tk.StringVar(value="Hazırlanıyor")
+doctor_var = tk.StringVar()
+prosthesis_var = tk.StringVar()
+member_count_var = tk.StringVar(value="1")
+note_var = tk.StringVar()
+date_var = tk.StringVar(value=datetime.today().strftime("%d/%m/%Y"))
+total_price_var = tk.StringVar(value="0.00")
+
+def update_price():
+    total = job_total(prosthesis_var.get(), clinic_var.get(), member_count_var.get())
+    total_price_var.set(total or "0.00")
+
+
+def update_doctor_list(event=None):
+    selected_clinic = clinic_var.get()
+    relevant_doctors = [d["name"] for d in doctors if d["clinic"] == selected_clinic]
+    doctor_combo['values'] = relevant_doctors
+    if relevant_doctors:
+        doctor_combo.current(0)
+
+def save_job():
+    global editing_job_id
+    job = {
+        "patient_name": name_var.get(),
+        "patient_surname": surname_var.get(),
+        "clinic": clinic_var.get(),
+        "doctor": doctor_var.get(),
+        "prosthesis": prosthesis_var.get(),
+        "count": member_count_var.get(),
+        "note": note_var.get(),
+        "date": date_var.get(),
+        "total_price": total_price_var.get(),
+        "status": job_status_var.get()
+    }
+    ...
+
+
+    
+    if editing_job_id is not None:
+        old = update_record("jobs", editing_job_id, job)
+        key = editing_job_id
+        editing_job_id = None
+    else:
+        old = None
+        key = insert_record("jobs", job)
+    jobs_view_changed(old, jobs[key])
+    clear_fields()
+
+def clear_fields():
+    name_var.set("")
+    surname_var.set("")
+    clinic_var.set("")
+    doctor_var.set("")
+    prosthesis_var.set("")
+    member_count_var.set("1")
+    note_var.set("")
+    date_var.set(datetime.today().strftime("%d/%m/%Y"))
+    total_price_var.set("0.00")
+    job_status_var.set("Hazırlanıyor")
+
+
+tk.Label(new_job_tab, text="Ad").grid(row=0, column=0, sticky="w", padx=10, pady=5)
+tk.Entry(new_job_tab, textvariable=name_var).grid(row=0, column=1)
+
+tk.Label(new_job_tab, text="Soyad").grid(row=1, column=0, sticky="w", padx=10)
+tk.Entry(new_job_tab, textvariable=surname_var).grid(row=1, column=1)
+
+tk.Label(new_job_tab, text="Klinik").grid(row=2, column=0, sticky="w", padx=10)
+clinic_combo = ttk.Combobox(new_job_tab, textvariable=clinic_var, values=[c["name"] for c in clinics])
+clinic_combo.grid(row=2, column=1)
+clinic_combo.bind("<<ComboboxSelected>>", update_doctor_list)
+
+tk.Label(new_job_tab, text="Doktor").grid(row=3, column=0, sticky="w", padx=10)
+doctor_combo = ttk.Combobox(new_job_tab, textvariable=doctor_var)
+doctor_combo.grid(row=3, column=1)
+
+tk.Label(new_job_tab, text="Protez Tipi").grid(row=4, column=0, sticky="w", padx=10)
+prosthesis_combo = ttk.Combobox(new_job_tab, textvariable=prosthesis_var, values=price_types())
+prosthesis_combo.grid(row=4, column=1)
+prosthesis_combo.bind("<<ComboboxSelected>>", lambda e: update_price())
+
+tk.Label(new_job_tab, text="Üye Sayısı").grid(row=5, column=0, sticky="w", padx=10)
+tk.Entry(new_job_tab, textvariable=member_count_var).grid(row=5, column=1)
+
+tk.Label(new_job_tab, text="Not").grid(row=6, column=0, sticky="w", padx=10)
+tk.Entry(new_job_tab, textvariable=note_var).grid(row=6, column=1)
+
+tk.Label(new_job_tab, text="Tarih").grid(row=7, column=0, sticky="w", padx=10)
+tk.Entry(new_job_tab, textvariable=date_var).grid(row=7, column=1)
+tk.Label(new_job_tab, text="İş Durumu").grid(row=8, column=0, sticky="w", padx=10)
+status_options = list(JOB_STATUSES)
+tk.OptionMenu(new_job_tab, job_status_var, *status_options).grid(row=8, column=1)
+
+
+tk.Label(new_job_tab, text="Toplam Fiyat (₺)").grid(row=9, column=0, sticky="w", padx=10)
+tk.Entry(new_job_tab, textvariable=total_price_var, state="readonly").grid(row=9, column=1)
+
+tk.Button(new_job_tab, text="Kaydet", command=save_job, bg="#007acc", fg="white").grid(row=10, column=1, pady=10)
+
+
+# === FİLTRE VE TÜM İŞLER ===
+filter_clinic = tk.StringVar()
+filter_doctor = tk.StringVar()
+filter_start = tk.StringVar()
+filter_end = tk.StringVar()
+filter_name = tk.StringVar()
+
+def filter_date(var):
+    return parse_filter_date(var.get())
+
+def job_query():
+    return make_job_query(filter_start.get(), filter_end.get(), filter_clinic.get(), filter_doctor.get(), filter_name.get())
+
+def job_values(job):
+    return (
+        job["date"],
+        job["clinic"],
+        job["doctor"],
+        job["patient_name"],
+        job["patient_surname"],
+        job["prosthesis"],
+        job["count"],
+        f"₺{job['total_price']}",
+        job["note"],
+        job.get("status", "Hazırlanıyor")
+    )
+
+# Listede gösterilen sorgu ve toplamı; tek kayıt değişince liste yeniden
+# kurulmaz, yalnızca ilgili satır ve toplamdaki fark uygulanır
+jobs_view_query = (None, None, "", "", "")
+jobs_view_total = 0
+
+def show_jobs_total():
+    total_label.config(text=f"Toplam Ciro: ₺{jobs_view_total:.2f}")
+
+@profiled()
+def refresh_jobs():
+    global jobs_view_query, jobs_view_total
+    live_cancel(tree)
+    jobs_view_query = job_query()
+    keys, jobs_view_total = job_view(jobs_view_query)
+    virtual_fill(tree, view_records(tree, keys))
+    show_jobs_total()
+
+def jobs_query_steps(query):
+    # Canlı süzgeç için refresh_jobs'un parça parça çalışan hali
+    global jobs_view_query, jobs_view_total
+    jobs_view_query = query
+    jobs_view_total = 0
+    virtual_fill(tree, [])
+    show_jobs_total()
+    yield
+    key = cache_key("jobs", query)
+    cached = cache_get(key)
+    if cached is None:
+        keys = yield from filter_job_steps(query)
+    else:
+        # Önbellekteki sonucun toplamı baştan bellidir, yalnızca satırlar parça parça eklenir
+        keys, jobs_view_total = cached
+        show_jobs_total()
+    shown = view_ids(tree, keys)
+    yield
+    for i in range(0, len(shown), LIVE_CHUNK):
+        chunk = shown[i:i + LIVE_CHUNK]
+        virtual_extend(tree, [jobs[k] for k in chunk])
+        if cached is None:
+            jobs_view_total += jobs_sum(chunk)
+            show_jobs_total()
+        yield
+    if cached is None:
+        cache_put(key, (keys, jobs_view_total))
+
+def live_jobs(*args):
+    if not tab_loaded(all_jobs_tab):
+        return
+    try:
+        query = job_query()
+    except ValueError:
+        return  # tarih henüz tamamlanmadı; liste olduğu gibi kalır
+    live_schedule(tree, lambda: jobs_query_steps(query))
+
+def jobs_view_changed(old, new):
+    global jobs_view_total
+    borc_sync(old, new)
+    when_loaded(report_tab, guncelle_raporlar)
+    if not tab_loaded(all_jobs_tab):
+        return
+    if live_running(tree):
+        # Liste hâlâ doluyor; değişiklik sorgu baştan çalıştırılarak yansır
+        live_start(tree)
+        return
+    key = (old if old is not None else new)["id"]
+    if old is not None and job_matches(old, jobs_view_query):
+        jobs_view_total -= job_price(old)
+    if new is not None and job_matches(new, jobs_view_query):
+        jobs_view_total += job_price(new)
+    else:
+        new = None  # süzgeç dışında kalan kayıt listeden çıkar ya da hiç eklenmez
+    virtual_apply(tree, key, new)
+    show_jobs_total()
+
+
+def show_qr_code():
+    selected = tree.selection()
+    if not selected:
+        messagebox.showwarning("Uyarı", "QR kodu göstermek için bir kayıt seçin.")
+        return
+
+    job = jobs[int(selected[0])]
+    # Etiket QR içeriğinin özetiyle önbellekte tutulur, değişmemiş iş yeniden çizilmez
+    final_path = ensure_label(qr_payload(job))
+
+    # Ekranda göster
+    qr_win = tk.Toplevel()
+    qr_win.title("QR ve Bilgiler")
+
+    from PIL import Image, ImageTk
+    with Image.open(final_path) as final_img:
+        img_tk = ImageTk.PhotoImage(final_img)
+    panel = tk.Label(qr_win, image=img_tk)
+    panel.image = img_tk
+    panel.pack(padx=10, pady=10)
+
+    # Yazdır
+    def yazdir():
+        try:
+            os.startfile(final_path, "print")
+        except Exception as e:
+            messagebox.showerror("Hata", f"Yazdırma sırasında hata oluştu:\n{e}")
+
+    tk.Button(qr_win, text="Yazdır", command=yazdir, bg="black", fg="white").pack(pady=10)
+
+def export_qr_labels():
+    selected = tree.selection()
+    if not selected:
+        messagebox.showwarning("Uyarı", "Etiket için bir ya da daha fazla kayıt seçin.")
+        return
+    path = filedialog.asksaveasfilename(
+        defaultextension=".pdf", filetypes=[("PDF Dosyası", "*.pdf"), ("PNG Görseli", "*.png")]
+    )
+    if not path:
+        return
+    payloads = [qr_payload(jobs[int(i)]) for i in selected]
+    export_in_background(
+        "QR Etiketleri", len(payloads),
+        lambda progress, cancelled: write_label_sheet(path, payloads, progress, cancelled),
+        f"Etiket sayfası oluşturuldu:\n{path}"
+    )
+
+def import_jobs():
+    path = filedialog.askopenfilename(
+        filetypes=[("Excel / CSV", "*.xlsx *.csv"), ("Tüm Dosyalar", "*.*")]
+    )
+    if not path:
+        return
+
+    def finish(result):
+        # Kayıt arayüz iş parçacığında, tek yazmayla yapılır
+        header, accepted, rejects = result
+        insert_records("jobs", accepted)
+        when_loaded(all_jobs_tab, refresh_jobs)
+        when_loaded(report_tab, guncelle_raporlar)
+        when_loaded(borc_tab, guncelle_borc_tablosu)
+        message = f"{len(accepted)} iş eklendi."
+        if rejects:
+            report = reject_report_path(path)
+            write_reject_report(report, header, rejects)
+            message += f"\n{len(rejects)} satır eklenmedi, hatalar:\n{report}"
+        return message
+
+    export_in_background(
+        "İçe Aktar", count_rows(path),
+        lambda progress, cancelled: read_import(path, progress, cancelled),
+        finish, action="İçe aktarma"
+    )
+
+def delete_job():
+    selected = tree.selection()
+    if selected:
+        jobs_view_changed(delete_record("jobs", int(selected[0])), None)
+
+def edit_job():
+    global editing_job_id
+    selected = tree.selection()
+    if selected:
+        editing_job_id = int(selected[0])
+        job = jobs[editing_job_id]
+        name_var.set(job["patient_name"])
+        surname_var.set(job["patient_surname"])
+        clinic_var.set(job["clinic"])
+        update_doctor_list()
+        doctor_var.set(job["doctor"])
+        prosthesis_var.set(job["prosthesis"])
+        member_count_var.set(job["count"])
+        note_var.set(job["note"])
+        date_var.set(job["date"])
+        total_price_var.set(job["total_price"])
+        notebook.select(new_job_tab)
+        job_status_var.set(job.get("status", "Hazırlanıyor"))
+
+
+def export_excel():
+    filtered = filter_jobs(job_query())
+    if not filtered:
+        messagebox.showwarning("Uyarı", "Dışa aktarılacak veri yok.")
+        return
+    path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel Dosyası", "*.xlsx")])
+    if path:
+        sheets = [("İşler", JOB_COLUMNS, job_rows(filtered))]
+        export_in_background(
+            "Excel Aktar", len(filtered),
+            lambda progress, cancelled: write_xlsx(path, sheets, progress, cancelled),
+            f"Excel dosyası oluşturuldu:\n{path}"
+        )
+
+def export_pdf():
+    filtered = filter_jobs(job_query())
+    if not filtered:
+        messagebox.showwarning("Uyarı", "Dışa aktarılacak veri yok.")
+        return
+
+    path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF Dosyası", "*.pdf")])
+    if not path:
+        return
+
+    # Türkçe karakterler için UTF-8 uyumlu font gerekir (DejaVuSans)
+    if not os.path.exists(PDF_FONT):
+        messagebox.showerror("Hata", f"PDF için gerekli font bulunamadı:\n{PDF_FONT}")
+        return
+
+    export_in_background(
+        "PDF Aktar", len(filtered),
+        lambda progress, cancelled: write_jobs_pdf(path, filtered, progress, cancelled),
+        f"PDF dosyası oluşturuldu:\n{path}"
+    )
+
+
+filters = tk.Frame(all_jobs_tab)
+filters.pack(pady=5)
+tk.Label(filters, text="Klinik").grid(row=0, column=0)
+tk.Entry(filters, textvariable=filter_clinic, width=15).grid(row=0, column=1)
+tk.Label(filters, text="Doktor").grid(row=0, column=2)
+tk.Entry(filters, textvariable=filter_doctor, width=15).grid(row=0, column=3)
+tk.Label(filters, text="Ad/Soyad").grid(row=0, column=11)
+tk.Entry(filters, textvariable=filter_name, width=15).grid(row=0, column=12)
+
+tk.Label(filters, text="Başlangıç Tarihi").grid(row=0, column=4)
+tk.Entry(filters, textvariable=filter_start, width=12).grid(row=0, column=5)
+tk.Label(filters, text="Bitiş Tarihi").grid(row=0, column=6)
+tk.Entry(filters, textvariable=filter_end, width=12).grid(row=0, column=7)
+tk.Button(filters, text="Filtrele", command=refresh_jobs).grid(row=0, column=8, padx=5)
+tk.Button(filters, text="PDF Aktar", command=export_pdf).grid(row=0, column=9)
+tk.Button(filters, text="Excel Aktar", command=export_excel).grid(row=0, column=10)
+tk.Button(filters, text="İçe Aktar", command=import_jobs).grid(row=0, column=13, padx=5)
+for var in (filter_clinic, filter_doctor, filter_start, filter_end, filter_name):
+    var.trace_add("write", live_jobs)
+
+columns = ("Tarih", "Klinik", "Doktor", "Ad", "Soyad", "Protez", "Üye", "Fiyat", "Not", "Durum")
+tree_frame = tk.Frame(all_jobs_tab)
+tree_frame.pack(fill="both", expand=True, padx=10, pady=5)
+tree = ttk.Treeview(tree_frame, columns=columns, show="headings")
+for col in columns:
+    tree.heading(col, text=col)
+    tree.column(col, width=100)
+tree_scroll = ttk.Scrollbar(tree_frame, orient="vertical")
+tree_scroll.pack(side="right", fill="y")
+tree.pack(side="left", fill="both", expand=True)
+virtual_attach(tree, tree_scroll, job_values)
+
+tree.heading("Durum", text="İş Durumu")
+tree.column("Durum", width=120)
+sortable(tree, dict(zip(columns, (
+    "date", "clinic", "doctor", "patient_name", "patient_surname", "prosthesis", "count", "price", "note", "status"
+))), "jobs")
+
+btns = tk.Frame(all_jobs_tab)
+btns.pack()
+tk.Button(btns, text="Seçiliyi Sil", command=delete_job, fg="red").pack(side="left", padx=10)
+tk.Button(btns, text="Düzenle", command=edit_job).pack(side="left")
+
+total_label = tk.Label(all_jobs_tab, text="Toplam Ciro: ₺0.00", font=("Arial", 12))
+total_label.pack(pady=5)
+
+lazy_tab(all_jobs_tab, refresh_jobs)
+# === KLİNİK & DOKTOR SEKME ===
+
+@profiled(rows=lambda result: len(clinics))
+def refresh_clinic_list():
+    clinic_listbox.delete(0, tk.END)
+    for c in clinics:
+        clinic_listbox.insert(tk.END, c["name"])
+
+@profiled(rows=lambda result: len(doctors))
+def refresh_doctor_list():
+    doctor_listbox.delete(0, tk.END)
+    for d in doctors:
+        doctor_listbox.insert(tk.END, f'{d["name"]} ({d["clinic"]})')
+
+def add_clinic():
+    name = clinic_entry.get().strip()
+    if name:
+        insert_record("clinics", {"name": name})
+        refresh_clinic_list()
+        clinic_entry.delete(0, tk.END)
+        clinic_combo['values'] = [c["name"] for c in clinics]
+        doctor_clinic_combo['values'] = [c["name"] for c in clinics]
+        finance_clinic_combo['values'] = [c["name"] for c in clinics]  # <<< BU SATIR
+        price_clinic_combo['values'] = ["Genel"] + [c["name"] for c in clinics]
+        when_loaded(borc_tab, guncelle_borc_tablosu)
+
+
+        
+
+def delete_clinic():
+    selected = clinic_listbox.curselection()
+    if selected:
+        name = clinic_listbox.get(selected[0])
+        save_collection("clinics", [c for c in clinics if c["name"] != name])
+        refresh_clinic_list()
+        clinic_combo['values'] = [c["name"] for c in clinics]
+        doctor_clinic_combo['values'] = [c["name"] for c in clinics]
+        when_loaded(borc_tab, guncelle_borc_tablosu)
+
+def add_doctor():
+    name = doctor_entry.get().strip()
+    clinic = doctor_clinic_var.get()
+    if name and clinic:
+        insert_record("doctors", {"name": name, "clinic": clinic})
+        refresh_doctor_list()
+        doctor_entry.delete(0, tk.END)
+        doctor_combo['values'] = [d["name"] for d in doctors]
+
+def delete_doctor():
+    selected = doctor_listbox.curselection()
+    if selected:
+        full = doctor_listbox.get(selected)
+        name = full.split(" (")[0]
+        save_collection("doctors", [d for d in doctors if d["name"] != name])
+        refresh_doctor_list()
+        doctor_combo['values'] = [d["name"] for d in doctors]
+
+tk.Label(clinic_tab, text="Klinik Adı:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
+clinic_entry = tk.Entry(clinic_tab)
+clinic_entry.grid(row=0, column=1)
+tk.Button(clinic_tab, text="Ekle", command=add_clinic).grid(row=0, column=2)
+tk.Button(clinic_tab, text="Sil", command=delete_clinic).grid(row=0, column=3)
+
+clinic_listbox = tk.Listbox(clinic_tab, height=6)
+clinic_listbox.grid(row=1, column=0, columnspan=4, sticky="we", padx=10, pady=5)
+
+tk.Label(clinic_tab, text="Doktor Adı:").grid(row=2, column=0, padx=5, pady=5, sticky="w")
+doctor_entry = tk.Entry(clinic_tab)
+doctor_entry.grid(row=2, column=1)
+
+tk.Label(clinic_tab, text="Klinik Seç:").grid(row=2, column=2)
+doctor_clinic_var = tk.StringVar()
+doctor_clinic_combo = ttk.Combobox(clinic_tab, textvariable=doctor_clinic_var, values=[c["name"] for c in clinics])
+doctor_clinic_combo.grid(row=2, column=3)
+
+tk.Button(clinic_tab, text="Ekle", command=add_doctor).grid(row=3, column=1, pady=5)
+tk.Button(clinic_tab, text="Sil", command=delete_doctor).grid(row=3, column=2, pady=5)
+
+doctor_listbox = tk.Listbox(clinic_tab, height=6)
+doctor_listbox.grid(row=4, column=0, columnspan=4, sticky="we", padx=10, pady=5)
+lazy_tab(clinic_tab, refresh_clinic_list, refresh_doctor_list)
+
+# === FİYAT LİSTESİ SEKME ===
+
+@profiled(rows=lambda result: len(prices))
+def refresh_price_list():
+    price_tree.delete(*price_tree.get_children())
+    for p in sort_rows(price_tree, prices):
+        price_tree.insert("", "end", values=(p["type"], f"₺{p['price']}", p["clinic"]))
+
+
+def add_price():
+    tip = price_type_var.get().strip()
+    fiyat = price_value_var.get().strip()
+    klinik = price_clinic_var.get().strip()
+    if tip and fiyat:
+        insert_record("prices", {"type": tip, "price": float(fiyat), "clinic": klinik})
+        refresh_price_list()
+        prosthesis_combo['values'] = price_types()
+
+
+def delete_price():
+    selected = price_tree.selection()
+    if selected:
+        item = price_tree.item(selected[0])["values"]
+        selected_type = item[0]
+        selected_clinic = item[2]
+        for i in reversed(range(len(prices))):
+            if prices[i]["type"] == selected_type and prices[i]["clinic"] == selected_clinic:
+                delete_record("prices", i)
+        refresh_price_list()
+        prosthesis_combo['values'] = price_types()
+
+
+def edit_price():
+    selected = price_tree.selection()
+    if selected:
+        item = price_tree.item(selected[0])["values"]
+        selected_type = item[0]
+        selected_clinic = item[2]
+        for i, p in enumerate(prices):
+            if p["type"] == selected_type and p["clinic"] == selected_clinic:
+                try:
+                    update_record("prices", i, dict(p, price=float(price_value_var.get())))
+                    refresh_price_list()
+                    prosthesis_combo['values'] = price_types()
+                except ServerError as e:
+                    messagebox.showwarning("Sunucu", str(e))
+                except:
+                    messagebox.showerror("Hata", "Fiyat sayısal olmalı.")
+                break
+
+
+tk.Label(price_tab, text="Protez Tipi:").grid(row=0, column=0, padx=10, pady=5)
+price_type_var = tk.StringVar()
+tk.Entry(price_tab, textvariable=price_type_var).grid(row=0, column=1)
+
+tk.Label(price_tab, text="Fiyat (₺):").grid(row=0, column=2)
+price_value_var = tk.StringVar()
+tk.Entry(price_tab, textvariable=price_value_var).grid(row=0, column=3)
+
+tk.Label(price_tab, text="Klinik:").grid(row=0, column=4)
+price_clinic_var = tk.StringVar(value="Genel")
+price_clinic_combo = ttk.Combobox(price_tab, textvariable=price_clinic_var, values=["Genel"] + [c["name"] for c in clinics])
+price_clinic_combo.grid(row=0, column=5)
+
+
+# Ekle / Sil / Düzenle butonlarını yatay yerleştirme
+price_button_frame = tk.Frame(price_tab)
+price_button_frame.grid(row=0, column=6, columnspan=2, padx=5)
+
+tk.Button(price_button_frame, text="Ekle", command=add_price, bg="green", fg="white").pack(side="left", padx=3)
+tk.Button(price_button_frame, text="Sil", command=delete_price, bg="red", fg="white").pack(side="left", padx=3)
+tk.Button(price_button_frame, text="Düzenle", command=edit_price, bg="blue", fg="white").pack(side="left", padx=3)
+
+
+price_tree = ttk.Treeview(price_tab, columns=("Tip", "Fiyat", "Klinik"), show="headings")
+price_tree.heading("Tip", text="Protez Tipi")
+price_tree.heading("Fiyat", text="Fiyat (₺)")
+price_tree.heading("Klinik", text="Klinik")
+sortable(price_tree, {
+    "Tip": lambda p: tr_sort_key(p["type"]),
+    "Fiyat": lambda p: number_sort_key(p["price"]),
+    "Klinik": lambda p: tr_sort_key(p["clinic"])
+}, refresh=lambda: when_loaded(price_tab, refresh_price_list))
+price_tree.column("Tip", width=150)
+price_tree.column("Fiyat", width=100)
+price_tree.column("Klinik", width=150)
+price_tree.grid(row=1, column=0, columnspan=7, padx=10, pady=10, sticky="nsew")
+
+
+lazy_tab(price_tab, refresh_price_list)
+
+tk.Button(btns, text="QR Kod Göster", command=show_qr_code).pack(side="left", padx=10)
+tk.Button(btns, text="QR Etiketleri", command=export_qr_labels).pack(side="left")
+
+
+# === MUHASEBE SEKME ===
+
+editing_finance_id = None
+
+def save_finance():
+    global editing_finance_id
+    record = {
+        "clinic": finance_clinic_var.get(),
+        "type": finance_type_var.get(),
+        "desc": finance_desc_var.get(),
+        "amount": float(finance_amount_var.get()),
+        "date": finance_date_var.get()
+    }
+
+    if editing_finance_id is None:
+        old = None
+        insert_record("finance", record)
+    else:
+        old = update_record("finance", editing_finance_id, record)
+        editing_finance_id = None
+        save_button.config(text="Kaydet", command=save_finance)
+
+    finance_view_changed(old, record)
+    clear_finance_form()
+
+def clear_finance_form():
+    finance_clinic_var.set("")
+    finance_type_var.set("Gelir")
+    finance_desc_var.set("")
+    finance_amount_var.set("")
+    finance_date_var.set(datetime.today().strftime("%d/%m/%Y"))
+
+def finance_query():
+    return make_finance_query(finance_filter_start.get(), finance_filter_end.get(), finance_filter_clinic.get())
+
+def finance_values(r):
+    return (r["date"], r["clinic"], r["type"], r["desc"], f"₺{r['amount']}")
+
+finance_view_query = (None, None, "")
+finance_view_totals = [0, 0]  # gelir, gider
+
+def show_finance_totals():
+    total_income, total_expense = finance_view_totals
+    net = total_income - total_expense
+    finance_total_label.config(text=f"Toplam Gelir: ₺{total_income:.2f} | Gider: ₺{total_expense:.2f} | Kalan: ₺{net:.2f}")
+
+@profiled()
+def refresh_finance():
+    global finance_view_query
+    live_cancel(finance_tree)
+    finance_view_query = finance_query()
+    result, totals = finance_view(finance_view_query)
+    virtual_fill(finance_tree, view_records(finance_tree, [r["id"] for r in result]))
+    finance_view_totals[:] = totals
+    show_finance_totals()
+
+def finance_query_steps(query):
+    global finance_view_query
+    finance_view_query = query
+    finance_view_totals[:] = [0, 0]
+    virtual_fill(finance_tree, [])
+    show_finance_totals()
+    yield
+    key = cache_key("finance", query)
+    cached = cache_get(key)
+    if cached is None and sort_order(finance_tree) is not None:
+        # Sıralı liste parça parça süzülemez, sonuç önce tamamlanır
+        cached = (filtered_finance(query), finance_net(*query))
+        cache_put(key, cached)
+    if cached is not None:
+        rows, totals = cached
+        rows = view_records(finance_tree, [r["id"] for r in rows])
+        finance_view_totals[:] = totals
+        show_finance_totals()
+        for i in range(0, len(rows), LIVE_CHUNK):
+            virtual_extend(finance_tree, rows[i:i + LIVE_CHUNK])
+            yield
+        return
+    start, end = query[:2]
+    if start is None and end is None:
+        keys = list(finance_records)
+    else:
+        keys = date_range_ids("finance", start, end)
+    result = []
+    yield
+    for i in range(0, len(keys), LIVE_CHUNK):
+        chunk = [finance_records[k] for k in keys[i:i + LIVE_CHUNK]]
+        chunk = [r for r in chunk if finance_matches(r, query, check_date=False)]
+        virtual_extend(finance_tree, chunk)
+        result += chunk
+        income, expense = finance_totals(chunk)
+        finance_view_totals[0] += income
+        finance_view_totals[1] += expense
+        show_finance_totals()
+        yield
+    cache_put(key, (result, tuple(finance_view_totals)))
+
+def live_finance(*args):
+    if not tab_loaded(finance_tab):
+        return
+    try:
+        query = finance_query()
+    except ValueError:
+        return
+    live_schedule(finance_tree, lambda: finance_query_steps(query))
+
+def finance_view_changed(old, new):
+    borc_sync(old, new)
+    if not tab_loaded(finance_tab):
+        return
+    if live_running(finance_tree):
+        live_start(finance_tree)
+        return
+    key = (old if old is not None else new)["id"]
+    if old is not None and finance_matches(old, finance_view_query):
+        finance_view_totals[0 if old["type"] == "Gelir" else 1] -= old["amount"]
+    if new is not None and finance_matches(new, finance_view_query):
+        finance_view_totals[0 if new["type"] == "Gelir" else 1] += new["amount"]
+    else:
+        new = None
+    virtual_apply(finance_tree, key, new)
+    show_finance_totals()
+
+
+def delete_finance():
+    selected = finance_tree.selection()
+    if selected:
+        finance_view_changed(delete_record("finance", int(selected[0])), None)
+
+def edit_finance():
+    global editing_finance_id
+    selected = finance_tree.selection()
+    if selected:
+        editing_finance_id = int(selected[0])
+        record = finance_records[editing_finance_id]
+
+        finance_clinic_var.set(record["clinic"])
+        finance_type_var.set(record["type"])
+        finance_desc_var.set(record["desc"])
+        finance_amount_var.set(str(record["amount"]))
+        finance_date_var.set(record["date"])
+        save_button.config(text="Güncelle", command=save_finance)
+
+        
+
+# === GİRİŞ ALANLARI ===
+finance_clinic_var = tk.StringVar()
+finance_type_var = tk.StringVar(value="Gelir")
+finance_desc_var = tk.StringVar()
+finance_amount_var = tk.StringVar()
+finance_date_var = tk.StringVar(value=datetime.today().strftime("%d/%m/%Y"))
+
+tk.Label(finance_tab, text="Klinik:").grid(row=0, column=0)
+finance_clinic_combo = ttk.Combobox(finance_tab, textvariable=finance_clinic_var, values=[c["name"] for c in clinics])
+finance_clinic_combo.grid(row=0, column=1)
+
+tk.Label(finance_tab, text="Tür:").grid(row=0, column=2)
+finance_type_combo = ttk.Combobox(finance_tab, textvariable=finance_type_var, values=["Gelir", "Gider"])
+finance_type_combo.grid(row=0, column=3)
+
+tk.Label(finance_tab, text="Açıklama:").grid(row=1, column=0)
+tk.Entry(finance_tab, textvariable=finance_desc_var).grid(row=1, column=1, columnspan=3, sticky="we", padx=5)
+
+tk.Label(finance_tab, text="Tutar (₺):").grid(row=2, column=0)
+tk.Entry(finance_tab, textvariable=finance_amount_var).grid(row=2, column=1)
+
+tk.Label(finance_tab, text="Tarih:").grid(row=2, column=2)
+tk.Entry(finance_tab, textvariable=finance_date_var).grid(row=2, column=3)
+
+save_button = tk.Button(finance_tab, text="Kaydet", command=save_finance, bg="green", fg="white")
+save_button.grid(row=3, column=3, pady=10)
+
+# === FİLTRE ALANI ===
+finance_filter_clinic = tk.StringVar()
+finance_filter_start = tk.StringVar()
+finance_filter_end = tk.StringVar()
+
+tk.Label(finance_tab, text="Filtre Klinik:").grid(row=4, column=0)
+tk.Entry(finance_tab, textvariable=finance_filter_clinic).grid(row=4, column=1)
+tk.Label(finance_tab, text="Başlangıç Tarihi:").grid(row=4, column=2)
+tk.Entry(finance_tab, textvariable=finance_filter_start).grid(row=4, column=3)
+tk.Label(finance_tab, text="Bitiş Tarihi:").grid(row=5, column=2)
+tk.Entry(finance_tab, textvariable=finance_filter_end).grid(row=5, column=3)
+tk.Button(finance_tab, text="Filtrele", command=refresh_finance).grid(row=5, column=1, pady=5)
+for var in (finance_filter_clinic, finance_filter_start, finance_filter_end):
+    var.trace_add("write", live_finance)
+
+# === KAYIT LİSTESİ ===
+finance_tree = ttk.Treeview(finance_tab, columns=("Tarih", "Klinik", "Tür", "Açıklama", "Tutar"), show="headings")
+for col in ("Tarih", "Klinik", "Tür", "Açıklama", "Tutar"):
+    finance_tree.heading(col, text=col)
+    finance_tree.column(col, width=150)
+finance_tree.grid(row=6, column=0, columnspan=4, padx=(10, 0), pady=10)
+finance_scroll = ttk.Scrollbar(finance_tab, orient="vertical")
+finance_scroll.grid(row=6, column=4, sticky="ns", pady=10)
+virtual_attach(finance_tree, finance_scroll, finance_values)
+sortable(finance_tree, {"Tarih": "date", "Klinik": "clinic", "Tür": "type", "Açıklama": "desc", "Tutar": "amount"}, "finance")
+
+# === BUTONLAR ===
+btn_frame = tk.Frame(finance_tab)
+btn_frame.grid(row=7, column=0, columnspan=4, pady=10)
+
+tk.Button(btn_frame, text="Seçiliyi Sil", command=delete_finance, fg="red").pack(side="left", padx=10)
+tk.Button(btn_frame, text="Düzenle", command=edit_finance).pack(side="left", padx=10)
+
+finance_total_label = tk.Label(finance_tab, text="Toplam Gelir: ₺0.00 | Gider: ₺0.00 | Kalan: ₺0.00", font=("Arial", 11, "bold"))
+finance_total_label.grid(row=8, column=0, columnspan=4, pady=10)
+
+lazy_tab(finance_tab, refresh_finance)
+
+# === BORÇ TAKİBİ SEKME ===
+
+borc_tab = ttk.Frame(notebook)
+notebook.add(borc_tab, text="Borç Takibi")
+
+def borc_values(borc):
+    return (
+        borc["clinic"],
+        f"₺{borc['ciro']:.2f}",
+        f"₺{borc['odeme']:.2f}",
+        f"₺{borc['borc']:.2f}"
+    )
+
+@profiled(rows=lambda result: len(clinics))
+def guncelle_borc_tablosu():
+    borc_tree.delete(*borc_tree.get_children())
+    for borc in sort_rows(borc_tree, hesapla_borclar()):
+        if not borc_tree.exists(borc["clinic"]):
+            borc_tree.insert("", "end", iid=borc["clinic"], values=borc_values(borc))
+
+def borc_sync(*changed):
+    # Değişen iş/muhasebe kayıtlarının klinik satırlarını defterden yeniler
+    for clinic in {r["clinic"] for r in changed if r is not None}:
+        if borc_tree.exists(clinic):
+            borc_tree.item(clinic, values=borc_values(clinic_debt(clinic)))
+
+def borc_kontrol():
+    diffs = ledger_check()
+    guncelle_borc_tablosu()
+    if diffs:
+        messagebox.showwarning("Tutarlılık Kontrolü", "Düzeltilen klinikler:\n" + "\n".join(diffs))
+    else:
+        messagebox.showinfo("Tutarlılık Kontrolü", "Borç tablosu kayıtlarla tutarlı.")
+
+borc_tree = ttk.Treeview(borc_tab, columns=("Klinik", "Ciro", "Ödenen", "Kalan Borç"), show="headings")
+for col in ("Klinik", "Ciro", "Ödenen", "Kalan Borç"):
+    borc_tree.heading(col, text=col)
+    borc_tree.column(col, width=200)
+borc_tree.pack(fill="both", expand=True, padx=10, pady=10)
+sortable(borc_tree, {
+    "Klinik": lambda b: tr_sort_key(b["clinic"]),
+    "Ciro": lambda b: b["ciro"],
+    "Ödenen": lambda b: b["odeme"],
+    "Kalan Borç": lambda b: b["borc"]
+}, refresh=lambda: when_loaded(borc_tab, guncelle_borc_tablosu))
+
+tk.Button(borc_tab, text="Tutarlılık Kontrolü", command=borc_kontrol).pack(pady=10)
+
+lazy_tab(borc_tab, guncelle_borc_tablosu)
+
+report_window = (None, None)
+
+def rapor_uygula():
+    global report_window
+    try:
+        window = (filter_date(report_start), filter_date(report_end))
+    except ValueError:
+        messagebox.showerror("Hata", "Tarihler GG/AA/YYYY biçiminde olmalı.")
+        return
+    report_window = window
+    guncelle_raporlar()
+
+def rapor_ciro():
+    # Sekmede gösterilen tarih aralığının (klinik ciro, aylık ciro) tabloları;
+    # dışa aktarmalar da aynı aralığı yazar. Aralıklı sorgu NumPy kuruluysa
+    # sütun tablosundan, değilse group_total içinden ciro küpünden
+    # (rollup_window) yanıtlanır
+    start, end = report_window
+    if start is None and end is None:
+        return hesapla_klinik_ciro(), hesapla_aylik_ciro()
+    return group_total("jobs", "clinic", start, end), group_total("jobs", "month", start, end)
+
+@profiled()
+def guncelle_raporlar():
+    clinic_tree.delete(*clinic_tree.get_children())
+    month_tree.delete(*month_tree.get_children())
+    yoy_tree.delete(*yoy_tree.get_children())
+
+    start, end = report_window
+    klinik_ciro, aylik_ciro = rapor_ciro()
+
+    for k, t in klinik_ciro.items():
+        clinic_tree.insert("", "end", values=(k, f"₺{t:.2f}"))
+
+    for a, t in sorted(aylik_ciro.items()):
+        month_tree.insert("", "end", values=(a, f"₺{t:.2f}"))
+
+    yil = date.fromordinal(end).year if end is not None else datetime.today().year
+    yoy_tree.heading("Geçen", text=f"{yil - 1} (₺)")
+    yoy_tree.heading("Bu", text=f"{yil} (₺)")
+    for ay, gecen, bu in rollup_yoy(yil):
+        degisim = f"%{(bu - gecen) / gecen * 100:+.1f}" if gecen else "-"
+        yoy_tree.insert("", "end", values=(ay, f"₺{gecen:.2f}", f"₺{bu:.2f}", degisim))
+
+
+# === LABORATUVAR ENVANTERİ SEKME ===
+
+envanter_tab = ttk.Frame(notebook)
+notebook.add(envanter_tab, text="Lab Envanteri")
+
+editing_envanter_id = None
+
+# Değişkenler
+env_ad_var = tk.StringVar()
+env_miktar_var = tk.StringVar()
+env_birim_var = tk.StringVar()
+env_giris_var = tk.StringVar(value=datetime.today().strftime("%d/%m/%Y"))
+env_skt_var = tk.StringVar()
+env_siparis_var = tk.StringVar()
+env_not_var = tk.StringVar()
+
+# Kaydet/Güncelle
+def kaydet_envanter():
+    global editing_envanter_id
+    try:
+        kayit = {
+            "ad": env_ad_var.get(),
+            "miktar": float(env_miktar_var.get()),
+            "birim": env_birim_var.get(),
+            "giris": env_giris_var.get(),
+            "skt": env_skt_var.get(),
+            "siparis": env_siparis_var.get(),
+            "not": env_not_var.get()
+        }
+
+        if editing_envanter_id is None:
+            insert_record("envanter", kayit)
+        else:
+            update_record("envanter", editing_envanter_id, kayit)
+            editing_envanter_id = None
+            kaydet_button.config(text="Ekle", command=kaydet_envanter)
+
+        virtual_apply(envanter_tree, kayit["id"], kayit)
+        temizle_envanter()
+    except ServerError as e:
+        messagebox.showwarning("Sunucu", str(e))
+    except:
+        messagebox.showerror("Hata", "Tüm alanları doğru şekilde doldurunuz.")
+
+def temizle_envanter():
+    global editing_envanter_id
+    env_ad_var.set("")
+    env_miktar_var.set("")
+    env_birim_var.set("")
+    env_giris_var.set(datetime.today().strftime("%d/%m/%Y"))
+    env_skt_var.set("")
+    env_siparis_var.set("")
+    env_not_var.set("")
+    editing_envanter_id = None
+    kaydet_button.config(text="Ekle", command=kaydet_envanter)
+
+# Listeyi yenile
+def envanter_values(k):
+    return (k["ad"], k["miktar"], k["birim"], k["giris"], k["skt"], k["siparis"], k["not"])
+
+@profiled()
+def guncelle_envanter():
+    virtual_fill(envanter_tree, view_records(envanter_tree, None))
+
+# Sil
+def sil_envanter():
+    selected = envanter_tree.selection()
+    if selected:
+        key = int(selected[0])
+        delete_record("envanter", key)
+        virtual_apply(envanter_tree, key, None)
+        temizle_envanter()
+
+# Düzenle
+def duzenle_envanter():
+    global editing_envanter_id
+    selected = envanter_tree.selection()
+    if selected:
+        editing_envanter_id = int(selected[0])
+        kayit = envanter_kayitlari[editing_envanter_id]
+
+        env_ad_var.set(kayit["ad"])
+        env_miktar_var.set(str(kayit["miktar"]))
+        env_birim_var.set(kayit["birim"])
+        env_giris_var.set(kayit["giris"])
+        env_skt_var.set(kayit["skt"])
+        env_siparis_var.set(kayit["siparis"])
+        env_not_var.set(kayit["not"])
+
+        kaydet_button.config(text="Güncelle", command=kaydet_envanter)
+
+# GİRİŞ ALANI
+tk.Label(envanter_tab, text="Ad").grid(row=0, column=0)
+tk.Entry(envanter_tab, textvariable=env_ad_var).grid(row=0, column=1)
+
+tk.Label(envanter_tab, text="Miktar").grid(row=0, column=2)
+tk.Entry(envanter_tab, textvariable=env_miktar_var).grid(row=0, column=3)
+
+tk.Label(envanter_tab, text="Birim").grid(row=1, column=0)
+tk.Entry(envanter_tab, textvariable=env_birim_var).grid(row=1, column=1)
+
+tk.Label(envanter_tab, text="Giriş Tarihi").grid(row=1, column=2)
+tk.Entry(envanter_tab, textvariable=env_giris_var).grid(row=1, column=3)
+
+tk.Label(envanter_tab, text="SKT").grid(row=2, column=0)
+tk.Entry(envanter_tab, textvariable=env_skt_var).grid(row=2, column=1)
+
+tk.Label(envanter_tab, text="Sipariş Tarihi").grid(row=2, column=2)
+tk.Entry(envanter_tab, textvariable=env_siparis_var).grid(row=2, column=3)
+
+tk.Label(envanter_tab, text="Not").grid(row=3, column=0)
+tk.Entry(envanter_tab, textvariable=env_not_var, width=40).grid(row=3, column=1, columnspan=3)
+
+# BUTONLAR
+kaydet_button = tk.Button(envanter_tab, text="Ekle", command=kaydet_envanter, bg="green", fg="white")
+kaydet_button.grid(row=4, column=1, pady=5)
+
+tk.Button(envanter_tab, text="Düzenle", command=duzenle_envanter).grid(row=4, column=2)
+tk.Button(envanter_tab, text="Seçiliyi Sil", command=sil_envanter, fg="red").grid(row=4, column=3)
+
+# LİSTE
+envanter_tree = ttk.Treeview(envanter_tab, columns=("Ad", "Miktar", "Birim", "Giriş", "SKT", "Sipariş", "Not"), show="headings")
+for col in ("Ad", "Miktar", "Birim", "Giriş", "SKT", "Sipariş", "Not"):
+    envanter_tree.heading(col, text=col)
+    envanter_tree.column(col, width=130)
+envanter_tree.grid(row=5, column=0, columnspan=4, padx=(10, 0), pady=10)
+envanter_scroll = ttk.Scrollbar(envanter_tab, orient="vertical")
+envanter_scroll.grid(row=5, column=4, sticky="ns", pady=10)
+virtual_attach(envanter_tree, envanter_scroll, envanter_values)
+sortable(envanter_tree, {
+    "Ad": "ad", "Miktar": "miktar", "Birim": "birim", "Giriş": "giris", "SKT": "skt", "Sipariş": "siparis", "Not": "not"
+}, "envanter")
+
+lazy_tab(envanter_tab, guncelle_envanter)
+
+
+report_start = tk.StringVar()
+report_end = tk.StringVar()
+report_filters = tk.Frame(report_tab)
+report_filters.pack(pady=5)
+tk.Label(report_filters, text="Başlangıç Tarihi").pack(side="left")
+tk.Entry(report_filters, textvariable=report_start, width=12).pack(side="left", padx=5)
+tk.Label(report_filters, text="Bitiş Tarihi").pack(side="left")
+tk.Entry(report_filters, textvariable=report_end, width=12).pack(side="left", padx=5)
+tk.Button(report_filters, text="Uygula", command=rapor_uygula).pack(side="left", padx=5)
+
+tk.Label(report_tab, text="Klinik Bazlı Ciro", font=("Arial", 12, "bold")).pack(pady=5)
+clinic_tree = ttk.Treeview(report_tab, columns=("Klinik", "Ciro"), show="headings", height=6)
+clinic_tree.heading("Klinik", text="Klinik")
+clinic_tree.heading("Ciro", text="Toplam Ciro (₺)")
+clinic_tree.column("Klinik", width=200)
+clinic_tree.column("Ciro", width=150)
+clinic_tree.pack(pady=5)
+
+tk.Label(report_tab, text="Aylık Gelir", font=("Arial", 12, "bold")).pack(pady=5)
+month_tree = ttk.Treeview(report_tab, columns=("Ay", "Toplam"), show="headings", height=6)
+month_tree.heading("Ay", text="Ay")
+month_tree.heading("Toplam", text="Toplam Gelir (₺)")
+month_tree.column("Ay", width=200)
+month_tree.column("Toplam", width=150)
+month_tree.pack(pady=5)
+
+tk.Label(report_tab, text="Geçen Yıla Göre", font=("Arial", 12, "bold")).pack(pady=5)
+yoy_tree = ttk.Treeview(report_tab, columns=("Ay", "Geçen", "Bu", "Değişim"), show="headings", height=6)
+yoy_tree.heading("Ay", text="Ay")
+yoy_tree.heading("Değişim", text="Değişim")
+for col in ("Ay", "Geçen", "Bu", "Değişim"):
+    yoy_tree.column(col, width=120)
+yoy_tree.pack(pady=5)
+def export_report_pdf():
+    path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF Dosyası", "*.pdf")])
+    if not path:
+        return
+
+    if not os.path.exists(PDF_FONT):
+        messagebox.showerror("Hata", f"PDF için gerekli font bulunamadı:\n{PDF_FONT}")
+        return
+
+    klinik_ciro, aylik_ciro = rapor_ciro()
+    export_in_background(
+        "PDF Aktar", len(klinik_ciro) + len(aylik_ciro),
+        lambda progress, cancelled: write_report_pdf(path, klinik_ciro, aylik_ciro, progress, cancelled),
+        f"PDF raporu kaydedildi:\n{path}"
+    )
+
+
+def export_report_excel():
+    path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel Dosyası", "*.xlsx")])
+    if not path:
+        return
+
+    klinik_ciro, aylik_ciro = rapor_ciro()
+    sheets = report_sheets(klinik_ciro, aylik_ciro)
+    export_in_background(
+        "Excel Aktar", len(klinik_ciro) + len(aylik_ciro),
+        lambda progress, cancelled: write_xlsx(path, sheets, progress, cancelled),
+        f"Excel raporu kaydedildi:\n{path}"
+    )
+
+btn_frame = tk.Frame(report_tab)
+btn_frame.pack(pady=10)
+
+tk.Button(btn_frame, text="PDF Aktar", command=export_report_pdf, bg="black", fg="white").pack(side="left", padx=10)
+tk.Button(btn_frame, text="Excel Aktar", command=export_report_excel, bg="green", fg="white").pack(side="left", padx=10)
+
+
+lazy_tab(report_tab, guncelle_raporlar)
+
+
+# === TANILAMA ===
+# Süre ölçümü açıkken (ayarlarda "profile": true ya da bu pencereden)
+# yenileme, süzgeç, kayıt ve dışa aktarma fonksiyonlarının süreleri burada
+# listelenir ve dakikada bir data/profile.jsonl günlüğüne eklenir. Açık
+# sekmelerin yenilenmesi cProfile altında bir kez çalıştırılıp sonucu
+# gösterilebilir (.prof dosyası data/ içine yazılır).
+PROFILE_FLUSH_MS = 60000
+PROFILE_COLUMNS = (
+    ("name", "İşlem", 180), ("calls", "Çağrı", 60), ("total_ms", "Toplam ms", 90),
+    ("p50_ms", "p50 ms", 70), ("p90_ms", "p90 ms", 70), ("p99_ms", "p99 ms", 70),
+    ("max_ms", "En uzun ms", 80), ("rows", "Satır", 80)
+)
+diagnostics_window = None
+
+def yenileme_dongusu():
+    # Açılmış sekmelerin listelerini yeniden kurar
+    for tab, refresh in (
+        (all_jobs_tab, refresh_jobs), (finance_tab, refresh_finance), (borc_tab, guncelle_borc_tablosu),
+        (report_tab, guncelle_raporlar), (envanter_tab, guncelle_envanter)
+    ):
+        when_loaded(tab, refresh)
+
+def tanilama_penceresi(event=None):
+    global diagnostics_window
+    if diagnostics_window is not None and diagnostics_window.winfo_exists():
+        diagnostics_window.lift()
+        return
+    win = diagnostics_window = tk.Toplevel(root)
+    win.title("Tanılama")
+    enabled_var = tk.BooleanVar(value=profiling_enabled())
+
+    def fill():
+        stats_tree.delete(*stats_tree.get_children())
+        for s in profile_stats():
+            stats_tree.insert("", "end", values=[s[key] for key, _, _ in PROFILE_COLUMNS])
+        c = cache_stats()
+        cache_label.config(text=f"Sorgu önbelleği: {c['hits']} isabet, {c['misses']} ıska "
+                                f"(%{c['hit_rate']}), {c['entries']}/{c['size']} sonuç, {c['evictions']} atılan")
+
+    def reset():
+        profile_reset()
+        cache_reset_stats()
+        fill()
+
+    def capture():
+        path, text = profile_call(yenileme_dongusu)
+        output.delete("1.0", tk.END)
+        output.insert(tk.END, f"{path}\n\n{text}")
+        fill()
+
+    def tick():
+        if win.winfo_exists():
+            fill()
+            win.after(1000, tick)
+
+    top = tk.Frame(win)
+    top.pack(fill="x", padx=10, pady=5)
+    tk.Checkbutton(top, text="Süre ölçümü açık", variable=enabled_var,
+                   command=lambda: set_profiling(enabled_var.get())).pack(side="left")
+    tk.Button(top, text="Sıfırla", command=reset).pack(side="left", padx=5)
+    tk.Button(top, text="Günlüğe Yaz", command=profile_flush).pack(side="left")
+    tk.Button(top, text="Yenilemeyi Profille (cProfile)", command=capture).pack(side="left", padx=5)
+    cache_label = tk.Label(win, anchor="w")
+    cache_label.pack(fill="x", padx=10)
+
+    stats_tree = ttk.Treeview(win, columns=[key for key, _, _ in PROFILE_COLUMNS], show="headings", height=12)
+    for key, title, width in PROFILE_COLUMNS:
+        stats_tree.heading(key, text=title)
+        stats_tree.column(key, width=width, anchor="w" if key == "name" else "e")
+    stats_tree.pack(fill="both", expand=True, padx=10)
+    output = tk.Text(win, height=14, font=("Courier", 9))
+    output.pack(fill="both", expand=True, padx=10, pady=(5, 10))
+    tick()
+
+def profil_gunlugu():
+    if profiling_enabled():
+        profile_flush()
+    root.after(PROFILE_FLUSH_MS, profil_gunlugu)
+
+root.bind("<F12>", tanilama_penceresi)
+root.after(PROFILE_FLUSH_MS, profil_gunlugu)
+
+
+# === KAYIT DURUMU ===
+SAVE_STATE_TEXT = {
+    "unsaved": ("● Kaydedilmemiş değişiklik", "orange"),
+    "saving": ("Kaydediliyor...", "blue"),
+    "saved": ("✓ Kaydedildi", "green"),
+    "error": ("Kayıt hatası!", "red"),
+    "offline": ("Sunucu bağlantısı yok, yeniden bağlanılıyor...", "red")
+}
+
+def guncelle_kayit_durumu():
+    state = save_state()
+    text, color = SAVE_STATE_TEXT[state]
+    if state == "error":
+        text += f" {writer_error()}"
+    save_status_label.config(text=text, fg=color)
+    root.after(250, guncelle_kayit_durumu)
+
+def on_close():
+    flush_writes()
+    if profiling_enabled():
+        profile_flush()
+    root.destroy()
+
+root.protocol("WM_DELETE_WINDOW", on_close)
+guncelle_kayit_durumu()
+
+
+# === SUNUCU ===
+# Sunucu modunda diğer bilgisayarların değişiklikleri SERVER_APPLY_MS'de bir
+# yerel kopyaya uygulanır ve yüklenmiş sekmelere tek tek yansıtılır. Bağlantı
+# koparsa SERVER_RETRY_MS'de bir arka planda yeniden bağlanılır; veri
+# baştan yüklenir ve sekmeler yeniden doldurulur. Çakışan ya da sunucuya
+# ulaşamayan işlemler uyarı olarak gösterilir.
+SERVER_APPLY_MS = 200
+SERVER_RETRY_MS = 5000
+
+_server_retry = [0.0]  # son yeniden bağlanma denemesi (perf_counter)
+
+def listeleri_yenile(name):
+    if name == "clinics":
+        when_loaded(clinic_tab, refresh_clinic_list)
+        clinic_combo['values'] = [c["name"] for c in clinics]
+        doctor_clinic_combo['values'] = [c["name"] for c in clinics]
+        finance_clinic_combo['values'] = [c["name"] for c in clinics]
+        price_clinic_combo['values'] = ["Genel"] + [c["name"] for c in clinics]
+        when_loaded(borc_tab, guncelle_borc_tablosu)
+    elif name == "doctors":
+        when_loaded(clinic_tab, refresh_doctor_list)
+        doctor_combo['values'] = [d["name"] for d in doctors]
+    elif name == "prices":
+        when_loaded(price_tab, refresh_price_list)
+        prosthesis_combo['values'] = price_types()
+
+def uzak_degisiklikler():
+    # Bir değişikliği uygularken çıkan hata bildirilir ama döngüyü durdurmaz
+    try:
+        for name, old, new in apply_remote():
+            if name is None:
+                for name in ("clinics", "doctors", "prices"):
+                    listeleri_yenile(name)
+                _tabs_loaded.clear()
+                warm_up()
+            elif name == "jobs":
+                jobs_view_changed(old, new)
+            elif name == "finance":
+                finance_view_changed(old, new)
+            elif name == "envanter":
+                virtual_apply(envanter_tree, (old if old is not None else new)["id"], new)
+            else:
+                listeleri_yenile(name)
+        if not server_online() and time.perf_counter() - _server_retry[0] > SERVER_RETRY_MS / 1000:
+            _server_retry[0] = time.perf_counter()
+            server_reconnect()
+    finally:
+        root.after(SERVER_APPLY_MS, uzak_degisiklikler)
+
+def sunucu_hatasi(exc, value, tb):
+    if isinstance(value, ServerError):
+        messagebox.showwarning("Sunucu", str(value))
+    else:
+        tk.Tk.report_callback_exception(root, exc, value, tb)
+
+if remote_mode():
+    root.title(root.title() + " (sunucu)")
+    root.report_callback_exception = sunucu_hatasi
+    root.after(SERVER_APPLY_MS, uzak_degisiklikler)
+
+notebook.bind("<<NotebookTabChanged>>", on_tab_changed)
+root.after_idle(warm_up)
+
+
+# === UYGULAMA BAŞLAT ===
+root.mainloop()
@@ -0,0 +1,226 @@
+import os
+import sys
+import csv
+from datetime import datetime
+
+from dplab.storage import DATA, load_all, insert_records, flush_writes
+from dplab.core import JOB_STATUSES, tr_fold, price_jobs
+
+
+# === TOPLU İŞ İÇE AKTARMA ===
+# Kliniklerden gelen CSV ya da Excel (xlsx) listeleri satır satır okunur,
+# IMPORT_BATCH satırlık gruplar halinde doğrulanır ve fiyat tablosuyla
+# fiyatlanır. Klinik, doktor ve durum adları büyük/küçük harf farkı
+# gözetmeden mevcut kayıtlarla eşleştirilir. Geçen satırlar tek yazmayla
+# eklenir (insert_records); geçmeyenler satır numarası ve nedeniyle
+# ayrı bir CSV raporuna yazılır. Başlıklar Excel dışa aktarmasındakiyle
+# aynıdır (Tarih, Klinik, Doktor, Ad, Soyad, Protez, Üye, Fiyat, Not,
+# Durum); JSON alan adları da kabul edilir.
+#
+#     python -m dplab.importer isler.xlsx
+#     python -m dplab.importer isler.csv --kontrol --rapor hatalar.csv
+IMPORT_BATCH = 500
+
+IMPORT_HEADERS = {
+    "tarih": "date", "klinik": "clinic", "doktor": "doctor", "ad": "patient_name",
+    "soyad": "patient_surname", "protez": "prosthesis", "üye": "count",
+    "fiyat": "total_price", "not": "note", "durum": "status"
+}
+IMPORT_TITLES = {field: title.capitalize() for title, field in IMPORT_HEADERS.items()}
+IMPORT_REQUIRED = ("date", "clinic", "patient_name", "prosthesis")
+JOB_KEYS = ("patient_name", "patient_surname", "clinic", "doctor", "prosthesis",
+            "count", "note", "date", "total_price", "status")
+
+def is_xlsx(path):
+    return path.lower().endswith((".xlsx", ".xlsm"))
+
+def cell_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%d/%m/%Y")
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+def csv_rows(path):
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        first = f.readline()
+        f.seek(0)
+        # Türkçe Excel CSV'yi noktalı virgülle kaydeder
+        delimiter = ";" if first.count(";") > first.count(",") else ","
+        for row in csv.reader(f, delimiter=delimiter):
+            yield [cell.strip() for cell in row]
+
+def xlsx_rows(path):
+    import openpyxl
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for row in wb.active.iter_rows(values_only=True):
+            yield [cell_text(cell) for cell in row]
+    finally:
+        wb.close()
+
+def read_rows(path):
+    return xlsx_rows(path) if is_xlsx(path) else csv_rows(path)
+
+def count_rows(path):
+    # İlerleme çubuğu için tahmini veri satırı sayısı
+    if is_xlsx(path):
+        import openpyxl
+        wb = openpyxl.load_workbook(path, read_only=True)
+        try:
+            return max((wb.active.max_row or 1) - 1, 0)
+        finally:
+            wb.close()
+    with open(path, "rb") as f:
+        return max(sum(1 for _ in f) - 1, 0)
+
+def map_header(header):
+    fields = []
+    for title in header:
+        key = tr_fold(title.strip())
+        fields.append(IMPORT_HEADERS.get(key, key if key in JOB_KEYS else None))
+    missing = [f for f in IMPORT_REQUIRED if f not in fields]
+    if missing:
+        raise ValueError("Eksik sütun: " + ", ".join(IMPORT_TITLES[f] for f in missing))
+    return fields
+
+def import_lookups():
+    clinics = {tr_fold(c["name"].strip()): c["name"] for c in DATA["clinics"]}
+    doctors = {(d["clinic"], tr_fold(d["name"].strip())): d["name"] for d in DATA["doctors"]}
+    statuses = {tr_fold(s): s for s in JOB_STATUSES}
+    return clinics, doctors, statuses
+
+def check_row(values, lookups):
+    # İş sözlüğünü (fiyatsız) ya da hata metnini döndürür
+    clinics, doctors, statuses = lookups
+    for field in IMPORT_REQUIRED:
+        if not values.get(field):
+            return None, f"Boş alan: {IMPORT_TITLES[field]}"
+    try:
+        date = datetime.strptime(values["date"], "%d/%m/%Y").strftime("%d/%m/%Y")
+    except ValueError:
+        return None, f"Geçersiz tarih: {values['date']}"
+    count = values.get("count") or "1"
+    if not count.isdigit() or int(count) < 1:
+        return None, f"Geçersiz üye sayısı: {count}"
+    clinic = clinics.get(tr_fold(values["clinic"]))
+    if clinic is None:
+        return None, f"Bilinmeyen klinik: {values['clinic']}"
+    doctor = values.get("doctor", "")
+    if doctor:
+        doctor = doctors.get((clinic, tr_fold(doctor)))
+        if doctor is None:
+            return None, f"Klinikte bulunmayan doktor: {values['doctor']}"
+    status = values.get("status") or JOB_STATUSES[0]
+    status = statuses.get(tr_fold(status))
+    if status is None:
+        return None, f"Bilinmeyen durum: {values['status']}"
+    return {
+        "patient_name": values["patient_name"],
+        "patient_surname": values.get("patient_surname", ""),
+        "clinic": clinic,
+        "doctor": doctor,
+        "prosthesis": values["prosthesis"],
+        "count": str(int(count)),
+        "note": values.get("note", ""),
+        "date": date,
+        "total_price": None,
+        "status": status
+    }, None
+
+def check_batch(batch, lookups, accepted, rejects):
+    # batch: [(satır no, {alan: metin}, ham satır), ...]
+    jobs = []
+    for line, values, row in batch:
+        job, error = check_row(values, lookups)
+        if error:
+            rejects.append((line, error, row))
+        else:
+            jobs.append((line, values, row, job))
+    # Fiyat tablosunda bulunamayan işlerde dosyadaki fiyat kullanılır
+    for (line, values, row, job), total in zip(jobs, price_jobs([j for _, _, _, j in jobs])):
+        if total is None:
+            try:
+                total = f"{float(values.get('total_price', '').replace(',', '.')):.2f}"
+            except ValueError:
+                rejects.append((line, f"Fiyat bulunamadı: {job['prosthesis']} / {job['clinic']}", row))
+                continue
+        job["total_price"] = total
+        accepted.append(job)
+
+def read_import(path, progress=None, cancelled=None):
+    # Dosyayı okuyup doğrular, kaydetmez. (başlık, eklenecek işler,
+    # [(satır no, hata, ham satır), ...]) döndürür; iptal edildiyse None.
+    rows = read_rows(path)
+    try:
+        header = next(rows, None)
+        if header is None:
+            raise ValueError("Dosya boş.")
+        fields = map_header(header)
+        lookups = import_lookups()
+        accepted, rejects, batch = [], [], []
+        done = 0
+        for line, row in enumerate(rows, 2):
+            if not any(row):
+                continue
+            values = {f: v for f, v in zip(fields, row) if f is not None}
+            batch.append((line, values, row))
+            if len(batch) == IMPORT_BATCH:
+                check_batch(batch, lookups, accepted, rejects)
+                done += len(batch)
+                batch = []
+                if cancelled is not None and cancelled():
+                    return None
+                if progress is not None:
+                    progress(done)
+        check_batch(batch, lookups, accepted, rejects)
+        if progress is not None:
+            progress(done + len(batch))
+        return header, accepted, rejects
+    finally:
+        rows.close()
+
+def reject_report_path(path):
+    return os.path.splitext(path)[0] + "_hatalar.csv"
+
+def write_reject_report(path, header, rejects):
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["Satır", "Hata"] + list(header))
+        for line, error, row in rejects:
+            writer.writerow([line, error] + list(row))
+
+def main(argv):
+    check_only = "--kontrol" in argv
+    argv = [a for a in argv if a != "--kontrol"]
+    report = None
+    if "--rapor" in argv:
+        i = argv.index("--rapor")
+        report = argv[i + 1]
+        argv = argv[:i] + argv[i + 2:]
+    if len(argv) != 1:
+        print("Kullanım: python -m dplab.importer dosya.(csv|xlsx) [--kontrol] [--rapor hatalar.csv]")
+        return 2
+    path = argv[0]
+    load_all()
+    try:
+        header, accepted, rejects = read_import(path)
+    except (OSError, ValueError) as e:
+        print(f"İçe aktarma başarısız: {e}")
+        return 1
+    if check_only:
+        print(f"{len(accepted)} iş eklenebilir, {len(rejects)} satır hatalı.")
+    else:
+        insert_records("jobs", accepted)
+        flush_writes()
+        print(f"{len(accepted)} iş eklendi, {len(rejects)} satır eklenmedi.")
+    if rejects:
+        report = report or reject_report_path(path)
+        write_reject_report(report, header, rejects)
+        print(f"Hata raporu: {report}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,88 @@
+import os
+import re
+import ast
+import sys
+import json
+import subprocess
+import importlib.util
+
+# Açılışta içe aktarma sürelerini ölçer. Her hedef ayrı bir Python sürecinde
+# "-X importtime" ile yüklenir, üst düzey içe aktarmaların toplam
+# (cumulative) süresi mikrosaniye olarak okunur. Yüklenince pencere açan
+# modüller (HEADER_ONLY) ve --betik ile verilen dosyalar çalıştırılmaz;
+# yalnızca dosyadaki üst düzey import satırları ölçülür. Bölmeden önceki tek
+# dosyalık sürümle karşılaştırmak için:
+#
+#     python -m dplab.importtime
+#     python -m dplab.importtime --json sonuc.json
+#     git show <bölmeden önceki sürüm>:dp_lab.py > eski_dp_lab.py
+#     python -m dplab.importtime --betik eski_dp_lab.py
+#
+# Kurulu olmayan kütüphaneler "yok" olarak raporlanır.
+MODULES = ("dplab.storage", "dplab.core", "dplab.gui", "tkinter", "fpdf", "openpyxl", "qrcode", "PIL.Image")
+HEADER_ONLY = ("dplab.gui",)
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\S+)")
+_MARK = "-- dplab.importtime --"
+
+def header_imports(path):
+    # Dosyanın üst düzey import satırları; dosyanın geri kalanı çalıştırılmaz
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return "\n".join(ast.unparse(n) for n in tree.body if isinstance(n, (ast.Import, ast.ImportFrom)))
+
+def target_code(target):
+    if target.endswith(".py"):
+        return header_imports(target)
+    if target in HEADER_ONLY:
+        return header_imports(importlib.util.find_spec(target).origin)
+    return f"import {target}"
+
+def measure(code, repeat=3):
+    # En iyi sonuç alınır; ilk ölçümdeki disk önbelleği etkisi elenir.
+    # Yorumlayıcının kendi açılış içe aktarmaları işaretten önce kalır.
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    code = f"import sys\nsys.stderr.write({_MARK!r} + '\\n')\n{code}"
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, env=env
+        )
+        if proc.returncode != 0:
+            return None
+        total = sum(int(m.group(2)) for m in _LINE.finditer(proc.stderr.partition(_MARK)[2]))
+        best = total if best is None else min(best, total)
+    return best
+
+def main(argv):
+    targets = list(MODULES)
+    out = None
+    args = iter(argv)
+    for arg in args:
+        if arg == "--json":
+            out = next(args, None)
+        elif arg == "--betik":
+            targets.append(next(args, ""))
+        else:
+            print("Kullanım: python -m dplab.importtime [--json dosya.json] [--betik dosya.py]")
+            return 2
+    results = {}
+    for target in targets:
+        try:
+            code = target_code(target)
+        except (OSError, SyntaxError, AttributeError, ImportError) as e:
+            print(f"{target}: {e}")
+            return 1
+        results[target] = measure(code)
+    for target, us in results.items():
+        sure = "yok" if us is None else f"{us / 1000:8.1f} ms"
+        print(f"{target:<16} {sure}")
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+import time
+import tempfile
+
+from dplab.exporters import render_jobs_pdf, save_pdf, PDF_FONT
+
+# PDF motorunun hızını ölçer: yapay iş listesi tabloya dizilir ve dosyaya
+# yazılır, saniyede üretilen sayfa sayısı raporlanır. İlk tur fontu
+# ayrıştırır, sonraki turlar önbellekteki kopyayı kullanır.
+#
+#     python -m dplab.pdfbench            (5000 satır, 3 tur)
+#     python -m dplab.pdfbench 20000 5 --json sonuc.json
+def sample_jobs(count):
+    statuses = ["Hazırlanıyor", "Beklemede", "Yapımda", "Tamamlandı", "Teslim Edildi"]
+    return [
+        {
+            "id": i,
+            "date": f"{i % 28 + 1:02d}/{i % 12 + 1:02d}/2025",
+            "clinic": f"Klinik {i % 40}",
+            "doctor": f"Dr. Doktor {i % 120}",
+            "patient_name": f"Hasta{i}",
+            "patient_surname": "Şahinoğlu",
+            "prosthesis": ("Zirkonyum", "Metal Destekli Porselen", "E-max")[i % 3],
+            "count": str(i % 6 + 1),
+            "total_price": f"{(i % 6 + 1) * 1250:.2f}",
+            "note": "Renk A2, prova sonrası teslim" if i % 4 else "",
+            "status": statuses[i % 5]
+        }
+        for i in range(count)
+    ]
+
+def pdf_benchmark(rows=5000, rounds=3):
+    jobs = sample_jobs(rows)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.pdf")
+        for _ in range(rounds):
+            start = time.perf_counter()
+            pdf = render_jobs_pdf(jobs)
+            save_pdf(pdf, path)
+            seconds = time.perf_counter() - start
+            results.append({
+                "rows": rows,
+                "pages": pdf.page,
+                "seconds": round(seconds, 3),
+                "pages_per_sec": round(pdf.page / seconds, 1)
+            })
+    return results
+
+def main(argv):
+    if not os.path.exists(PDF_FONT):
+        print(f"Font bulunamadı: {PDF_FONT}")
+        return 1
+    out = None
+    if "--json" in argv:
+        i = argv.index("--json")
+        out = argv[i + 1]
+        argv = argv[:i] + argv[i + 2:]
+    rows = int(argv[0]) if argv else 5000
+    rounds = int(argv[1]) if len(argv) > 1 else 3
+    results = pdf_benchmark(rows, rounds)
+    for i, r in enumerate(results, 1):
+        print(f"tur {i}: {r['rows']} satır, {r['pages']} sayfa, {r['seconds']:.2f} sn, {r['pages_per_sec']:.1f} sayfa/sn")
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
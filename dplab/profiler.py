@@ -0,0 +1,145 @@
+import os
+import io
+import json
+import time
+import pstats
+import cProfile
+import threading
+from collections import deque
+from datetime import datetime
+from functools import wraps
+
+
+# === ÖLÇÜM ===
+# İsteğe bağlı süre ölçümü (ayarlarda "profile": true ya da Tanılama
+# penceresinden). @profiled() ile işaretli fonksiyonların çağrı sayısı,
+# süre dağılımı (p50/p90/p99) ve işlediği satır sayısı tutulur. Satır sayısı
+# liste/sözlük döndüren fonksiyonlarda sonucun uzunluğudur; diğerleri
+# profile_rows ile o an ölçülen çağrıya satır ekler. Ölçüm kapalıyken
+# işaretli fonksiyonlar yalnızca bir bayrak kontrolü kadar yavaşlar.
+# Özetler data/profile.jsonl dosyasına satır satır eklenir, dosya
+# PROFILE_LOG_LIMIT baytı geçince .1, .2 ... adlarıyla döndürülür.
+PROFILE_SAMPLES = 1000  # işlem başına saklanan son süre sayısı
+PROFILE_LOG = os.path.join("data", "profile.jsonl")
+PROFILE_LOG_LIMIT = 1000000
+PROFILE_LOG_KEEP = 3
+
+_enabled = False
+_since = None
+_lock = threading.Lock()
+_stats = {}  # işlem -> [çağrı, toplam süre, toplam satır, son süreler]
+_active = threading.local()  # iş parçacığı başına ölçülen çağrılar: [[işlem, satır], ...]
+
+def set_profiling(enabled):
+    global _enabled, _since
+    _enabled = bool(enabled)
+    if _enabled and _since is None:
+        _since = datetime.now().isoformat(timespec="seconds")
+
+def profiling_enabled():
+    return _enabled
+
+def profiled(name=None, rows=None):
+    # rows(sonuç, *args, **kwargs) verilirse satır sayısını o hesaplar
+    def wrap(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            stack = getattr(_active, "stack", None)
+            if stack is None:
+                stack = _active.stack = []
+            frame = [label, 0]
+            stack.append(frame)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                stack.pop()
+                record(label, elapsed, frame[1])
+            if rows is not None:
+                add_rows(label, rows(result, *args, **kwargs))
+            elif isinstance(result, (list, tuple, dict)):
+                add_rows(label, len(result))
+            return result
+        return timed
+    return wrap
+
+def profile_rows(count):
+    # O an ölçülen en içteki çağrıya satır ekler (ör. Treeview'e eklenenler)
+    stack = getattr(_active, "stack", None)
+    if stack:
+        stack[-1][1] += count
+
+def record(label, elapsed, rows=0):
+    with _lock:
+        entry = _stats.get(label)
+        if entry is None:
+            entry = _stats[label] = [0, 0.0, 0, deque(maxlen=PROFILE_SAMPLES)]
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] += rows
+        entry[3].append(elapsed)
+
+def add_rows(label, rows):
+    with _lock:
+        _stats[label][2] += rows
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+def profile_stats():
+    # Toplam süreye göre sıralı özet; süreler milisaniye
+    with _lock:
+        entries = [(label, calls, total, rows, sorted(times)) for label, (calls, total, rows, times) in _stats.items()]
+    stats = []
+    for label, calls, total, rows, times in entries:
+        stats.append({
+            "name": label,
+            "calls": calls,
+            "total_ms": round(total * 1000, 2),
+            "p50_ms": round(percentile(times, 50) * 1000, 2),
+            "p90_ms": round(percentile(times, 90) * 1000, 2),
+            "p99_ms": round(percentile(times, 99) * 1000, 2),
+            "max_ms": round(times[-1] * 1000, 2),
+            "rows": rows
+        })
+    stats.sort(key=lambda s: s["total_ms"], reverse=True)
+    return stats
+
+def profile_reset():
+    global _since
+    with _lock:
+        _stats.clear()
+    _since = datetime.now().isoformat(timespec="seconds") if _enabled else None
+
+def rotate_log(path):
+    for i in range(PROFILE_LOG_KEEP - 1, 0, -1):
+        if os.path.exists(f"{path}.{i}"):
+            os.replace(f"{path}.{i}", f"{path}.{i + 1}")
+    os.replace(path, f"{path}.1")
+
+def profile_flush(path=PROFILE_LOG):
+    # Başlangıçtan (ya da son sıfırlamadan) bu yana özeti günlüğe ekler
+    stats = profile_stats()
+    if not stats:
+        return
+    if os.path.exists(path) and os.path.getsize(path) > PROFILE_LOG_LIMIT:
+        rotate_log(path)
+    line = {"time": datetime.now().isoformat(timespec="seconds"), "since": _since, "stats": stats}
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+def profile_call(func, out_dir="data", limit=30):
+    # func'ı cProfile altında bir kez çalıştırır; .prof dosyasının yolunu ve
+    # birikimli süreye göre ilk `limit` satırlık özeti döndürür
+    prof = cProfile.Profile()
+    prof.runcall(func)
+    path = os.path.join(out_dir, f"profile-{datetime.now():%Y%m%d-%H%M%S}.prof")
+    prof.dump_stats(path)
+    text = io.StringIO()
+    pstats.Stats(prof, stream=text).sort_stats("cumulative").print_stats(limit)
+    return path, text.getvalue()
@@ -0,0 +1,180 @@
+import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from dplab.exporters import PDF_FONT
+from dplab.profiler import profiled
+
+
+# === QR ETİKETLERİ ===
+# Her etiket (QR kodu + altındaki bilgi satırları) yalnızca QR içeriğine
+# bağlıdır; içeriğin özetiyle adlandırılıp önbellekte tutulur. İçeriği
+# değişmeyen işler bir daha çizilmez. Eksik etiketler çoksa ayrı süreçlerde
+# paralel çizilir. Toplu çıktı, etiketleri A4 sayfalara dizen tek bir PDF
+# ya da tek bir PNG sayfasıdır.
+QR_CACHE_DIR = os.path.join("data", "qrcodes", "cache")
+LABEL_VERSION = 1      # etiket düzeni değişirse artırılır, eski önbellek kullanılmaz
+LABEL_QR_SIZE = 300
+LABEL_LINE_HEIGHT = 30
+POOL_MIN_LABELS = 8    # bundan az eksik etiket süreç açmadan çizilir
+
+SHEET_LABEL_WIDTH = 45  # mm, PDF sayfasında
+SHEET_GAP = 2.5         # mm
+SHEET_PNG_COLUMNS = 4
+
+_label_font = None
+
+def qr_payload(job):
+    adsoyad = f"{job['patient_name']} {job['patient_surname']}"
+    return (
+        f"Hasta: {adsoyad}\n"
+        f"Klinik: {job['clinic']}\n"
+        f"Doktor: {job['doctor']}\n"
+        f"Protez: {job['prosthesis']}\n"
+        f"Üye: {job['count']}\n"
+        f"Tarih: {job['date']}\n"
+        f"Toplam: ₺{job['total_price']}\n"
+        f"Not: {job['note']}"
+    )
+
+def label_path(payload):
+    digest = hashlib.sha256(f"{LABEL_VERSION}\n{payload}".encode("utf-8")).hexdigest()
+    return os.path.join(QR_CACHE_DIR, digest + ".png")
+
+def label_font():
+    # Süreç başına bir kez yüklenir
+    global _label_font
+    if _label_font is None:
+        from PIL import ImageFont
+        for font_path in ("arial.ttf", PDF_FONT):
+            try:
+                _label_font = ImageFont.truetype(font_path, 18)
+                break
+            except OSError:
+                pass
+        else:
+            _label_font = ImageFont.load_default()
+    return _label_font
+
+def render_label(payload, path):
+    # Ayrı süreçlerde de çağrılır; yalnızca dosyaya yazar
+    import qrcode
+    from PIL import Image, ImageDraw
+    qr_img = qrcode.make(payload).get_image().convert("RGB").resize((LABEL_QR_SIZE, LABEL_QR_SIZE))
+    lines = payload.split("\n")
+    label = Image.new("RGB", (LABEL_QR_SIZE, LABEL_QR_SIZE + LABEL_LINE_HEIGHT * len(lines) + 20), "white")
+    label.paste(qr_img, (0, 0))
+    draw = ImageDraw.Draw(label)
+    font = label_font()
+    for i, line in enumerate(lines):
+        draw.text((10, LABEL_QR_SIZE + 10 + i * LABEL_LINE_HEIGHT), line, fill="black", font=font)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    label.save(tmp, "PNG")
+    os.replace(tmp, path)
+    return path
+
+def ensure_label(payload):
+    path = label_path(payload)
+    if not os.path.exists(path):
+        os.makedirs(QR_CACHE_DIR, exist_ok=True)
+        render_label(payload, path)
+    return path
+
+def ensure_labels(payloads, progress=None, cancelled=None, workers=None):
+    # Etiket dosyalarının yollarını (payloads sırasıyla), iptal edildiyse None döndürür
+    os.makedirs(QR_CACHE_DIR, exist_ok=True)
+    paths = [label_path(p) for p in payloads]
+    missing = {}  # yol -> içerik; aynı içerik bir kez çizilir
+    for payload, path in zip(payloads, paths):
+        if path not in missing and not os.path.exists(path):
+            missing[path] = payload
+    done = len(payloads) - len(missing)
+    if progress is not None:
+        progress(done)
+
+    if len(missing) < POOL_MIN_LABELS:
+        for path, payload in missing.items():
+            if cancelled is not None and cancelled():
+                return None
+            render_label(payload, path)
+            done += 1
+            if progress is not None:
+                progress(done)
+        return paths
+
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(render_label, payload, path) for path, payload in missing.items()]
+        for future in as_completed(futures):
+            future.result()
+            done += 1
+            if cancelled is not None and cancelled():
+                pool.shutdown(cancel_futures=True)
+                return None
+            if progress is not None:
+                progress(done)
+    return paths
+
+@profiled(rows=lambda result, path, payloads, *args, **kwargs: len(payloads) if result else 0)
+def write_label_sheet(path, payloads, progress=None, cancelled=None, workers=None):
+    # write_xlsx gibi: tamamlandıysa True, iptal edildiyse False. Uzantı
+    # .png ise tek PNG sayfası, değilse PDF yazılır.
+    labels = ensure_labels(payloads, progress, cancelled, workers)
+    if labels is None:
+        return False
+    tmp = path + ".tmp"
+    try:
+        if path.lower().endswith(".png"):
+            label_sheet_png(tmp, labels)
+        else:
+            label_sheet_pdf(tmp, labels)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    if progress is not None:
+        progress(len(payloads))
+    return True
+
+def label_sheet_pdf(path, labels):
+    from fpdf import FPDF
+    from PIL import Image
+    pdf = FPDF(format="A4")
+    pdf.set_auto_page_break(False)
+    pdf.set_draw_color(200, 200, 200)
+    margin = 10
+    w = SHEET_LABEL_WIDTH
+    x, y = margin, margin
+    row_height = 0
+    pdf.add_page()
+    for label in labels:
+        with Image.open(label) as img:
+            h = w * img.height / img.width
+        if x + w > pdf.w - margin:
+            x, y = margin, y + row_height + SHEET_GAP
+            row_height = 0
+        if y + h > pdf.h - margin:
+            pdf.add_page()
+            x, y = margin, margin
+        pdf.image(label, x, y, w, h)
+        pdf.rect(x, y, w, h)
+        row_height = max(row_height, h)
+        x += w + SHEET_GAP
+    pdf.output(path)
+
+def label_sheet_png(path, labels):
+    from PIL import Image
+    images = [Image.open(label) for label in labels]
+    try:
+        gap = 20
+        cell_w = max(img.width for img in images) + gap
+        cell_h = max(img.height for img in images) + gap
+        columns = min(SHEET_PNG_COLUMNS, len(images))
+        rows = (len(images) + columns - 1) // columns
+        sheet = Image.new("RGB", (columns * cell_w + gap, rows * cell_h + gap), "white")
+        for i, img in enumerate(images):
+            sheet.paste(img, (gap + (i % columns) * cell_w, gap + (i // columns) * cell_h))
+        sheet.save(path, "PNG")
+    finally:
+        for img in images:
+            img.close()
@@ -0,0 +1,75 @@
+from collections import OrderedDict
+
+from dplab.storage import data_version
+from dplab.core import filter_job_ids, filtered_finance
+from dplab.aggregate import jobs_sum, finance_net
+
+
+# === SORGU ÖNBELLEĞİ ===
+# Aynı süzgeçlere (bu ay, bir klinik, bir doktor) gün içinde defalarca
+# dönülür. Süzgeç sonuçları toplamlarıyla birlikte en fazla QUERY_CACHE_SIZE
+# sonuçluk bir LRU önbellekte tutulur. Anahtar (koleksiyon, sorgu demeti,
+# koleksiyonun veri sürümü) üçlüsüdür: sorgu make_job_query /
+# make_finance_query ile zaten normalleştirilmiştir, veri sürümü ise her
+# kayıt değişikliğinde artar. Böylece yalnızca değişen koleksiyonun
+# sonuçları geçersiz olur; eski sürümün sonuçları ilk eklemede atılır.
+# Önbellekteki listeler paylaşılır, değiştirilmemelidir.
+QUERY_CACHE_SIZE = 32
+
+_cache = OrderedDict()  # (koleksiyon, sorgu, veri sürümü) -> sonuç
+_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+def cache_key(name, query):
+    return (name, query, data_version(name))
+
+def cache_get(key):
+    value = _cache.get(key)
+    if value is None:
+        _cache_stats["misses"] += 1
+        return None
+    _cache_stats["hits"] += 1
+    _cache.move_to_end(key)
+    return value
+
+def cache_put(key, value):
+    name, _, version = key
+    for old in [k for k in _cache if k[0] == name and k[2] != version]:
+        # Veri değişmiş; bu sonuçlar bir daha istenmez
+        del _cache[old]
+        _cache_stats["evictions"] += 1
+    _cache[key] = value
+    _cache.move_to_end(key)
+    while len(_cache) > QUERY_CACHE_SIZE:
+        _cache.popitem(last=False)
+        _cache_stats["evictions"] += 1
+
+def job_view(query):
+    # (iş id'leri ya da süzgeç boşsa None, toplam fiyat)
+    key = cache_key("jobs", query)
+    value = cache_get(key)
+    if value is None:
+        keys = filter_job_ids(query)
+        value = (keys, jobs_sum(keys))
+        cache_put(key, value)
+    return value
+
+def finance_view(query):
+    # (kayıtlar, (gelir, gider))
+    key = cache_key("finance", query)
+    value = cache_get(key)
+    if value is None:
+        value = (filtered_finance(query), finance_net(*query))
+        cache_put(key, value)
+    return value
+
+def cache_stats():
+    lookups = _cache_stats["hits"] + _cache_stats["misses"]
+    return dict(_cache_stats, entries=len(_cache), size=QUERY_CACHE_SIZE,
+                hit_rate=round(_cache_stats["hits"] / lookups * 100, 1) if lookups else 0.0)
+
+def cache_reset_stats():
+    for name in _cache_stats:
+        _cache_stats[name] = 0
+
+def cache_clear():
+    _cache.clear()
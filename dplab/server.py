@@ -0,0 +1,178 @@
+import sys
+import hmac
+import json
+import asyncio
+import ipaddress
+from datetime import datetime
+
+from dplab.storage import (
+    DATA, FILES, ID_COLLECTIONS, SERVER_PORT, settings, load_settings, load_all, records,
+    insert_records, update_record, delete_record, save_collection, flush_writes,
+    record_version, set_version, bump_version, versions_snapshot, parse_address, encode_message
+)
+
+
+# === VERİ SUNUCUSU ===
+# Birden çok bilgisayarın aynı veriyle çalışması için: veriyi tek bu süreç
+# yükler ve kendi depolama ayarıyla (json ya da sqlite) yazar. İstemciler
+# ("storage": "server") kayıt kayıt ekler, değiştirir, siler; her işlem
+# istemcinin bildiği sürümle gelir ve sürüm eskiyse "conflict" ile reddedilir.
+# Kabul edilen her değişiklik diğer istemcilere itilir, istemciler dosya
+# yeniden okumaz ve sunucuyu yoklamaz. İşlemler tek bir asyncio döngüsünde
+# sırayla uygulanır. Varsayılan olarak yalnızca bu bilgisayardan bağlanılır;
+# ağa açmak için adres verilir ve ayarlarda "server_key" tanımlı olmalıdır,
+# anahtarsız sunucu ağ adresine bağlanmaz.
+#
+#     python -m dplab.server                 (yalnızca bu bilgisayar, 8765 portu)
+#     python -m dplab.server 192.168.1.10:9000
+#     python -m dplab.server 0.0.0.0         (tüm ağ arayüzleri)
+#
+# İletiler satır başına bir JSON nesnesidir:
+#     {"req": 1, "op": "load", "key": ...}                 -> {"data", "versions"}
+#     {"req": 2, "op": "insert", "name", "records", "version"} -> {"keys", "version"}
+#     {"req": 3, "op": "update", "name", "key", "record", "version"} -> {"version"}
+#     {"req": 4, "op": "delete", "name", "key", "version"} -> {"version"}
+#     {"req": 5, "op": "replace", "name", "records", "version"} -> {"version"}  (yalnızca listeler)
+# Hata yanıtı {"req", "error"}; itilen değişiklik kimlikli koleksiyonlarda
+# {"push": koleksiyon, "changes": [[id, kayıt ya da null, sürüm], ...]},
+# listelerde {"push": koleksiyon, "records": [...], "version"}.
+SERVER_LINE_LIMIT = 2 ** 27  # en büyük ileti (toplu içe aktarma)
+
+_clients = set()  # veriyi yüklemiş istemcilerin yazıcıları
+
+def log(text):
+    print(f"{datetime.now():%H:%M:%S} {text}", flush=True)
+
+def list_push(name):
+    return {"push": name, "records": list(records(name)), "version": record_version(name)}
+
+def loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def key_matches(key):
+    # Sabit sürede karşılaştırılır; yanıt süresi anahtarı ele vermez
+    return hmac.compare_digest(str(key or "").encode("utf-8"), settings["server_key"].encode("utf-8"))
+
+def valid_key(name, key):
+    coll = DATA[name]
+    if isinstance(coll, dict):
+        return key in coll
+    return isinstance(key, int) and 0 <= key < len(coll)
+
+def serve_request(msg):
+    # (yanıt, diğer istemcilere itilecek ileti ya da None)
+    op = msg.get("op")
+    if op == "load":
+        if settings["server_key"] and not key_matches(msg.get("key")):
+            return {"error": "Sunucu anahtarı yanlış."}, None
+        return {"data": {name: list(records(name)) for name in FILES}, "versions": versions_snapshot()}, None
+    name = msg.get("name")
+    if name not in FILES:
+        return {"error": f"Bilinmeyen koleksiyon: {name}"}, None
+    listed = name not in ID_COLLECTIONS
+    if listed and msg.get("version") != record_version(name):
+        return {"error": "conflict"}, None
+
+    if op == "insert":
+        added = insert_records(name, msg["records"])
+        if listed:
+            size = len(DATA[name])
+            return {"keys": list(range(size - len(added), size)), "version": bump_version(name)}, list_push(name)
+        return ({"keys": [r["id"] for r in added], "version": 1},
+                {"push": name, "changes": [[r["id"], r, 1] for r in added]})
+    if op == "replace":
+        if not listed:
+            return {"error": f"{name} toptan değiştirilemez."}, None
+        save_collection(name, msg["records"])
+        return {"version": bump_version(name)}, list_push(name)
+    if op not in ("update", "delete"):
+        return {"error": f"Bilinmeyen işlem: {op}"}, None
+
+    key = msg.get("key")
+    if not valid_key(name, key) or (not listed and msg.get("version") != record_version(name, key)):
+        return {"error": "conflict"}, None
+    # Yeni sürüm değişiklikten önce hesaplanır (silinen kaydın sürümü 0'a
+    # döner) ama yalnızca yazma başarılı olunca saklanır; başarısız yazma
+    # sürümü ilerletmez ve istemcinin bildiği sürüm geçerli kalır
+    version = record_version(name, key) + 1
+    if op == "update":
+        update_record(name, key, msg["record"])
+        record = DATA[name][key]
+    else:
+        delete_record(name, key)
+        record = None
+    set_version(name, key, version)
+    if listed:
+        return {"version": version}, list_push(name)
+    return {"version": version}, {"push": name, "changes": [[key, record, version]]}
+
+async def handle_client(reader, writer):
+    peer = writer.get_extra_info("peername")
+    log(f"{peer} bağlandı")
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            msg = {}
+            try:
+                msg = json.loads(line)
+                if msg.get("op") != "load" and writer not in _clients:
+                    reply, push = {"error": "Bağlantı doğrulanmadı."}, None
+                else:
+                    reply, push = serve_request(msg)
+            except Exception as e:
+                # Hatalı ileti ya da yazma hatası bağlantıyı düşürmez
+                log(f"{peer}: {e}")
+                reply, push = {"error": str(e)}, None
+            reply["req"] = msg.get("req")
+            writer.write(encode_message(reply))
+            if "data" in reply:
+                _clients.add(writer)
+            if push is not None:
+                data = encode_message(push)
+                for other in _clients:
+                    if other is not writer:
+                        other.write(data)
+            await writer.drain()
+    except (OSError, ValueError) as e:
+        log(f"{peer}: {e}")
+    finally:
+        _clients.discard(writer)
+        writer.close()
+        log(f"{peer} ayrıldı")
+
+async def serve(host, port):
+    server = await asyncio.start_server(handle_client, host, port, limit=SERVER_LINE_LIMIT)
+    log(f"Veri sunucusu {host}:{port} adresinde, {len(DATA['jobs'])} iş yüklendi "
+        f"({settings['storage']} depolama)")
+    async with server:
+        await server.serve_forever()
+
+def main(argv):
+    if len(argv) > 1:
+        print("Kullanım: python -m dplab.server [adres:port]")
+        return 2
+    if load_settings()["storage"] == "server":
+        print('Sunucunun verisi "json" ya da "sqlite" depolamayla tutulmalı (data/settings.json).')
+        return 2
+    host, port = parse_address(argv[0]) if argv else ("127.0.0.1", SERVER_PORT)
+    if not loopback(host) and not load_settings()["server_key"]:
+        print(f'{host} ağa açık bir adres; önce data/settings.json içinde "server_key" tanımlayın.')
+        return 2
+    load_all()
+    try:
+        asyncio.run(serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        flush_writes()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,949 @@
+import os
+import sys
+import json
+import queue
+import socket
+import sqlite3
+import hashlib
+import threading
+import atexit
+from datetime import datetime
+
+from dplab.profiler import profiled, set_profiling
+
+
+# === KLASÖRLER ===
+FILES = {
+    "jobs": "data/jobs.json",
+    "clinics": "data/clinics.json",
+    "doctors": "data/doctors.json",
+    "prices": "data/prices.json",
+    "finance": "data/finance.json",
+    "envanter": "data/envanter.json"
+}
+SETTINGS_FILE = "data/settings.json"
+DB_FILE = "data/dplab.db"
+
+@profiled()
+def load_data(file):
+    if os.path.exists(file):
+        with open(file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return []
+
+DEFAULT_SETTINGS = {"storage": "json", "journal": False, "journal_limit": 1000000, "async_save": True, "profile": False,
+                    "server": "127.0.0.1:8765", "server_key": ""}
+
+def load_settings():
+    settings = dict(DEFAULT_SETTINGS)
+    if os.path.exists(SETTINGS_FILE):
+        with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
+            settings.update(json.load(f))
+    return settings
+
+settings = dict(DEFAULT_SETTINGS)
+
+
+# === DOSYA YAZICI ===
+# save_data arayüzü bekletmez: veri kuyruğa alınır ve ayrı bir iş parçacığı
+# yazar. Aynı dosya için bekleyen yazmalar birleşir, yalnızca son hali yazılır.
+# Her yazma geçici dosya + fsync + os.replace ile yapılır; yarıda kalan bir
+# yazma eski dosyayı bozmaz.
+_pending_writes = {}  # dosya -> yazılmayı bekleyen son veri
+_writer_cond = threading.Condition()
+_writer_thread = None
+_writer_busy = False
+_writer_error = None
+
+def write_synced(file, data):
+    with open(file, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+def atomic_write(file, data):
+    tmp = file + ".tmp"
+    write_synced(tmp, data)
+    os.replace(tmp, file)
+
+@profiled(rows=lambda result, file, data: len(data))
+def write_json(file, data):
+    atomic_write(file, json.dumps(data, ensure_ascii=False, indent=4, default=json_record).encode("utf-8"))
+
+@profiled(rows=lambda result, file, data: len(data))
+def save_data(file, data):
+    global _writer_thread
+    if not settings["async_save"]:
+        write_json(file, list(data))
+        return
+    with _writer_cond:
+        # Kayıtlar yerinde değiştirilmediği için sığ kopya yeterli
+        _pending_writes[file] = list(data)
+        if _writer_thread is None:
+            _writer_thread = threading.Thread(target=_writer_loop, daemon=True)
+            _writer_thread.start()
+        _writer_cond.notify_all()
+
+def _writer_loop():
+    global _writer_busy, _writer_error
+    while True:
+        with _writer_cond:
+            while not _pending_writes:
+                _writer_cond.wait()
+            file = next(iter(_pending_writes))
+            data = _pending_writes.pop(file)
+            _writer_busy = True
+        try:
+            write_json(file, data)
+            error = None
+        except Exception as e:
+            error = f"{file}: {e}"
+        with _writer_cond:
+            _writer_busy = False
+            _writer_error = error
+            _writer_cond.notify_all()
+
+def flush_writes():
+    with _writer_cond:
+        while _pending_writes or _writer_busy:
+            _writer_cond.wait()
+
+def save_state():
+    if remote_mode():
+        # Sunucu modunda her işlem sunucu onaylayınca biter
+        return "saved" if server_online() else "offline"
+    with _writer_cond:
+        if _pending_writes:
+            return "unsaved"
+        if _writer_busy:
+            return "saving"
+        if _writer_error:
+            return "error"
+        return "saved"
+
+def writer_error():
+    # Son başarısız yazmanın hatası (başarılı bir yazmada temizlenir)
+    return _writer_error
+
+atexit.register(flush_writes)
+
+
+# === İŞ KAYDI ===
+# İşler bellekte sözlük yerine Job nesnesi olarak tutulur: alanlar __slots__
+# içindedir, çok tekrarlayan klinik/doktor/protez/tarih/durum metinleri
+# sys.intern ile tek kopyadır, üye sayısı int, toplam fiyat float olarak
+# durur. Nesne sözlük gibi okunur (job["clinic"], job.get("status")); count
+# ve total_price JSON'daki metin haliyle döner. JSON'a yazılırken alanlar
+# formdaki sırayla sözlüğe çevrilir. Kanonik olmayan sayı metinleri ("150",
+# "abc"), eksik ya da metin olmayan alanlar ve bilinmeyen anahtarlar "extra"
+# içinde olduğu gibi saklanır; dosyadaki değerler kayıpsız geri yazılır.
+JOB_FIELDS = ("patient_name", "patient_surname", "clinic", "doctor", "prosthesis",
+              "count", "note", "date", "total_price", "status", "id")
+JOB_TEXT_FIELDS = frozenset(("patient_name", "patient_surname", "clinic", "doctor",
+                             "prosthesis", "note", "date", "status"))
+JOB_INTERNED = frozenset(("clinic", "doctor", "prosthesis", "date", "status"))
+
+_MISSING = object()
+
+class Job:
+    __slots__ = ("patient_name", "patient_surname", "clinic", "doctor", "prosthesis",
+                 "count", "note", "date", "price", "status", "id", "extra")
+
+    def __init__(self, record):
+        self.patient_name = self.patient_surname = self.clinic = self.doctor = None
+        self.prosthesis = self.note = self.date = self.status = self.id = None
+        self.count = 0
+        self.price = 0.0
+        self.extra = None
+        for key, value in record.items():
+            self[key] = value
+        for key in ("count", "total_price"):
+            if key not in record:
+                self._keep(key, _MISSING)
+
+    def _keep(self, key, value):
+        if self.extra is None:
+            self.extra = {}
+        self.extra[key] = value
+
+    def __setitem__(self, key, value):
+        extra = self.extra
+        if extra is not None and key in extra:
+            del extra[key]
+            if not extra:
+                self.extra = None
+        if key == "count":
+            try:
+                self.count = int(value)
+            except (TypeError, ValueError):
+                self.count = 0
+            if value.__class__ is not str or value != str(self.count):
+                self._keep(key, value)
+        elif key == "total_price":
+            try:
+                self.price = float(value)
+            except (TypeError, ValueError):
+                self.price = 0.0
+            if value.__class__ is not str or value != f"{self.price:.2f}":
+                self._keep(key, value)
+        elif key in JOB_TEXT_FIELDS:
+            if value.__class__ is str:
+                setattr(self, key, sys.intern(value) if key in JOB_INTERNED else value)
+            else:
+                setattr(self, key, None)
+                self._keep(key, value)
+        elif key == "id" and value.__class__ is int:
+            self.id = value
+        else:
+            self._keep(key, value)
+
+    def __getitem__(self, key):
+        extra = self.extra
+        if extra is not None and key in extra:
+            value = extra[key]
+        elif key in JOB_TEXT_FIELDS or key == "id":
+            value = getattr(self, key)
+        elif key == "count":
+            value = str(self.count)
+        elif key == "total_price":
+            value = f"{self.price:.2f}"
+        else:
+            value = None
+        if value is None or value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def to_dict(self):
+        d = {}
+        for key in JOB_FIELDS:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                d[key] = value
+        if self.extra is not None:
+            for key, value in self.extra.items():
+                if key not in d and value is not _MISSING:
+                    d[key] = value
+        return d
+
+    def keys(self):
+        return self.to_dict().keys()
+
+RECORD_TYPES = {"jobs": Job}
+
+def typed_record(name, record):
+    cls = RECORD_TYPES.get(name)
+    if cls is None or isinstance(record, cls):
+        return record
+    return cls(record)
+
+def json_record(obj):
+    # json.dumps için: sözlük olmayan kayıt tipleri JSON biçimine çevrilir
+    if isinstance(obj, Job):
+        return obj.to_dict()
+    raise TypeError(f"{type(obj).__name__} JSON'a çevrilemez")
+
+
+# === KAYIT KİMLİKLERİ ===
+# İşler, muhasebe ve envanter kayıtları kalıcı bir "id" alır ve bellekte
+# id -> kayıt sözlüğünde tutulur (sözlük ekleme sırasını korur). Treeview
+# satırlarının iid'si bu kimliktir; seçim, düzenleme ve silme doğrudan
+# sözlükten yapılır.
+ID_COLLECTIONS = ("jobs", "finance", "envanter")
+
+_next_id = {}
+_ids_assigned = set()  # açılışta kimlik verilen, bir kez yeniden kaydedilecek koleksiyonlar
+
+def new_id(name):
+    key = _next_id[name]
+    _next_id[name] = key + 1
+    return key
+
+def to_collection(name, records):
+    if name not in ID_COLLECTIONS:
+        return records
+    _next_id[name] = max((r["id"] for r in records if "id" in r), default=0) + 1
+    coll = {}
+    for r in records:
+        r = typed_record(name, r)
+        if "id" not in r:
+            r["id"] = new_id(name)
+            _ids_assigned.add(name)
+        coll[r["id"]] = r
+    return coll
+
+def records(name):
+    coll = DATA[name]
+    return coll.values() if isinstance(coll, dict) else coll
+
+
+# === SQLITE DEPOLAMA ===
+# Kaydın tamamı "data" sütununda JSON olarak durur, filtrelerde kullanılan
+# alanlar ayrıca indeksli sütunlara yazılır. Tarihler sıralanabilsin diye
+# YYYY-MM-DD biçiminde saklanır.
+DB_COLUMNS = {
+    "jobs": ("date", "clinic", "doctor", "status"),
+    "clinics": ("name",),
+    "doctors": ("name", "clinic"),
+    "prices": ("type", "clinic"),
+    "finance": ("date", "clinic", "type"),
+    "envanter": ("ad", "skt")
+}
+DB_DATE_COLUMNS = ("date", "skt")
+
+db = None
+_rowids = {}  # tablo -> listedeki sırayla eşleşen sqlite rowid'leri
+
+def db_date(value):
+    try:
+        return datetime.strptime(value, "%d/%m/%Y").strftime("%Y-%m-%d")
+    except (TypeError, ValueError):
+        return value
+
+def db_row(name, record):
+    values = []
+    for col in DB_COLUMNS[name]:
+        value = record.get(col, "")
+        if col in DB_DATE_COLUMNS:
+            value = db_date(value)
+        values.append(value)
+    return [json.dumps(record, ensure_ascii=False, default=json_record)] + values
+
+def db_insert_row(name, record):
+    # Kimlikli koleksiyonlarda rowid kaydın kendi id'sidir
+    return [record["id"] if name in ID_COLLECTIONS else None] + db_row(name, record)
+
+def db_insert_sql(name):
+    cols = ", ".join(("id", "data") + DB_COLUMNS[name])
+    marks = ", ".join("?" for _ in range(len(DB_COLUMNS[name]) + 2))
+    return f"INSERT INTO {name} ({cols}) VALUES ({marks})"
+
+def db_rowid(name, key):
+    return key if name in ID_COLLECTIONS else _rowids[name][key]
+
+def db_update_sql(name):
+    cols = ", ".join(f"{col} = ?" for col in ("data",) + DB_COLUMNS[name])
+    return f"UPDATE {name} SET {cols} WHERE id = ?"
+
+def db_open():
+    global db
+    yeni = not os.path.exists(DB_FILE)
+    db = sqlite3.connect(DB_FILE)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    for name, cols in DB_COLUMNS.items():
+        col_defs = ", ".join(f"{col} TEXT" for col in cols)
+        db.execute(f"CREATE TABLE IF NOT EXISTS {name} (id INTEGER PRIMARY KEY, data TEXT NOT NULL, {col_defs})")
+        for col in cols:
+            db.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_{col} ON {name} ({col})")
+    db.commit()
+    if yeni or not db.execute("SELECT 1 FROM meta WHERE key = 'migrated'").fetchone():
+        db_migrate_from_json()
+
+def db_migrate_from_json():
+    # Mevcut data/*.json dosyaları bir kez veritabanına aktarılır, dosyalar yedek olarak kalır
+    with db:
+        for name in DB_COLUMNS:
+            db.execute(f"DELETE FROM {name}")
+            data = journal_load(name) if has_journal(name) else load_data(FILES[name])
+            if isinstance(data, dict):
+                data = data.values()
+            rows = [[r.get("id")] + db_row(name, r) for r in data]
+            db.executemany(db_insert_sql(name), rows)
+        db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated', ?)", (datetime.now().isoformat(),))
+
+def db_load(name):
+    rows = db.execute(f"SELECT id, data FROM {name} ORDER BY id").fetchall()
+    if name in ID_COLLECTIONS:
+        coll = {}
+        for rowid, data in rows:
+            record = typed_record(name, json.loads(data))
+            record["id"] = rowid
+            coll[rowid] = record
+        _next_id[name] = (rows[-1][0] if rows else 0) + 1
+        return coll
+    _rowids[name] = [row[0] for row in rows]
+    return [json.loads(row[1]) for row in rows]
+
+
+# === DEĞİŞİKLİK GÜNLÜĞÜ ===
+# JSON modunda jobs.json her kayıtta baştan yazılmaz; değişiklik tek satır
+# olarak jobs.json.journal dosyasına eklenir. Açılışta günlük son anlık
+# görüntünün üzerine oynatılır. Günlük sınırı aşınca arka planda yeni bir
+# anlık görüntüye katlanır: günlük önce .1 adıyla kenara alınır, yeni görüntü
+# yazılınca sonuna "folded" işareti (görüntünün sha256 özeti) eklenir ve
+# görüntü yerine konur. Bu adımlar arasında çökme olursa açılışta özet
+# karşılaştırılarak günlüğün tekrar oynatılıp oynatılmayacağına karar verilir.
+JOURNALED = ("jobs",)
+
+_compaction = {}  # koleksiyon -> çalışan sıkıştırma iş parçacığı
+
+def journal_enabled(name):
+    return settings["storage"] == "json" and settings["journal"] and name in JOURNALED
+
+def journal_path(name):
+    return FILES[name] + ".journal"
+
+def has_journal(name):
+    path = journal_path(name)
+    return os.path.exists(path) or os.path.exists(path + ".1")
+
+def file_sha(file):
+    if not os.path.exists(file):
+        return None
+    with open(file, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def journal_write(path, *ops):
+    # Tüm işlemler tek fsync ile eklenir
+    with open(path, "a", encoding="utf-8") as f:
+        for op in ops:
+            f.write(json.dumps(op, ensure_ascii=False, default=json_record) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+def journal_read(path):
+    ops = []
+    if os.path.exists(path):
+        with open(path, "r+b") as f:
+            good = 0
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError
+                    ops.append(json.loads(line))
+                except ValueError:
+                    # Çökme sırasında yarım kalmış son satır, sonraki eklemeler bozulmasın diye kesilir
+                    f.truncate(good)
+                    break
+                good += len(line)
+    return ops
+
+def journal_apply(name, coll, op):
+    if isinstance(coll, list):
+        if op["op"] == "add":
+            coll.append(op["r"])
+        elif op["op"] == "set":
+            coll[op["i"]] = op["r"]
+        elif op["op"] == "del":
+            del coll[op["i"]]
+        return
+    if op["op"] == "add":
+        record = typed_record(name, op["r"])
+        if "id" not in record:
+            record["id"] = new_id(name)
+            _ids_assigned.add(name)
+        else:
+            # Anlık görüntüden sonra eklenen kimlikler yeniden verilmesin
+            _next_id[name] = max(_next_id[name], record["id"] + 1)
+        coll[record["id"]] = record
+    elif op["op"] in ("set", "del"):
+        # Kimliklerden önce yazılmış günlükler kaydı sıra numarasıyla gösterir
+        key = op["id"] if "id" in op else list(coll)[op["i"]]
+        if op["op"] == "set":
+            record = typed_record(name, op["r"])
+            record["id"] = key
+            coll[key] = record
+        else:
+            coll.pop(key, None)
+
+def journal_load(name):
+    coll = to_collection(name, load_data(FILES[name]))
+    path = journal_path(name)
+    snapshot_sha = None
+    for p in (path + ".1", path):
+        ops = journal_read(p)
+        if ops and ops[-1]["op"] == "folded":
+            if snapshot_sha is None:
+                snapshot_sha = file_sha(FILES[name])
+            if ops[-1]["sha"] == snapshot_sha:
+                os.remove(p)  # zaten anlık görüntüye katlanmış
+                continue
+        for op in ops:
+            journal_apply(name, coll, op)
+    return coll
+
+def journal_append(name, *ops):
+    size = journal_write(journal_path(name), *ops)
+    if size > settings["journal_limit"]:
+        journal_compact(name)
+
+def journal_fold(name, snapshot, paths):
+    data = json.dumps(snapshot, ensure_ascii=False, indent=4, default=json_record).encode("utf-8")
+    sha = hashlib.sha256(data).hexdigest()
+    tmp = FILES[name] + ".tmp"
+    write_synced(tmp, data)
+    for p in paths:
+        journal_write(p, {"op": "folded", "sha": sha})
+    os.replace(tmp, FILES[name])
+    for p in paths:
+        os.remove(p)
+
+def journal_compact(name, background=True):
+    thread = _compaction.get(name)
+    if thread is not None and thread.is_alive():
+        if background:
+            return
+        thread.join()
+    path = journal_path(name)
+    snapshot = list(records(name))
+    if background and not os.path.exists(path + ".1"):
+        os.replace(path, path + ".1")
+        thread = threading.Thread(target=journal_fold, args=(name, snapshot, [path + ".1"]))
+        _compaction[name] = thread
+        thread.start()
+    else:
+        journal_fold(name, snapshot, [p for p in (path + ".1", path) if os.path.exists(p)])
+
+
+# === İNDEKSLER ===
+# Kayıt işlemleri her değişikliği kayıtlı indekslere bildirir; böylece
+# indeksler tüm veriyi yeniden taramadan güncel kalır. Toplu değişikliklerden
+# sonra (save_collection) indeks baştan kurulur. Her bildirim koleksiyonun
+# veri sürümünü de artırır; sorgu önbelleği sonuçları bu sürümle saklar.
+_indexes = {}  # koleksiyon -> [(ekle, çıkar, kur), ...]
+_data_versions = {}  # koleksiyon -> her değişiklikte artan sayaç
+
+def register_index(name, add, remove, build):
+    _indexes.setdefault(name, []).append((add, remove, build))
+    if name in DATA:
+        build(records(name))
+
+def data_version(name):
+    return _data_versions.get(name, 0)
+
+def index_add(name, record):
+    _data_versions[name] = data_version(name) + 1
+    for add, _, _ in _indexes.get(name, ()):
+        add(record)
+
+def index_remove(name, record):
+    _data_versions[name] = data_version(name) + 1
+    for _, remove, _ in _indexes.get(name, ()):
+        remove(record)
+
+def index_rebuild(name):
+    _data_versions[name] = data_version(name) + 1
+    for _, _, build in _indexes.get(name, ()):
+        build(records(name))
+
+
+# === SUNUCU MODU ===
+# Birden çok bilgisayar aynı veriyle çalışırken verinin sahibi tek bir sunucu
+# sürecidir (python -m dplab.server). "storage": "server" ayarlı istemciler
+# açılışta tüm veriyi sunucudan bir kez alır ve bellekte tutar; her kayıt
+# işlemi önce sunucuya gönderilir, sunucu onaylarsa yerel kopyaya uygulanır.
+# Kimlikli koleksiyonlarda her kaydın, diğerlerinde listenin tamamının bir
+# sürüm numarası vardır. İşlem istemcinin bildiği sürümle gönderilir;
+# sunucudaki sürüm daha yeniyse reddedilir (RecordConflict). Sunucu her
+# değişikliği diğer istemcilere iter; istemci bunları arayüz iş parçacığında
+# apply_remote ile uygular. Protokol TCP üzerinde satır başına bir JSON
+# iletisidir.
+SERVER_PORT = 8765
+SERVER_TIMEOUT = 30        # saniye
+SERVER_LOAD_TIMEOUT = 300  # tüm verinin ilk yüklenmesi
+
+class ServerError(Exception):
+    pass
+
+class RecordConflict(ServerError):
+    pass
+
+_versions = {}  # koleksiyon -> {id: sürüm} (yalnızca değişmiş ya da silinmiş kayıtlar) ya da liste sürümü
+_server = {"conn": None, "next": 0, "connecting": False}
+_server_lock = threading.Lock()
+_server_replies = {}  # istek no -> [Event, yanıt, yanıt yeniden yükleme olarak kuyruğa mı]
+_remote_queue = queue.Queue()  # sunucudan itilen, henüz uygulanmamış değişiklikler
+
+def remote_mode():
+    return settings["storage"] == "server"
+
+def reset_versions():
+    _versions.clear()
+    for name in FILES:
+        _versions[name] = {} if name in ID_COLLECTIONS else 1
+
+def record_version(name, key=None):
+    # Listelerde listenin sürümü; kimlikli koleksiyonlarda hiç değişmemiş
+    # kayıtlar 1, hiç görülmemiş kimlikler 0
+    if name not in ID_COLLECTIONS:
+        return _versions[name]
+    version = _versions[name].get(key)
+    if version is None:
+        version = 1 if key in DATA[name] else 0
+    return version
+
+def set_version(name, key, version):
+    if name in ID_COLLECTIONS:
+        _versions[name][key] = version
+    else:
+        _versions[name] = version
+    return version
+
+def bump_version(name, key=None):
+    return set_version(name, key, record_version(name, key) + 1)
+
+def versions_snapshot():
+    return {name: list(v.items()) if isinstance(v, dict) else v for name, v in _versions.items()}
+
+def parse_address(text, default_host="127.0.0.1"):
+    host, sep, port = text.rpartition(":")
+    if not sep:
+        return text or default_host, SERVER_PORT
+    return host or default_host, int(port)
+
+def encode_message(msg):
+    return json.dumps(msg, ensure_ascii=False, default=json_record).encode("utf-8") + b"\n"
+
+def server_online():
+    return _server["conn"] is not None
+
+def server_connect(reload=False):
+    # Sunucuya bağlanıp tüm veriyi ister. reload ise yanıt, sonrasında
+    # itilen değişikliklerden önce uygulansın diye kuyruğa konur.
+    try:
+        sock = socket.create_connection(parse_address(settings["server"]), timeout=5)
+    except OSError as e:
+        raise ServerError(f"Sunucuya bağlanılamadı ({settings['server']}): {e}")
+    sock.settimeout(None)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    with _server_lock:
+        _server["conn"] = sock
+    threading.Thread(target=_server_reader, args=(sock,), daemon=True).start()
+    try:
+        return server_request("load", SERVER_LOAD_TIMEOUT, reload, key=settings["server_key"])
+    except ServerError:
+        # Okuyucu iş parçacığı bağlantıyı kapatıp çevrimdışına geçer
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        raise
+
+def server_reconnect():
+    # Kopan bağlantıyı arka planda yeniden kurar; veri apply_remote'ta baştan yüklenir
+    with _server_lock:
+        if _server["conn"] is not None or _server["connecting"]:
+            return
+        _server["connecting"] = True
+
+    def run():
+        try:
+            server_connect(reload=True)
+        except ServerError:
+            pass
+        finally:
+            _server["connecting"] = False
+
+    threading.Thread(target=run, daemon=True).start()
+
+def _server_reader(sock):
+    try:
+        with sock.makefile("rb") as stream:
+            for line in stream:
+                msg = json.loads(line)
+                if "req" not in msg:
+                    _remote_queue.put(msg)
+                    continue
+                with _server_lock:
+                    slot = _server_replies.pop(msg["req"], None)
+                if slot is not None:
+                    if slot[2] and "data" in msg:
+                        _remote_queue.put({"reload": msg})
+                    slot[1] = msg
+                    slot[0].set()
+    except (OSError, ValueError):
+        pass
+    with _server_lock:
+        if _server["conn"] is sock:
+            _server["conn"] = None
+        waiting = list(_server_replies.values())
+        _server_replies.clear()
+    sock.close()
+    for slot in waiting:
+        slot[0].set()
+
+def server_request(op, timeout=SERVER_TIMEOUT, reload=False, **fields):
+    with _server_lock:
+        sock = _server["conn"]
+        if sock is None:
+            raise ServerError("Sunucu bağlantısı yok, yeniden bağlanılıyor.")
+        _server["next"] += 1
+        req = _server["next"]
+        slot = _server_replies[req] = [threading.Event(), None, reload]
+        try:
+            sock.sendall(encode_message(dict(fields, req=req, op=op)))
+        except OSError as e:
+            del _server_replies[req]
+            raise ServerError(f"Sunucuya yazılamadı: {e}")
+    if not slot[0].wait(timeout):
+        with _server_lock:
+            _server_replies.pop(req, None)
+        raise ServerError("Sunucu yanıt vermedi.")
+    reply = slot[1]
+    if reply is None:
+        raise ServerError("Sunucu bağlantısı koptu.")
+    if reply.get("error") == "conflict":
+        raise RecordConflict("Kayıt başka bir bilgisayarda değiştirildi; güncel hali yükleniyor. "
+                             "Değişikliği tekrar yapın.")
+    if "error" in reply:
+        raise ServerError(reply["error"])
+    return reply
+
+def remote_insert(name, recs):
+    # Kimlikleri sunucu verir; listelerde eklenen sıra yerel listeyle aynıdır
+    reply = server_request("insert", name=name, records=recs, version=record_version(name))
+    if name in ID_COLLECTIONS:
+        for record, key in zip(recs, reply["keys"]):
+            record["id"] = key
+    else:
+        _versions[name] = reply["version"]
+
+def remote_change(op, name, key=None, **fields):
+    reply = server_request(op, name=name, key=key, version=record_version(name, key), **fields)
+    if name in ID_COLLECTIONS:
+        _versions[name][key] = reply["version"]
+    else:
+        _versions[name] = reply["version"]
+
+def load_snapshot(snapshot):
+    # Koleksiyonlar yerinde değiştirilir; arayüz aynı nesneleri tutar
+    for name in FILES:
+        coll = to_collection(name, snapshot["data"][name])
+        if name not in DATA:
+            DATA[name] = coll
+        elif isinstance(coll, dict):
+            DATA[name].clear()
+            DATA[name].update(coll)
+        else:
+            DATA[name][:] = coll
+    reset_versions()
+    for name, versions in snapshot["versions"].items():
+        _versions[name] = dict(versions) if name in ID_COLLECTIONS else versions
+
+def apply_remote():
+    # Sunucudan itilen değişiklikleri yerel kopyaya ve indekslere uygular.
+    # [(koleksiyon, eski kayıt, yeni kayıt), ...] döndürür: listelerde
+    # kayıtlar None, tüm veri yeniden yüklendiyse koleksiyon da None'dır.
+    changes = []
+    while True:
+        try:
+            msg = _remote_queue.get_nowait()
+        except queue.Empty:
+            return changes
+        if "reload" in msg:
+            load_snapshot(msg["reload"])
+            for name in FILES:
+                index_rebuild(name)
+            changes.append((None, None, None))
+            continue
+        name = msg["push"]
+        coll = DATA[name]
+        if name not in ID_COLLECTIONS:
+            if msg["version"] > _versions[name]:
+                coll[:] = [typed_record(name, r) for r in msg["records"]]
+                _versions[name] = msg["version"]
+                index_rebuild(name)
+                changes.append((name, None, None))
+            continue
+        for key, record, version in msg["changes"]:
+            if version <= record_version(name, key):
+                continue  # bu sürüm (ya da daha yenisi) zaten uygulanmış
+            old = coll.get(key)
+            if old is not None:
+                index_remove(name, old)
+            if record is None:
+                coll.pop(key, None)
+            else:
+                record = coll[key] = typed_record(name, record)
+                index_add(name, record)
+            _versions[name][key] = version
+            changes.append((name, old, record))
+
+
+# === KAYIT İŞLEMLERİ ===
+# Tüm değişiklikler buradan geçer: JSON modunda dosya yeniden yazılır (ya da
+# günlüğe tek satır eklenir), SQLite modunda yalnızca ilgili satır
+# eklenir/güncellenir/silinir. Sunucu modunda işlem önce sunucuya gönderilir,
+# yerel dosyaya bir şey yazılmaz.
+def load_collection(name):
+    if settings["storage"] == "sqlite":
+        return db_load(name)
+    if journal_enabled(name) or has_journal(name):
+        return journal_load(name)
+    return to_collection(name, load_data(FILES[name]))
+
+# Kimlikli koleksiyonlarda "key" kaydın id'si, diğerlerinde listedeki sırasıdır.
+# Sözlük olarak verilen iş kayıtları Job'a çevrilerek saklanır; saklanan
+# kayıt DATA[name][key] ile alınır.
+def insert_record(name, record):
+    coll = DATA[name]
+    record = typed_record(name, record)
+    remote = remote_mode()
+    if remote:
+        remote_insert(name, [record])
+    if isinstance(coll, dict):
+        if not remote:
+            record["id"] = new_id(name)
+        key = record["id"]
+        coll[key] = record
+    else:
+        coll.append(record)
+        key = len(coll) - 1
+    index_add(name, record)
+    if settings["storage"] == "sqlite":
+        with db:
+            cur = db.execute(db_insert_sql(name), db_insert_row(name, record))
+        if name not in ID_COLLECTIONS:
+            _rowids[name].append(cur.lastrowid)
+    elif journal_enabled(name):
+        journal_append(name, {"op": "add", "r": record})
+    elif settings["storage"] == "json":
+        save_data(FILES[name], records(name))
+    return key
+
+def update_record(name, key, record):
+    coll = DATA[name]
+    record = typed_record(name, record)
+    if isinstance(coll, dict):
+        record["id"] = key
+    if remote_mode():
+        remote_change("update", name, key, record=record)
+    old = coll[key]
+    coll[key] = record
+    index_remove(name, old)
+    index_add(name, record)
+    if settings["storage"] == "sqlite":
+        with db:
+            db.execute(db_update_sql(name), db_row(name, record) + [db_rowid(name, key)])
+    elif journal_enabled(name):
+        journal_append(name, {"op": "set", "id": key, "r": record})
+    elif settings["storage"] == "json":
+        save_data(FILES[name], records(name))
+    return old
+
+def delete_record(name, key):
+    coll = DATA[name]
+    if remote_mode():
+        remote_change("delete", name, key)
+    old = coll.pop(key)
+    index_remove(name, old)
+    if settings["storage"] == "sqlite":
+        with db:
+            db.execute(f"DELETE FROM {name} WHERE id = ?", (db_rowid(name, key),))
+        if name not in ID_COLLECTIONS:
+            del _rowids[name][key]
+    elif journal_enabled(name):
+        journal_append(name, {"op": "del", "id": key})
+    elif settings["storage"] == "json":
+        save_data(FILES[name], records(name))
+    return old
+
+def insert_records(name, recs):
+    # Toplu ekleme (içe aktarma): kayıtlar tek yazmayla saklanır; SQLite'ta
+    # tek işlem, günlükte tek fsync, JSON'da tek dosya yazması. Eklenen
+    # kayıtlar koleksiyonun küçük bir kısmıysa indekslere tek tek eklenir,
+    # değilse indeksler baştan kurulur. Saklanan kayıtları döndürür.
+    coll = DATA[name]
+    added = [typed_record(name, record) for record in recs]
+    if not added:
+        return added
+    remote = remote_mode()
+    if remote:
+        remote_insert(name, added)
+    for record in added:
+        if isinstance(coll, dict):
+            if not remote:
+                record["id"] = new_id(name)
+            coll[record["id"]] = record
+        else:
+            coll.append(record)
+    if len(added) * 10 > len(coll):
+        index_rebuild(name)
+    else:
+        for record in added:
+            index_add(name, record)
+    if settings["storage"] == "sqlite":
+        with db:
+            for record in added:
+                cur = db.execute(db_insert_sql(name), db_insert_row(name, record))
+                if name not in ID_COLLECTIONS:
+                    _rowids[name].append(cur.lastrowid)
+    elif journal_enabled(name):
+        journal_append(name, *({"op": "add", "r": record} for record in added))
+    elif settings["storage"] == "json":
+        save_data(FILES[name], records(name))
+    return added
+
+def save_collection(name, recs=None):
+    # Listeyi toptan değiştiren işlemler (ör. klinik silme) için. recs
+    # verilirse listenin yeni halidir ve yerel listeye ancak sunucu kabul
+    # ettikten sonra konur; reddedilirse (RecordConflict, ServerError)
+    # liste olduğu gibi kalır.
+    if recs is not None:
+        recs = [typed_record(name, r) for r in recs]
+    if remote_mode():
+        remote_change("replace", name, records=list(records(name)) if recs is None else recs)
+    if recs is not None:
+        DATA[name][:] = recs
+    index_rebuild(name)
+    if settings["storage"] == "sqlite":
+        with db:
+            db.execute(f"DELETE FROM {name}")
+            db.executemany(db_insert_sql(name), [db_insert_row(name, r) for r in records(name)])
+        if name not in ID_COLLECTIONS:
+            _rowids[name] = [row[0] for row in db.execute(f"SELECT id FROM {name} ORDER BY id")]
+    elif journal_enabled(name):
+        journal_compact(name, background=False)
+    elif settings["storage"] == "json":
+        save_data(FILES[name], records(name))
+
+
+# === YÜKLEME ===
+DATA = {}  # koleksiyon adı -> kayıtlar (liste ya da id -> kayıt sözlüğü)
+
+def load_all():
+    # Ayarları ve tüm koleksiyonları yükler, indeksleri kurar. Arayüz ve
+    # betikler veriye dokunmadan önce bir kez çağırır.
+    os.makedirs("data/qrcodes", exist_ok=True)
+    settings.clear()
+    settings.update(load_settings())
+    set_profiling(settings["profile"])
+    if settings["storage"] == "sqlite":
+        db_open()
+
+    DATA.clear()
+    reset_versions()
+    if remote_mode():
+        load_snapshot(server_connect())
+    else:
+        for name in FILES:
+            DATA[name] = load_collection(name)
+
+    for name in JOURNALED:
+        # Yarıda kalmış bir sıkıştırma varsa, ya da günlük kapatılmış ama dosyası
+        # duruyorsa açılışta anlık görüntüye katla
+        if settings["storage"] == "json" and has_journal(name):
+            if not journal_enabled(name) or os.path.exists(journal_path(name) + ".1"):
+                journal_compact(name, background=False)
+
+    for name in _ids_assigned:
+        # Eski kayıtlara verilen kimlikler kalıcı olsun
+        save_collection(name)
+    _ids_assigned.clear()
+
+    for name in FILES:
+        index_rebuild(name)
+    return DATA
+
+
@@ -0,0 +1,37 @@
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dplab.storage import FILES, SETTINGS_FILE, load_all, flush_writes
+
+
+# === TEST ORTAMI ===
+# Veri yolları göreli (data/...) olduğundan her test geçici bir klasörde
+# çalışır. lab(**ayarlar, jobs=[...]) ayarları ve verilen koleksiyonları
+# dosyaya yazıp load_all ile yükler; yazmalar testlerin dosyaları hemen
+# okuyabilmesi için eşzamanlıdır.
+def write_file(file, data):
+    with open(file, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+def read_file(file):
+    with open(file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+@pytest.fixture
+def lab(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data")
+
+    def start(collections=None, **options):
+        write_file(SETTINGS_FILE, dict({"async_save": False}, **options))
+        for name, recs in (collections or {}).items():
+            write_file(FILES[name], recs)
+        return load_all()
+
+    yield start
+    flush_writes()
@@ -0,0 +1,55 @@
+import os
+import shutil
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pypdf = pytest.importorskip("pypdf")
+pytest.importorskip("fpdf")
+
+from dplab import exporters
+from dplab.exporters import PDF_FONT, render_jobs_pdf, save_pdf
+from dplab.pdfbench import sample_jobs
+
+
+# === PDF ===
+# Her belge fontun şablondan alınmış bir kopyasını kullanır. Aynı şablondan
+# aynı anda üretilen iki belge birbirinin alt küme tablosuna karışmamalı;
+# ikisi de okunabilmeli ve Türkçe karakterleri taşımalı.
+SYSTEM_FONT = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+@pytest.fixture
+def font(tmp_path, monkeypatch):
+    if not os.path.exists(SYSTEM_FONT):
+        pytest.skip("DejaVuSans.ttf yok")
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data")
+    shutil.copy(SYSTEM_FONT, PDF_FONT)
+    monkeypatch.setattr(exporters, "_font_templates", {})
+
+def pdf_text(path):
+    return "".join(page.extract_text() for page in pypdf.PdfReader(path).pages)
+
+def render(path, jobs):
+    save_pdf(render_jobs_pdf(jobs), path)
+
+def test_concurrent_pdfs_share_font_template(font):
+    render("ilk.pdf", sample_jobs(1))  # şablon oluşur
+    jobs = [sample_jobs(300), [dict(job, patient_name="İpek", note="Işık ğ") for job in sample_jobs(200)]]
+    threads = [threading.Thread(target=render, args=(f"{i}.pdf", rows)) for i, rows in enumerate(jobs)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    first, second = pdf_text("0.pdf"), pdf_text("1.pdf")
+    assert "Şahinoğlu" in first and "Hazırlanıyor" in first
+    assert "İpek" in second and "Işık ğ" in second and "Şahinoğlu" in second
+
+def test_font_falls_back_when_fpdf_internals_change(font, monkeypatch):
+    # Şablonda beklenen alanlar yoksa (fpdf2'nin başka bir sürümü) font
+    # olağan add_font ile eklenir
+    monkeypatch.setattr(exporters, "_font_templates", {PDF_FONT: SimpleNamespace()})
+    render("yedek.pdf", sample_jobs(20))
+    assert "Şahinoğlu" in pdf_text("yedek.pdf")
@@ -0,0 +1,111 @@
+import os
+import ast
+from bisect import bisect_left
+
+import pytest
+
+from dplab import core
+from dplab.storage import DATA, insert_record, update_record, delete_record
+
+
+# === ARAYÜZ LİSTELERİ ===
+# gui.py yüklenince pencere kurar; test ortamında ekran yoktur. Bu yüzden
+# listeleri güncelleyen fonksiyonlar dosyadan ayrıştırılıp sahte bir
+# Treeview ve boş yardımcılarla ayrı bir ad alanında çalıştırılır.
+GUI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dplab", "gui.py")
+
+class FakeTree:
+    def __init__(self):
+        self.rows = []  # [(iid, değerler)]
+
+    def get_children(self):
+        return [iid for iid, _ in self.rows]
+
+    def delete(self, *iids):
+        self.rows = [r for r in self.rows if r[0] not in {str(i) for i in iids}]
+
+    def insert(self, parent, index, iid, values):
+        self.rows.insert(len(self.rows) if index == "end" else index, (str(iid), values))
+
+    def item(self, iid, values):
+        self.rows = [(i, values if i == str(iid) else v) for i, v in self.rows]
+
+def gui_functions(names, **namespace):
+    with open(GUI, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    body = [n for n in tree.body if isinstance(n, ast.FunctionDef) and n.name in names]
+    assert {n.name for n in body} == set(names)
+    g = dict(vars(core), bisect_left=bisect_left, VIRTUAL_PAGE=50, _virtual={}, _sorting={},
+             profile_rows=lambda count: None, live_running=lambda tree: False,
+             tab_loaded=lambda tab: True, when_loaded=lambda tab, fill: None,
+             borc_sync=lambda *changed: None, guncelle_raporlar=None,
+             live_start=lambda tree: None, show_jobs_total=lambda: None,
+             show_finance_totals=lambda: None, report_tab=None, all_jobs_tab=None, finance_tab=None)
+    g.update(namespace)
+    exec(compile(ast.Module(body=body, type_ignores=[]), GUI, "exec"), g)
+    return g
+
+VIEW = ("virtual_fill", "virtual_more", "virtual_apply", "virtual_position", "sort_order",
+        "sorted_position", "jobs_view_changed", "finance_view_changed")
+
+def job(name, clinic="Merkez", date="01/03/2024", price="1000.00"):
+    return {"patient_name": name, "patient_surname": "Yılmaz", "clinic": clinic, "doctor": "",
+            "prosthesis": "Zirkonyum", "count": "1", "note": "", "date": date,
+            "total_price": price, "status": "Hazırlanıyor"}
+
+def attach(g, tree, rows):
+    g["_virtual"][tree] = {"rows": [], "keys": [], "index": {}, "values": lambda r: (r["id"],),
+                           "shown": 0, "pending": False}
+    g["virtual_fill"](tree, rows)
+
+def test_job_saved_outside_filter_is_not_listed(lab):
+    lab({"jobs": [dict(job("Ayşe"), id=1), dict(job("Mehmet", clinic="Şube"), id=2)]})
+    tree = FakeTree()
+    query = core.make_job_query(clinic="merkez")
+    g = gui_functions(VIEW, tree=tree, jobs_view_query=query, jobs_view_total=1000.0)
+    attach(g, tree, core.filter_jobs(query))
+
+    # Süzgeç dışında yeni kayıt: listeye girmez, toplam değişmez
+    key = insert_record("jobs", job("Zeynep", clinic="Şube"))
+    g["jobs_view_changed"](None, DATA["jobs"][key])
+    assert tree.get_children() == ["1"] and g["jobs_view_total"] == 1000.0
+
+    # Süzgece giren güncelleme eklenir, çıkan güncelleme ve silme kaldırılır
+    g["jobs_view_changed"](update_record("jobs", key, job("Zeynep", price="250.00")), DATA["jobs"][key])
+    assert tree.get_children() == ["1", str(key)] and g["jobs_view_total"] == 1250.0
+    g["jobs_view_changed"](update_record("jobs", 1, job("Ayşe", clinic="Şube")), DATA["jobs"][1])
+    assert tree.get_children() == [str(key)] and g["jobs_view_total"] == 250.0
+    g["jobs_view_changed"](delete_record("jobs", key), None)
+    assert tree.get_children() == [] and g["jobs_view_total"] == 0.0
+
+def test_finance_saved_outside_filter_is_not_listed(lab):
+    lab({"finance": [{"clinic": "Merkez", "type": "Gelir", "desc": "", "amount": 300.0,
+                      "date": "05/03/2024", "id": 1}]})
+    tree = FakeTree()
+    query = core.make_finance_query("01/03/2024", "31/03/2024")
+    g = gui_functions(VIEW, finance_tree=tree, finance_view_query=query, finance_view_totals=[300.0, 0.0])
+    attach(g, tree, core.filtered_finance(query))
+
+    key = insert_record("finance", {"clinic": "Merkez", "type": "Gider", "desc": "", "amount": 50.0,
+                                    "date": "05/04/2024"})
+    g["finance_view_changed"](None, DATA["finance"][key])
+    assert tree.get_children() == ["1"] and g["finance_view_totals"] == [300.0, 0.0]
+
+def test_remote_changes_keep_polling_after_error():
+    # Uzak değişikliği uygularken çıkan hata bir sonraki yoklamayı engellememeli
+    class Root:
+        def __init__(self):
+            self.scheduled = []
+
+        def after(self, ms, callback):
+            self.scheduled.append(callback)
+
+    def broken(old, new):
+        raise KeyError("id")
+
+    root = Root()
+    g = gui_functions(("uzak_degisiklikler",), root=root, SERVER_APPLY_MS=500,
+                      apply_remote=lambda: [("jobs", None, {"id": 1})], jobs_view_changed=broken)
+    with pytest.raises(KeyError):
+        g["uzak_degisiklikler"]()
+    assert root.scheduled == [g["uzak_degisiklikler"]]
@@ -0,0 +1,73 @@
+import os
+
+from dplab.storage import DATA, records, load_all, insert_record
+from dplab.importer import read_import, main
+from conftest import read_file
+
+
+# === TOPLU İŞ İÇE AKTARMA ===
+# Satırlar mevcut klinik, doktor ve durumlarla harf farkı gözetmeden
+# eşleşmeli, fiyat tablosundan fiyatlanmalı; geçmeyen satırlar nedeniyle
+# rapora düşmeli. Eklenen işler tek yazmayla kalıcı olmalı.
+SETUP = {
+    "clinics": [{"name": "Merkez Diş"}],
+    "doctors": [{"name": "Dr. Işık", "clinic": "Merkez Diş"}],
+    "prices": [{"type": "Zirkonyum", "price": 1500.0, "clinic": "Genel"}]
+}
+
+def write_csv(rows):
+    with open("isler.csv", "w", encoding="utf-8-sig", newline="") as f:
+        f.write("\n".join(";".join(row) for row in rows) + "\n")
+    return "isler.csv"
+
+def job(name, date):
+    return {"patient_name": name, "patient_surname": "", "clinic": "Merkez Diş", "doctor": "",
+            "prosthesis": "Zirkonyum", "count": "1", "note": "", "date": date,
+            "total_price": "1500.00", "status": "Hazırlanıyor"}
+
+HEADER = ["Tarih", "Klinik", "Doktor", "Ad", "Soyad", "Protez", "Üye", "Fiyat", "Not", "Durum"]
+
+def test_rows_are_matched_priced_and_rejected(lab):
+    lab(SETUP)
+    path = write_csv([
+        HEADER,
+        ["05/03/2024", "MERKEZ DİŞ", "dr. ışık", "Ayşe", "Kaya", "Zirkonyum", "2", "", "", "tamamlandı"],
+        ["06/03/2024", "Merkez Diş", "", "Ali", "Can", "E-max", "1", "900,5", "", ""],
+        ["", "", "", "", "", "", "", "", "", ""],
+        ["31/02/2024", "Merkez Diş", "", "Elif", "Demir", "Zirkonyum", "1", "", "", ""],
+        ["07/03/2024", "Yan Klinik", "", "Can", "Öz", "Zirkonyum", "1", "", "", ""],
+        ["08/03/2024", "Merkez Diş", "", "Nur", "Ak", "E-max", "1", "", "", ""],
+    ])
+    header, accepted, rejects = read_import(path)
+    assert header == HEADER
+    first, second = accepted
+    assert (first["clinic"], first["doctor"], first["status"], first["total_price"]) == \
+        ("Merkez Diş", "Dr. Işık", "Tamamlandı", "3000.00")
+    assert (second["status"], second["total_price"]) == ("Hazırlanıyor", "900.50")
+    assert [(line, error.split(":")[0]) for line, error, _ in rejects] == \
+        [(5, "Geçersiz tarih"), (6, "Bilinmeyen klinik"), (7, "Fiyat bulunamadı")]
+
+def test_import_commits_once_and_survives_restart(lab):
+    lab(SETUP, journal=True)
+    insert_record("jobs", job("Eski", "01/01/2024"))
+    path = write_csv([HEADER] + [
+        [f"{day:02d}/03/2024", "Merkez Diş", "", f"Hasta{day}", "", "Zirkonyum", "1", "", "", ""]
+        for day in range(1, 11)
+    ] + [["", "Merkez Diş", "", "", "", "", "", "", "", ""]])
+    assert main([path]) == 0
+    assert os.path.exists("isler_hatalar.csv")
+    assert len(DATA["jobs"]) == 11
+
+    # Günlükten oynatılan toplu ekleme sonrası yeni kimlikler çakışmamalı
+    load_all()
+    insert_record("jobs", job("Yeni", "01/04/2024"))
+    load_all()
+    names = {r["patient_name"] for r in records("jobs")}
+    assert names == {"Eski", "Yeni"} | {f"Hasta{day}" for day in range(1, 11)}
+
+def test_check_only_does_not_write(lab):
+    lab(SETUP)
+    path = write_csv([HEADER, ["05/03/2024", "Merkez Diş", "", "Ayşe", "", "Zirkonyum", "1", "", "", ""]])
+    assert main([path, "--kontrol"]) == 0
+    assert len(DATA["jobs"]) == 0
+    assert not os.path.exists("data/jobs.json") or read_file("data/jobs.json") == []
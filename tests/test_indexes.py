@@ -0,0 +1,264 @@
+import random
+from copy import deepcopy
+
+import pytest
+
+from dplab import core, aggregate
+from dplab.storage import DATA, insert_record, update_record, delete_record, index_rebuild
+from dplab.core import date_key, date_range_ids
+
+
+# === ARTIMLI İNDEKSLER ===
+# Kayıt ekleme, güncelleme ve silmede farkla güncellenen yapılar, aynı
+# veriden baştan kurulanlarla birebir aynı kalmalı. Rastgele değişikliklerden
+# sonra yapının kopyası alınır, index_rebuild ile baştan kurulanla
+# karşılaştırılır; sorgular da kayıtları tek tek taramakla karşılaştırılır.
+# Tutarlar ikilik kesirlerdir, farkla toplama yuvarlama hatası bırakmaz.
+NAMES = ("Ayşe", "İpek", "Işıl", "ılgaz", "IRMAK", "Ümit", "Şule", "Can")
+SURNAMES = ("Yılmaz", "ÇELİK", "Işık", "şahin", "Öztürk", "İnce")
+CLINICS = ("Merkez", "Şube", "İzmir", "Kuzey")
+DATES = ("01/03/2024", "15/02/2024", "31/12/2023", "", "geçersiz", "02/03/2023", "28/02/2025")
+PRICES = ("100.00", "2500.00", "99.50", "abc", "0.25")
+
+def job(rng):
+    return {"patient_name": rng.choice(NAMES), "patient_surname": rng.choice(SURNAMES),
+            "clinic": rng.choice(CLINICS), "doctor": rng.choice(("Dr. Kaya", "Dr. IŞIK", "")),
+            "prosthesis": rng.choice(("Zirkonyum", "E-max")), "count": "1", "note": "",
+            "date": rng.choice(DATES), "total_price": rng.choice(PRICES),
+            "status": rng.choice(core.JOB_STATUSES)}
+
+def finance(rng):
+    return {"clinic": rng.choice(CLINICS), "type": rng.choice(("Gelir", "Gider")), "desc": "",
+            "amount": rng.choice((50.0, 1250.5, 0.25)), "date": rng.choice(DATES)}
+
+def start(lab, rng):
+    lab({"jobs": [dict(job(rng), id=i) for i in range(1, 81)],
+         "finance": [dict(finance(rng), id=i) for i in range(1, 41)],
+         "clinics": [{"name": c} for c in CLINICS]})
+
+def churn(rng, steps=300):
+    for _ in range(steps):
+        name, make = rng.choice((("jobs", job), ("finance", finance)))
+        ids = list(DATA[name])
+        op = rng.random()
+        if op < 0.4:
+            update_record(name, rng.choice(ids), make(rng))
+        elif op < 0.7 and len(ids) > 20:
+            delete_record(name, rng.choice(ids))
+        else:
+            insert_record(name, make(rng))
+
+def rebuilt(snapshot, *names):
+    # (artımlı hali, baştan kurulan hali)
+    before = deepcopy(snapshot())
+    for name in names:
+        index_rebuild(name)
+    return before, snapshot()
+
+def date_index():
+    return core._date_index, core._date_keys
+
+def test_date_index_matches_rebuild(lab):
+    rng = random.Random(5)
+    start(lab, rng)
+    churn(rng)
+    before, after = rebuilt(date_index, "jobs", "finance")
+    assert before == after
+
+    for name in ("jobs", "finance"):
+        for lo, hi in ((None, None), ("01/03/2024", None), (None, "31/12/2023"), ("15/02/2024", "01/03/2024")):
+            lo, hi = date_key(lo), date_key(hi)
+            expected = sorted(k for k, r in DATA[name].items() if date_key(r["date"]) is not None
+                              and (lo is None or date_key(r["date"]) >= lo)
+                              and (hi is None or date_key(r["date"]) <= hi))
+            assert date_range_ids(name, lo, hi) == expected
+
+def search_index():
+    return core._search_values, core._search_grams, core._search_text
+
+def scan(field, query):
+    return {k for k, j in DATA["jobs"].items() if query in core.tr_fold(core.SEARCH_FIELDS[field](j))}
+
+def test_turkish_case_folding():
+    assert core.tr_fold("İPEK IŞIK") == "ipek ışık"
+    assert core.tr_fold("Işıl ILGAZ") == "ışıl ılgaz"
+
+def test_search_index_matches_rebuild(lab):
+    rng = random.Random(9)
+    start(lab, rng)
+    churn(rng)
+    before, after = rebuilt(search_index, "jobs")
+    assert before == after
+
+    queries = {"name": ("ipek", "ışı", "isi", "ılgaz", "irmak", "çelik", "ş", "ın", "yok"),
+               "clinic": ("izmir", "şube", "me", "ı"), "doctor": ("ışık", "isik", "dr")}
+    for field, texts in queries.items():
+        for text in texts:
+            assert core.search_ids(field, text) == scan(field, text), (field, text)
+
+def test_search_folds_dotted_and_dotless_i(lab):
+    lab({"jobs": [dict(job(random.Random(0)), id=i, patient_name=n, patient_surname="Yılmaz")
+                  for i, n in enumerate(("İPEK", "Işıl", "ILGAZ", "irmak"), 1)]})
+    assert core.search_ids("name", core.tr_fold("ipek")) == {1}
+    assert core.search_ids("name", core.tr_fold("IŞIL")) == {2}
+    # Noktasız ı ile noktalı i birbirini bulmaz
+    assert core.search_ids("name", "ilgaz") == set()
+    assert core.search_ids("name", "ılgaz") == {3}
+    assert core.search_ids("name", core.tr_fold("İRMAK")) == {4}
+    assert core.filter_job_ids(core.make_job_query(name="IŞI")) == [2]
+
+def ledger():
+    # Borcu sıfır kalan klinikler defterde [0, 0] olarak durabilir
+    return {c: entry for c, entry in core._ledger.items() if entry != [0.0, 0.0]}
+
+def test_ledger_matches_rebuild(lab):
+    rng = random.Random(11)
+    start(lab, rng)
+    churn(rng)
+    assert core.ledger_check() == []
+    before, after = rebuilt(ledger, "jobs", "finance")
+    assert before == after
+
+    for debt in core.hesapla_borclar():
+        clinic = debt["clinic"]
+        ciro = sum(core.job_price(j) for j in DATA["jobs"].values() if j["clinic"] == clinic)
+        odeme = sum(r["amount"] for r in DATA["finance"].values() if r["clinic"] == clinic and r["type"] == "Gelir")
+        assert (debt["ciro"], debt["odeme"], debt["borc"]) == (ciro, odeme, ciro - odeme)
+
+def test_ledger_check_repairs_drift(lab):
+    start(lab, random.Random(3))
+    core._ledger["Merkez"][0] += 10
+    core._ledger["Yok"] = [5.0, 0.0]
+    assert core.ledger_check() == ["Merkez", "Yok"]
+    assert core.ledger_check() == []
+
+def rollup():
+    return core._rollup, core._daily_rollup, core._rollup_days
+
+def revenue(by, lo=None, hi=None, dated=False):
+    # Ciroyu kayıtları tek tek tarayarak bulur; dated ise (tarih aralığı ve
+    # ay kırılımı) tarihsiz işler sayılmaz
+    totals = {}
+    for j in DATA["jobs"].values():
+        day = date_key(j["date"])
+        if dated or by == "month":
+            if day is None or (lo is not None and day < lo) or (hi is not None and day > hi):
+                continue
+        key = core.month_of(day) if by == "month" else j[by]
+        totals[key] = totals.get(key, 0) + core.job_price(j)
+    return totals
+
+def test_rollup_matches_rebuild(lab):
+    rng = random.Random(13)
+    start(lab, rng)
+    churn(rng)
+    before, after = rebuilt(rollup, "jobs")
+    assert before == after
+
+    assert core.hesapla_klinik_ciro() == revenue("clinic")
+    assert core.hesapla_aylik_ciro() == revenue("month")
+    for lo, hi in ((None, None), ("01/03/2024", None), (None, "31/12/2023"), ("15/02/2024", "01/03/2024")):
+        lo, hi = date_key(lo), date_key(hi)
+        for by in ("clinic", "prosthesis", "month"):
+            assert core.rollup_window(lo, hi, by) == revenue(by, lo, hi, dated=True), (by, lo, hi)
+
+def test_rollup_year_over_year(lab):
+    rng = random.Random(17)
+    start(lab, rng)
+    churn(rng, 100)
+    aylik = revenue("month")
+    rows = core.rollup_yoy(2024)
+    assert [ay for ay, _, _ in rows] == [f"{m:02d}" for m in range(1, 13)]
+    for ay, gecen, bu in rows:
+        assert (gecen, bu) == (aylik.get(f"2023-{ay}", 0), aylik.get(f"2024-{ay}", 0))
+
+
+# === TOPLAMA ===
+# NumPy sütun tabloları da artımlı tutulur. Toplamlar NumPy açıkken ve
+# kapalıyken (küp ya da kayıt taraması) aynı sonucu vermeli.
+def tables():
+    # Silinen id'lerin satırları yerinde kalır; yalnızca dolu satırlar karşılaştırılır
+    result = {}
+    for name in aggregate.TABLES:
+        present = aggregate.column(name, "present")
+        result[name] = {col: aggregate.column(name, col)[present].tolist() for col in aggregate.TABLES[name]}
+        result[name]["ids"] = present.nonzero()[0].tolist()
+    return result
+
+def scan_total(name, by, lo=None, hi=None, clinic="", income=None):
+    totals = {}
+    for r in DATA[name].values():
+        day = date_key(r["date"])
+        if (lo is not None or hi is not None or by == "month") and (
+                day is None or (lo is not None and day < lo) or (hi is not None and day > hi)):
+            continue
+        if (clinic and r["clinic"] != clinic) or (income is not None and (r["type"] == "Gelir") != income):
+            continue
+        key = core.month_of(day) if by == "month" else r[by]
+        totals[key] = totals.get(key, 0) + (core.job_price(r) if name == "jobs" else r["amount"])
+    return totals
+
+@pytest.mark.skipif(not aggregate.NUMPY, reason="NumPy yok")
+def test_numpy_tables_match_rebuild(lab):
+    rng = random.Random(19)
+    start(lab, rng)
+    churn(rng)
+    before, after = rebuilt(tables, "jobs", "finance")
+    assert before == after
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_aggregates_match_record_scan(lab, monkeypatch, numpy):
+    if numpy and not aggregate.NUMPY:
+        pytest.skip("NumPy yok")
+    monkeypatch.setattr(aggregate, "NUMPY", numpy)
+    rng = random.Random(23)
+    start(lab, rng)
+    churn(rng)
+
+    windows = [(None, None), ("01/03/2024", None), (None, "31/12/2023"), ("15/02/2024", "01/03/2024")]
+    for lo, hi in windows:
+        lo, hi = date_key(lo), date_key(hi)
+        for clinic in ("", "İzmir", "Yok"):
+            for by in ("clinic", "month", "status", "prosthesis"):
+                assert aggregate.group_total("jobs", by, lo, hi, clinic) == scan_total("jobs", by, lo, hi, clinic), \
+                    (by, lo, hi, clinic)
+            for income in (None, True, False):
+                for by in ("clinic", "month"):
+                    assert (aggregate.group_total("finance", by, lo, hi, clinic, income)
+                            == scan_total("finance", by, lo, hi, clinic, income)), (by, lo, hi, clinic, income)
+            gelir = scan_total("finance", "clinic", lo, hi, clinic, True)
+            gider = scan_total("finance", "clinic", lo, hi, clinic, False)
+            assert aggregate.finance_net(lo, hi, clinic) == (sum(gelir.values()), sum(gider.values()))
+
+    ids = sorted(DATA["jobs"])[::3]
+    assert aggregate.jobs_sum() == sum(core.job_price(j) for j in DATA["jobs"].values())
+    assert aggregate.jobs_sum(ids) == sum(core.job_price(DATA["jobs"][k]) for k in ids)
+
+
+# === ADIMLI SÜZGEÇ ===
+# Canlı süzgeç sorguyu filter_job_steps ile adım adım çalıştırır; sonuç
+# filter_job_ids ve kayıt taramasıyla aynı olmalı.
+def test_filter_steps_match_filter(lab, monkeypatch):
+    monkeypatch.setattr(core, "FILTER_CHUNK", 7)
+    rng = random.Random(29)
+    start(lab, rng)
+    churn(rng)
+    queries = [core.make_job_query(), core.make_job_query(start="01/01/2024"),
+               core.make_job_query(name="ı", end="01/03/2024"),
+               core.make_job_query(clinic="ş", doctor="dr", start="15/02/2024", end="01/03/2024")]
+    for query in queries:
+        steps = core.filter_job_steps(query)
+        count = 0
+        while True:
+            try:
+                next(steps)
+                count += 1
+            except StopIteration as done:
+                keys = done.value
+                break
+        assert keys == core.filter_job_ids(query)
+        expected = [k for k, j in DATA["jobs"].items() if core.job_matches(j, query)]
+        assert (list(DATA["jobs"]) if keys is None else keys) == expected
+        if query[4]:
+            # Metin süzgeci ve tarih parçaları ayrı adımlarda çalışır
+            assert count > len(expected) // 7
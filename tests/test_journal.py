@@ -0,0 +1,107 @@
+import os
+
+import pytest
+
+from dplab.storage import (
+    DATA, FILES, load_all, records, insert_record, update_record, delete_record,
+    journal_path, journal_write, journal_compact
+)
+from conftest import read_file
+
+
+# === DEĞİŞİKLİK GÜNLÜĞÜ ===
+# Günlük, dosya yeniden yazılmadan kapanan (çöken) bir oturumun
+# değişikliklerini açılışta geri getirmeli; yarıda kalan bir katlama ise
+# değişiklikleri ne kaybetmeli ne de iki kez uygulamalı.
+def job(name, price="100.00", **fields):
+    return dict({"patient_name": name, "patient_surname": "Yılmaz", "clinic": "Klinik A",
+                 "doctor": "Dr. Kaya", "prosthesis": "Zirkonyum", "count": "1", "note": "",
+                 "date": "01/03/2024", "total_price": price, "status": "Hazırlanıyor"}, **fields)
+
+def names():
+    return sorted(r["patient_name"] for r in records("jobs"))
+
+def crash(*args):
+    raise OSError("çökme")
+
+def test_journal_replays_after_crash(lab):
+    lab({"jobs": [job("Ayşe"), job("Mehmet")]}, journal=True)
+    first = next(iter(DATA["jobs"]))
+    insert_record("jobs", job("Zeynep"))
+    update_record("jobs", first, job("Ayşe", price="250.00"))
+    delete_record("jobs", list(DATA["jobs"])[1])
+
+    # Anlık görüntü değişmedi, değişiklikler yalnızca günlükte
+    assert len(read_file(FILES["jobs"])) == 2
+    assert os.path.exists(journal_path("jobs"))
+
+    load_all()
+    assert names() == ["Ayşe", "Zeynep"]
+    assert DATA["jobs"][first]["total_price"] == "250.00"
+
+def test_replayed_adds_advance_next_id(lab):
+    lab({"jobs": [job("Ayşe")]}, journal=True)
+    insert_record("jobs", job("Mehmet"))
+    insert_record("jobs", job("Zeynep"))
+
+    # Günlükten gelen kimlikler yeni kayıtlara tekrar verilmemeli
+    load_all()
+    key = insert_record("jobs", job("Elif"))
+    assert key not in (1, 2, 3)
+    load_all()
+    assert names() == ["Ayşe", "Elif", "Mehmet", "Zeynep"]
+
+def test_journal_drops_torn_last_line(lab):
+    lab({"jobs": [job("Ayşe")]}, journal=True)
+    insert_record("jobs", job("Mehmet"))
+    with open(journal_path("jobs"), "ab") as f:
+        f.write(b'{"op": "add", "r": {"patient_na')
+
+    load_all()
+    assert names() == ["Ayşe", "Mehmet"]
+    # Yarım satır kesildi, sonraki eklemeler okunabilir kalır
+    insert_record("jobs", job("Elif"))
+    load_all()
+    assert names() == ["Ayşe", "Elif", "Mehmet"]
+
+def test_fold_crash_before_snapshot_replaced(lab, monkeypatch):
+    lab({"jobs": [job("Ayşe")]}, journal=True)
+    insert_record("jobs", job("Mehmet"))
+    with monkeypatch.context() as m:
+        m.setattr(os, "replace", crash)
+        with pytest.raises(OSError):
+            journal_compact("jobs", background=False)
+
+    # Günlükteki işaret yeni görüntüyü gösteriyor ama eski görüntü yerinde
+    load_all()
+    assert names() == ["Ayşe", "Mehmet"]
+    journal_compact("jobs", background=False)
+    assert len(read_file(FILES["jobs"])) == 2
+    assert not os.path.exists(journal_path("jobs"))
+
+def test_fold_crash_after_snapshot_replaced(lab, monkeypatch):
+    lab({"jobs": [job("Ayşe", id=1), job("Mehmet", id=2), job("Zeynep", id=3)]}, journal=True)
+    # Kimliklerden önceki biçimde, sıra numarasıyla silme: iki kez oynatılırsa
+    # ikinci kaydı da siler
+    journal_write(journal_path("jobs"), {"op": "del", "i": 0})
+    load_all()
+    assert names() == ["Mehmet", "Zeynep"]
+
+    with monkeypatch.context() as m:
+        m.setattr(os, "remove", crash)
+        with pytest.raises(OSError):
+            journal_compact("jobs", background=False)
+    assert os.path.exists(journal_path("jobs"))
+
+    load_all()
+    assert names() == ["Mehmet", "Zeynep"]
+    assert not os.path.exists(journal_path("jobs"))
+
+def test_journal_folded_when_switched_off(lab):
+    lab({"jobs": [job("Ayşe")]}, journal=True)
+    insert_record("jobs", job("Mehmet"))
+
+    lab(journal=False)
+    assert names() == ["Ayşe", "Mehmet"]
+    assert not os.path.exists(journal_path("jobs"))
+    assert sorted(r["patient_name"] for r in read_file(FILES["jobs"])) == ["Ayşe", "Mehmet"]
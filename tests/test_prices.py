@@ -0,0 +1,27 @@
+from dplab.storage import insert_record, update_record, delete_record
+from dplab.core import resolve_price
+
+
+# === FİYAT TABLOSU ===
+# Aynı (tip, klinik) için birden fazla fiyat varsa listede ilk gelen
+# geçerlidir; güncelleme bu sırayı değiştirmemeli.
+def price(value, clinic="Klinik A", type="Zirkonyum"):
+    return {"type": type, "price": value, "clinic": clinic}
+
+def test_updated_price_keeps_its_position(lab):
+    lab({"prices": [price(100.0), price(200.0), price(50.0, clinic="Genel")]})
+    assert resolve_price("Zirkonyum", "Klinik A") == 100.0
+
+    update_record("prices", 0, price(150.0))
+    assert resolve_price("Zirkonyum", "Klinik A") == 150.0
+    update_record("prices", 1, price(250.0))
+    assert resolve_price("Zirkonyum", "Klinik A") == 150.0
+
+def test_price_falls_back_to_genel(lab):
+    lab({"prices": [price(100.0), price(50.0, clinic="Genel")]})
+    insert_record("prices", price(120.0))
+    delete_record("prices", 0)
+    assert resolve_price("Zirkonyum", "Klinik A") == 120.0
+    delete_record("prices", 1)
+    assert resolve_price("Zirkonyum", "Klinik A") == 50.0
+    assert resolve_price("E-max", "Klinik A") is None
@@ -0,0 +1,77 @@
+import pytest
+
+from dplab import querycache
+from dplab.storage import insert_record, update_record, delete_record
+from dplab.core import make_job_query, make_finance_query
+from dplab.querycache import job_view, finance_view, cache_stats, cache_clear, cache_reset_stats
+
+
+# === SORGU ÖNBELLEĞİ ===
+# Aynı sorgu ikinci kez önbellekten gelmeli; bir kayıt değişince yalnızca
+# o koleksiyonun sonuçları yeniden hesaplanmalı ve yeni sonuç değişikliği
+# içermeli.
+def job(name, clinic="Merkez", price="1000.00", date="01/03/2024"):
+    return {"patient_name": name, "patient_surname": "Yılmaz", "clinic": clinic, "doctor": "",
+            "prosthesis": "Zirkonyum", "count": "1", "note": "", "date": date,
+            "total_price": price, "status": "Hazırlanıyor"}
+
+def payment(amount, clinic="Merkez", type="Gelir"):
+    return {"clinic": clinic, "type": type, "desc": "", "amount": amount, "date": "05/03/2024"}
+
+@pytest.fixture
+def cached(lab):
+    cache_clear()
+    cache_reset_stats()
+    lab({"jobs": [job("Ayşe"), job("Mehmet", clinic="Şube", price="500.00")],
+         "finance": [payment(300.0), payment(100.0, type="Gider")]})
+    yield
+    cache_clear()
+
+def stats():
+    s = cache_stats()
+    return s["hits"], s["misses"]
+
+def test_repeated_query_is_served_from_cache(cached):
+    query = make_job_query(clinic="merkez")
+    first = job_view(query)
+    assert job_view(query) is first
+    assert job_view(make_job_query(clinic="MERKEZ")) is first
+    assert stats() == (2, 1)
+
+def test_job_change_invalidates_only_job_results(cached):
+    jobs_query = make_job_query(clinic="merkez")
+    finance_query = make_finance_query(clinic="Merkez")
+    keys, total = job_view(jobs_query)
+    assert total == 1000.0
+    assert finance_view(finance_query)[1] == (300.0, 100.0)
+
+    key = insert_record("jobs", job("Zeynep", price="250.00"))
+    new_keys, new_total = job_view(jobs_query)
+    assert key in new_keys and new_total == 1250.0
+    finance_view(finance_query)
+    assert stats() == (1, 3)
+
+    update_record("jobs", key, job("Zeynep", price="50.00"))
+    assert job_view(jobs_query)[1] == 1050.0
+    delete_record("jobs", key)
+    assert job_view(jobs_query) == (keys, total)
+
+def test_finance_change_invalidates_finance_results(cached):
+    query = make_finance_query(start="01/03/2024", end="31/03/2024")
+    assert finance_view(query)[1] == (300.0, 100.0)
+    insert_record("finance", payment(200.0, clinic="Şube"))
+    records, totals = finance_view(query)
+    assert totals == (500.0, 100.0) and len(records) == 3
+    assert stats() == (0, 2)
+
+def test_least_recently_used_result_is_evicted(cached, monkeypatch):
+    monkeypatch.setattr(querycache, "QUERY_CACHE_SIZE", 2)
+    first, second, third = (make_job_query(name=n) for n in ("ayşe", "mehmet", "zeynep"))
+    job_view(first)
+    job_view(second)
+    job_view(first)
+    job_view(third)
+    assert cache_stats()["entries"] == 2 and cache_stats()["evictions"] == 1
+    job_view(first)
+    job_view(second)
+    assert stats() == (2, 4)
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from dplab.storage import DATA, FILES, Job, json_record, insert_record, update_record
+from conftest import read_file
+
+
+# === İŞ KAYDI ===
+# Job nesnesi dosyadaki değerleri kayıpsız geri yazmalı: kanonik olmayan
+# sayı metinleri, eksik ya da metin olmayan alanlar ve bilinmeyen anahtarlar
+# olduğu gibi, alan sırası da formdaki sırayla korunur.
+CANONICAL = {"patient_name": "Ayşe", "patient_surname": "Yılmaz", "clinic": "Klinik A",
+             "doctor": "Dr. Kaya", "prosthesis": "Zirkonyum", "count": "2", "note": "Renk A2",
+             "date": "01/03/2024", "total_price": "3000.00", "status": "Hazırlanıyor", "id": 7}
+
+def round_trip(record):
+    return json.loads(json.dumps(Job(record), default=json_record))
+
+def test_canonical_record_round_trips():
+    job = Job(CANONICAL)
+    assert job.count == 2 and job.price == 3000.0 and job.extra is None
+    assert list(round_trip(CANONICAL).items()) == list(CANONICAL.items())
+
+@pytest.mark.parametrize("field, value", [
+    ("count", "02"), ("count", "abc"), ("count", 3), ("count", None),
+    ("total_price", "150"), ("total_price", "150.5"), ("total_price", 150.0), ("total_price", ""),
+    ("note", None), ("clinic", 12), ("id", "7")
+])
+def test_non_canonical_values_round_trip(field, value):
+    record = dict(CANONICAL, **{field: value})
+    assert round_trip(record) == record
+
+@pytest.mark.parametrize("missing", ["count", "total_price", "note", "status", "id"])
+def test_missing_fields_stay_missing(missing):
+    record = {k: v for k, v in CANONICAL.items() if k != missing}
+    job = Job(record)
+    assert missing not in job
+    assert job.get(missing) is None
+    assert round_trip(record) == record
+
+def test_unknown_keys_round_trip():
+    record = dict(CANONICAL, renk="A2", olcu={"alt": 1, "ust": [1, 2]})
+    job = Job(record)
+    assert job["renk"] == "A2"
+    assert round_trip(record) == record
+
+def test_setting_a_value_replaces_the_kept_original():
+    job = Job(dict(CANONICAL, count="02"))
+    job["count"] = "3"
+    assert job.count == 3 and job.extra is None
+    assert job.to_dict()["count"] == "3"
+
+def test_jobs_file_round_trips_through_storage(lab):
+    odd = dict(CANONICAL, id=1, count="02", total_price="150", renk="A2")
+    plain = dict(CANONICAL, id=2)
+    lab({"jobs": [odd, plain]})
+    assert isinstance(DATA["jobs"][1], Job)
+
+    update_record("jobs", 2, dict(plain, status="Tamamlandı"))
+    key = insert_record("jobs", dict(CANONICAL, total_price="abc"))
+    saved = read_file(FILES["jobs"])
+    assert saved == [odd, dict(plain, status="Tamamlandı"), dict(CANONICAL, total_price="abc", id=key)]
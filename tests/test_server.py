@@ -0,0 +1,205 @@
+import os
+import sys
+import json
+import time
+import queue
+import socket
+import subprocess
+
+import pytest
+
+from dplab import storage
+from dplab.storage import (
+    DATA, FILES, RecordConflict, ServerError, insert_record, update_record, delete_record,
+    save_collection, apply_remote, record_version, save_state
+)
+from dplab.core import filter_job_ids, make_job_query
+from conftest import write_file
+
+
+# === VERİ SUNUCUSU ===
+# Sunucu ayrı bir süreçte gerçek veriyle çalışır. Test süreci bir istemcidir
+# ("storage": "server"); ikinci istemci protokolü doğrudan konuşan bir
+# soketle (Peer) taklit edilir. Eski sürümle gelen yazma reddedilmeli ve
+# yerel kopya değişmemeli; kabul edilen değişiklik diğer istemciye itilmeli.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KEY = "ortak-anahtar"
+
+def job(name, note=""):
+    return {"patient_name": name, "patient_surname": "Yılmaz", "clinic": "Merkez", "doctor": "",
+            "prosthesis": "Zirkonyum", "count": "1", "note": note, "date": "01/03/2024",
+            "total_price": "1500.00", "status": "Hazırlanıyor"}
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_remote(timeout=5):
+    # İtilen değişiklik gelene kadar apply_remote'u dener
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        changes = apply_remote()
+        if changes:
+            return changes
+        time.sleep(0.02)
+    raise AssertionError("sunucudan değişiklik gelmedi")
+
+class Peer:
+    def __init__(self, port, key=KEY):
+        self.sock = socket.create_connection(("127.0.0.1", port), timeout=5)
+        self.stream = self.sock.makefile("rb")
+        self.pushes = []
+        self.next = 0
+        self.reply = self.request("load", key=key)
+
+    def read(self):
+        return json.loads(self.stream.readline())
+
+    def request(self, op, **fields):
+        self.next += 1
+        self.sock.sendall(json.dumps(dict(fields, req=self.next, op=op)).encode("utf-8") + b"\n")
+        while True:
+            msg = self.read()
+            if msg.get("req") == self.next:
+                return msg
+            self.pushes.append(msg)
+
+    def push(self):
+        return self.pushes.pop(0) if self.pushes else self.read()
+
+    def close(self):
+        self.stream.close()
+        self.sock.close()
+
+@pytest.fixture
+def server(tmp_path):
+    # Sunucu tmp_path/sunucu klasöründe; istemci (lab) tmp_path'te çalışır
+    folder = tmp_path / "sunucu"
+    os.makedirs(folder / "data")
+    write_file(folder / "data" / "settings.json", {"server_key": KEY, "async_save": False})
+    write_file(folder / "data" / "jobs.json", [dict(job("Ayşe"), id=1), dict(job("Mehmet"), id=2)])
+    write_file(folder / "data" / "clinics.json", [{"name": "Merkez"}, {"name": "Şube"}])
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "dplab.server", f"127.0.0.1:{port}"], cwd=folder,
+        env=dict(os.environ, PYTHONPATH=ROOT), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 20
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            break
+        except OSError:
+            if proc.poll() is not None or time.monotonic() > deadline:
+                proc.kill()
+                raise
+            time.sleep(0.05)
+    yield {"port": port, "proc": proc, "folder": folder}
+    proc.terminate()
+    proc.wait()
+    # Bu sunucudan kalan itilmiş iletiler sonraki teste taşınmasın
+    while True:
+        try:
+            storage._remote_queue.get_nowait()
+        except queue.Empty:
+            break
+
+@pytest.fixture
+def client(lab, server):
+    lab(storage="server", server=f"127.0.0.1:{server['port']}", server_key=KEY)
+    return server
+
+def test_wrong_key_and_unauthenticated_writes_are_refused(server):
+    peer = Peer(server["port"], key="yanlış")
+    assert "error" in peer.reply
+    reply = peer.request("update", name="jobs", key=1, record=job("Ayşe", "x"), version=1)
+    assert reply["error"] == "Bağlantı doğrulanmadı."
+    peer.close()
+
+def test_client_loads_from_server(client):
+    assert sorted(DATA["jobs"]) == [1, 2]
+    assert [c["name"] for c in DATA["clinics"]] == ["Merkez", "Şube"]
+    assert save_state() == "saved"
+    assert not os.path.exists(FILES["jobs"])
+
+def test_stale_update_is_rejected_and_local_copy_kept(client):
+    peer = Peer(client["port"])
+    assert peer.request("update", name="jobs", key=1, record=dict(job("Ayşe", "başka"), id=1),
+                        version=1) == {"req": peer.next, "version": 2}
+
+    with pytest.raises(RecordConflict):
+        update_record("jobs", 1, job("Ayşe", "benim"))
+    assert DATA["jobs"][1]["note"] == ""
+
+    # İtilen güncel hal uygulanınca aynı değişiklik kabul edilir
+    [(name, old, new)] = wait_remote()
+    assert (name, old["note"], new["note"]) == ("jobs", "", "başka")
+    update_record("jobs", 1, job("Ayşe", "benim"))
+    assert record_version("jobs", 1) == 3
+    push = peer.push()
+    assert push["push"] == "jobs" and push["changes"][0][0] == 1 and push["changes"][0][2] == 3
+    peer.close()
+
+def test_changes_are_pushed_both_ways(client):
+    peer = Peer(client["port"])
+    key = insert_record("jobs", job("Zeynep"))
+    delete_record("jobs", 2)
+    inserted, deleted = peer.push(), peer.push()
+    assert inserted["changes"][0][0] == key and inserted["changes"][0][1]["patient_name"] == "Zeynep"
+    assert deleted["changes"] == [[2, None, 2]]
+
+    reply = peer.request("insert", name="jobs", records=[job("Elif")], version=0)
+    [(name, old, new)] = wait_remote()
+    assert old is None and new["id"] == reply["keys"][0] != key
+    # İtilen kayıt indekslere de işlenir
+    assert filter_job_ids(make_job_query(name="elif")) == [new["id"]]
+    peer.close()
+
+def test_rejected_list_replace_keeps_local_list(client):
+    peer = Peer(client["port"])
+    assert "version" in peer.request("replace", name="clinics", records=[{"name": "Merkez"}], version=1)
+
+    with pytest.raises(RecordConflict):
+        save_collection("clinics", [{"name": "Şube"}])
+    assert [c["name"] for c in DATA["clinics"]] == ["Merkez", "Şube"]
+
+    assert wait_remote() == [("clinics", None, None)]
+    save_collection("clinics", [])
+    assert DATA["clinics"] == []
+    assert peer.push()["records"] == []
+    peer.close()
+
+def test_offline_write_is_refused_and_list_kept(client):
+    client["proc"].terminate()
+    client["proc"].wait()
+    deadline = time.monotonic() + 5
+    while save_state() != "offline" and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert save_state() == "offline"
+    with pytest.raises(ServerError):
+        save_collection("clinics", [{"name": "Merkez"}])
+    with pytest.raises(ServerError):
+        delete_record("jobs", 1)
+    assert [c["name"] for c in DATA["clinics"]] == ["Merkez", "Şube"]
+    assert 1 in DATA["jobs"]
+
+def test_failed_write_keeps_record_version(lab, monkeypatch):
+    # Sunucu işlemi süreç içinde çağrılır; diske yazılamayan değişiklik
+    # sürümü ilerletmemeli, yoksa istemcinin doğru sürümü "conflict" alır
+    from dplab import server
+    def disk_full(*args):
+        raise OSError("disk dolu")
+
+    lab({"jobs": [dict(job("Ayşe"), id=1)]})
+    with monkeypatch.context() as m:
+        m.setattr(server, "update_record", disk_full)
+        with pytest.raises(OSError):
+            server.serve_request({"op": "update", "name": "jobs", "key": 1, "record": job("Ayşe", "x"),
+                                  "version": 1})
+    assert record_version("jobs", 1) == 1
+
+    reply, push = server.serve_request({"op": "delete", "name": "jobs", "key": 1, "version": 1})
+    assert reply == {"version": 2} and push["changes"] == [[1, None, 2]]
+    # Silinen kaydın sürümü saklanır; eski sürümle gelen değişiklik reddedilir
+    assert record_version("jobs", 1) == 2
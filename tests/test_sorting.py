@@ -0,0 +1,80 @@
+import random
+
+from dplab.storage import DATA, insert_record, update_record, delete_record, load_all
+from dplab.core import SORT_FIELDS, sorted_ids
+
+
+# === SIRALAMA İNDEKSLERİ ===
+# Kurulmuş sıralar her ekleme, güncelleme ve silmede güncel kalmalı:
+# sorted_ids her zaman kayıtları baştan sıralamakla aynı sonucu vermeli.
+# Metinler Türk alfabesiyle, tarihsiz kayıtlar en başta sıralanır.
+SURNAMES = ("Zorlu", "çelik", "Ilgaz", "İnce", "aydın", "Öztürk", "ılgın", "Şahin", "")
+DATES = ("01/03/2024", "15/02/2024", "31/12/2023", "", "geçersiz", "02/03/2024")
+
+def job(rng):
+    return {"patient_name": rng.choice(("Ayşe", "Ümit", "Gül")), "patient_surname": rng.choice(SURNAMES),
+            "clinic": rng.choice(("Merkez", "Şube")), "doctor": "", "prosthesis": "Zirkonyum",
+            "count": rng.choice(("1", "2", "10", "x")), "note": "", "date": rng.choice(DATES),
+            "total_price": rng.choice(("100.00", "2500.00", "99.50", "abc")), "status": "Yapımda"}
+
+def brute(name, field, ids=None, reverse=False):
+    coll = DATA[name]
+    get = SORT_FIELDS[name][field]
+    order = sorted(coll if ids is None else ids, key=lambda rid: (get(coll[rid]), rid))
+    return order[::-1] if reverse else order
+
+def check(name, rng):
+    ids = list(DATA[name])
+    few = rng.sample(ids, 3)
+    many = rng.sample(ids, len(ids) // 2)
+    for field in SORT_FIELDS[name]:
+        for reverse in (False, True):
+            assert sorted_ids(name, field, reverse) == brute(name, field, None, reverse), field
+            for subset in (few, many):
+                assert sorted_ids(name, field, reverse, subset) == brute(name, field, subset, reverse), field
+
+def test_turkish_text_and_date_order(lab):
+    lab({"jobs": [dict(job(random.Random(0)), patient_surname=s, date=d, id=i)
+                  for i, (s, d) in enumerate(zip(SURNAMES[:7], DATES * 2), 1)]})
+    surnames = [DATA["jobs"][i]["patient_surname"] for i in sorted_ids("jobs", "patient_surname")]
+    assert surnames == ["aydın", "çelik", "Ilgaz", "ılgın", "İnce", "Öztürk", "Zorlu"]
+    dates = [DATA["jobs"][i]["date"] for i in sorted_ids("jobs", "date")]
+    assert dates == ["", "geçersiz", "31/12/2023", "15/02/2024", "01/03/2024", "01/03/2024", "02/03/2024"]
+
+def test_sort_indexes_follow_insert_update_delete(lab):
+    rng = random.Random(7)
+    lab({"jobs": [job(rng) for _ in range(120)]})
+    check("jobs", rng)  # tüm alanların sırası kurulur
+
+    for _ in range(300):
+        ids = list(DATA["jobs"])
+        op = rng.random()
+        if op < 0.4:
+            update_record("jobs", rng.choice(ids), job(rng))
+        elif op < 0.7 and len(ids) > 40:
+            delete_record("jobs", rng.choice(ids))
+        else:
+            insert_record("jobs", job(rng))
+    check("jobs", rng)
+
+    # Yeniden yüklemede kurulmuş sıralar baştan kurulur
+    load_all()
+    check("jobs", rng)
+
+def test_finance_and_inventory_sorts(lab):
+    rng = random.Random(3)
+    lab({
+        "finance": [{"clinic": rng.choice(("Merkez", "Şube")), "type": rng.choice(("Gelir", "Gider")),
+                     "desc": rng.choice(("", "Ödeme", "ödeme", "Çek")), "amount": rng.choice((10.0, 250.0, "5")),
+                     "date": rng.choice(DATES)} for _ in range(60)],
+        "envanter": [{"ad": rng.choice(("Alçı", "İmplant", "ışık")), "miktar": rng.choice(("3", "12", "")),
+                      "birim": "adet", "giris": rng.choice(DATES), "skt": rng.choice(DATES),
+                      "siparis": "", "not": ""} for _ in range(60)]
+    })
+    for name in ("finance", "envanter"):
+        check(name, rng)
+        key = insert_record(name, dict(DATA[name][1]))
+        update_record(name, 2, dict(DATA[name][3]))
+        delete_record(name, 4)
+        check(name, rng)
+        assert key in sorted_ids(name, list(SORT_FIELDS[name])[0])
@@ -0,0 +1,71 @@
+import os
+
+from dplab.storage import (
+    DATA, FILES, DB_FILE, load_all, records, insert_record, update_record, delete_record,
+    save_collection, insert_records, Job
+)
+from conftest import read_file
+
+
+# === SQLITE DEPOLAMA ===
+# "storage": "sqlite" ile ilk açılışta mevcut JSON verisi (günlükteki
+# değişikliklerle birlikte) veritabanına aktarılır, dosyalar yedek olarak
+# kalır. Sonraki açılışlar yalnızca veritabanını okur; kimlikli kayıtlar
+# kimlikleriyle, listeler sıralarıyla geri gelmeli.
+def job(name, price="100.00", **fields):
+    return dict({"patient_name": name, "patient_surname": "Yılmaz", "clinic": "Merkez",
+                 "doctor": "Dr. Kaya", "prosthesis": "Zirkonyum", "count": "1", "note": "",
+                 "date": "01/03/2024", "total_price": price, "status": "Hazırlanıyor"}, **fields)
+
+def snapshot():
+    return {name: [r.to_dict() if isinstance(r, Job) else r for r in records(name)] for name in FILES}
+
+def test_json_data_migrated_once(lab):
+    lab({"jobs": [job("Ayşe", id=1), job("Mehmet", id=4)], "clinics": [{"name": "Şube"}, {"name": "Merkez"}]},
+        journal=True)
+    insert_record("jobs", job("Zeynep"))  # yalnızca günlükte
+    before = snapshot()
+
+    lab(storage="sqlite")
+    assert os.path.exists(DB_FILE)
+    assert snapshot() == before
+    assert sorted(DATA["jobs"]) == [1, 4, 5]
+    # JSON dosyaları yedek olarak yerinde kalır ve artık yazılmaz
+    assert len(read_file(FILES["jobs"])) == 2
+    insert_record("jobs", job("Elif"))
+    assert len(read_file(FILES["jobs"])) == 2
+
+    # İkinci açılış yeniden aktarmaz; veritabanındaki değişiklik korunur
+    load_all()
+    assert sorted(r["patient_name"] for r in records("jobs")) == ["Ayşe", "Elif", "Mehmet", "Zeynep"]
+
+def test_record_changes_survive_reload(lab):
+    lab({"jobs": [job("Ayşe", id=1), job("Mehmet", id=2)]}, storage="sqlite")
+    key = insert_record("jobs", job("Zeynep", date="15/04/2024"))
+    update_record("jobs", 1, job("Ayşe", price="250.00", note="prova"))
+    delete_record("jobs", 2)
+    added = insert_records("jobs", [job("Elif"), job("Can")])
+    before = snapshot()
+
+    load_all()
+    assert snapshot() == before
+    assert sorted(DATA["jobs"]) == [1, key] + [r["id"] for r in added]
+    assert DATA["jobs"][1]["note"] == "prova" and DATA["jobs"][1]["total_price"] == "250.00"
+    # Silinen kimlik yeniden verilmez
+    assert insert_record("jobs", job("Deniz")) > added[-1]["id"]
+
+def test_lists_keep_order(lab):
+    lab({"clinics": [{"name": "Merkez"}, {"name": "Şube"}, {"name": "Kuzey"}]}, storage="sqlite")
+    insert_record("clinics", {"name": "Güney"})
+    update_record("clinics", 1, {"name": "Şube 2"})
+    delete_record("clinics", 0)
+    load_all()
+    assert [c["name"] for c in DATA["clinics"]] == ["Şube 2", "Kuzey", "Güney"]
+
+    # Toptan değiştirilen liste verilen sırayla saklanır; sonraki satır
+    # işlemleri doğru satırı bulur
+    save_collection("clinics", [{"name": "Batı"}, {"name": "Kuzey"}, {"name": "Doğu"}])
+    delete_record("clinics", 1)
+    update_record("clinics", 1, {"name": "Doğu 2"})
+    load_all()
+    assert [c["name"] for c in DATA["clinics"]] == ["Batı", "Doğu 2"]
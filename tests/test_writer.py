@@ -0,0 +1,54 @@
+import os
+import threading
+
+from dplab import storage
+from dplab.storage import DATA, FILES, insert_record, save_collection, flush_writes, save_state
+from conftest import read_file
+
+
+# === DOSYA YAZICI ===
+# "async_save" açıkken kayıtlar arka planda yazılır. Yazıcı meşgulken gelen
+# kaydetmeler tek yazmada birleşmeli; flush_writes döndüğünde her dosya
+# tam ve okunabilir olmalı, geride geçici dosya kalmamalı.
+def names(recs):
+    return [r["name"] for r in recs]
+
+def test_quick_saves_collapse_into_one_write(lab, monkeypatch):
+    lab({"clinics": []}, async_save=True)
+    written = []
+    started, release = threading.Event(), threading.Event()
+    write_json = storage.write_json
+
+    def slow_write(file, data):
+        written.append((file, names(data)))
+        started.set()
+        release.wait(5)
+        write_json(file, data)
+
+    monkeypatch.setattr(storage, "write_json", slow_write)
+    save_collection("clinics", [{"name": "Merkez"}])
+    assert started.wait(5)
+    # İlk yazma sürerken gelen kaydetmeler kuyrukta tek kayda iner
+    for i in range(5):
+        save_collection("clinics", [{"name": "Merkez"}] + [{"name": f"Şube {n}"} for n in range(i + 1)])
+    assert save_state() == "unsaved"
+    release.set()
+    flush_writes()
+
+    final = ["Merkez", "Şube 0", "Şube 1", "Şube 2", "Şube 3", "Şube 4"]
+    assert written == [(FILES["clinics"], ["Merkez"]), (FILES["clinics"], final)]
+    assert names(read_file(FILES["clinics"])) == final
+    assert save_state() == "saved"
+
+def test_flush_leaves_complete_files(lab):
+    lab({"clinics": [], "envanter": []}, async_save=True, journal=False)
+    for i in range(50):
+        insert_record("jobs", {"patient_name": f"Hasta{i}", "patient_surname": "Yılmaz", "clinic": "Merkez",
+                               "doctor": "", "prosthesis": "Zirkonyum", "count": "1", "note": "",
+                               "date": "01/03/2024", "total_price": "100.00", "status": "Hazırlanıyor"})
+        insert_record("clinics", {"name": f"Klinik {i}"})
+    flush_writes()
+
+    assert [r["patient_name"] for r in read_file(FILES["jobs"])] == [f"Hasta{i}" for i in range(50)]
+    assert read_file(FILES["clinics"]) == DATA["clinics"]
+    assert not [f for f in os.listdir("data") if f.endswith(".tmp")]